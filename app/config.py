@@ -3,6 +3,9 @@ from typing import Optional
 
 
 class Settings(BaseSettings):
+    # Public origin of the site, for absolute URLs in feeds and sitemaps
+    site_url: str = "https://ishtar-ai.com"
+
     # Email Configuration
     email_enabled: bool = False
     email_provider: str = "smtp"  # "smtp" or "sendgrid"
@@ -13,9 +16,27 @@ class Settings(BaseSettings):
     smtp_user: Optional[str] = None
     smtp_password: Optional[str] = None
     smtp_use_tls: bool = True
+    # Connections kept open and reused between messages
+    smtp_pool_size: int = 2
+    smtp_idle_timeout: float = 60.0
+    smtp_timeout: float = 30.0
+
+    # Outgoing mail is queued here and sent by a background worker, with
+    # retries (delay doubles from mail_queue_retry_base seconds, max 1 hour)
+    mail_queue_path: str = "var/mail_queue.sqlite3"
+    mail_queue_batch_size: int = 20
+    mail_queue_poll_interval: float = 5.0
+    mail_queue_max_attempts: int = 8
+    mail_queue_retry_base: float = 30.0
+
+    # Bearer token for /api/metrics/mail; the endpoint is hidden (404) when unset
+    metrics_token: Optional[str] = None
 
     # SendGrid Configuration
     sendgrid_api_key: Optional[str] = None
+    # Point at a local HTTP stand-in to test without sending real mail
+    sendgrid_api_url: str = "https://api.sendgrid.com"
+    sendgrid_timeout: float = 30.0
 
     # Email Recipients
     contact_email_to: str = "contact@ishtar-ai.com"
@@ -26,6 +47,55 @@ class Settings(BaseSettings):
     enable_csrf: bool = True
     csrf_secret_key: Optional[str] = None
 
+    # Search ranking (BM25F field boosts)
+    search_title_boost: float = 3.0
+    search_content_boost: float = 1.0
+    # Prebuilt index snapshot, written by `python -m app.utils.search build`
+    search_index_path: Optional[str] = "build/search_index.bin"
+    # Result cache: "memory", "sqlite" (shared across workers) or "none"
+    search_cache_backend: str = "memory"
+    search_cache_size: int = 512
+    search_cache_ttl: float = 300.0
+    search_cache_path: str = "build/search_cache.sqlite3"
+
+    # Content-hashed static asset names, written by `python -m app.utils.assets build`;
+    # without it hashes are computed on the fly
+    asset_manifest_path: Optional[str] = "build/assets.json"
+    # Precompressed .br/.gz static variants, written by the same build step
+    static_precompressed_dir: Optional[str] = "build/static"
+    # Responsive WebP/AVIF derivatives, written by `python -m app.utils.images build`;
+    # without it images are served as plain <img> tags
+    image_manifest_path: Optional[str] = "build/images.json"
+
+    # Response compression for dynamic pages (brotli needs the brotli package)
+    compression_min_size: int = 500
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+
+    # Rendered-page cache for routes that only depend on settings and content
+    render_cache_size: int = 64
+    render_cache_ttl: float = 3600.0
+
+    # Blog feeds (/feed, /atom.xml, /feed.json): entries per ?page= and
+    # whether entries carry the full article
+    feed_page_size: int = 20
+    feed_full_content: bool = True
+
+    # Link gzipped child sitemaps (/sitemaps/*.xml.gz) from /sitemap.xml
+    sitemap_gzip: bool = False
+    # Template commit times for page lastmod, written by
+    # `python -m app.utils.sitemap build`; without it template mtimes are used
+    template_times_path: Optional[str] = "build/template_times.json"
+
+    # Pre-rendered pages, written by `python -m app.utils.prerender build`
+    prerender_dir: str = "dist"
+    serve_prerendered: bool = False
+
+    # Content files (products, case studies, resources, FAQs, blog posts)
+    content_dir: str = "app/content/data"
+    # Seconds between checks for changed content files; 0 disables reloading
+    content_reload_interval: float = 2.0
+
     # Analytics
     google_analytics_id: Optional[str] = "G-KRTEM16GDJ"
     plausible_domain: Optional[str] = None
@@ -1 +1 @@
-"""Content modules for blog articles and other static content"""
+"""Site content: file-backed store and immutable registry"""
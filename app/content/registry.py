@@ -0,0 +1,102 @@
+"""
+Content Registry Module
+Immutable snapshot of the site content with precomputed lookups
+"""
+
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert dicts to read-only mappings and lists to tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def _group_by(records: Tuple[Mapping, ...], key: str) -> Mapping[str, Tuple]:
+    """Group records by a field, with every record under "All" """
+    groups: Dict[str, list] = {"All": list(records)}
+    for record in records:
+        groups.setdefault(record.get(key), []).append(record)
+    return MappingProxyType({name: tuple(items) for name, items in groups.items()})
+
+
+class ContentRegistry:
+    """
+    Immutable snapshot of the site content
+
+    Every record is frozen so handlers can share them across requests, and
+    slug lookups and list filters are precomputed so routes never rebuild
+    or scan the content.
+    """
+
+    def __init__(
+        self,
+        products,
+        case_studies,
+        resources,
+        resource_categories,
+        blog_posts,
+        blog_articles,
+        faqs,
+        version: str = "",
+        modified: Optional[Mapping[str, float]] = None,
+    ):
+        from app.utils.extract import add_heading_anchors
+        from app.utils.images import responsive_images
+
+        # Changes whenever the underlying content files change
+        self.version = version
+        # "<collection>/<slug>" -> Unix time the record last changed, for
+        # records that say (their "updated" or "date" field)
+        self.modified: Mapping[str, float] = MappingProxyType(dict(modified or {}))
+
+        self.products: Tuple[Mapping, ...] = freeze(products)
+        self.products_by_slug = MappingProxyType(
+            {product["slug"]: product for product in self.products}
+        )
+
+        self.case_studies: Tuple[Mapping, ...] = freeze(case_studies)
+        self.case_studies_by_slug = MappingProxyType(
+            {case_study["slug"]: case_study for case_study in self.case_studies}
+        )
+        self.case_studies_by_industry = _group_by(self.case_studies, "industry")
+
+        self.resources: Tuple[Mapping, ...] = freeze(resources)
+        self.resource_categories: Tuple[str, ...] = tuple(resource_categories)
+        self.resources_by_category = _group_by(self.resources, "category")
+
+        self.blog_posts: Tuple[Mapping, ...] = freeze(blog_posts)
+        # Section anchors let search results link into the article; images
+        # get WebP/AVIF sources when derivatives have been built
+        self.blog_articles_by_slug = MappingProxyType(
+            {
+                slug: freeze(
+                    {
+                        **article,
+                        "slug": article.get("slug", slug),
+                        "content": responsive_images(
+                            add_heading_anchors(article["content"])
+                        ),
+                    }
+                )
+                for slug, article in blog_articles.items()
+            }
+        )
+
+        self.faqs: Mapping[str, Tuple] = freeze(faqs)
+
+
+def get_registry() -> ContentRegistry:
+    """
+    Get the current content registry
+
+    The content store swaps in a new registry when files change, so callers
+    should fetch it per request rather than keeping a reference.
+    """
+    from app.content.store import get_content_store
+
+    return get_content_store().registry
@@ -0,0 +1,341 @@
+"""
+Content Store Module
+Loads site content from files under the content directory and reloads
+only the files that changed
+"""
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import asyncio
+import hashlib
+import json
+import threading
+
+from app.content.registry import ContentRegistry
+
+# Content directory layout:
+#   products/*.json, case_studies/*.json, resources/*.json
+#       One record per file, listed in filename order
+#   resource_categories.json, faqs.json
+#       Single documents
+#   blog/*.html, blog/*.md
+#       Front matter between "---" lines (flat "key: value" pairs), then the
+#       article body; an empty body lists the post without an article page
+_COLLECTIONS = ("products", "case_studies", "resources")
+_DOCUMENTS = ("resource_categories", "faqs")
+_BLOG_SUFFIXES = (".html", ".md")
+# Records the registry looks up by slug
+_SLUGGED = ("products", "case_studies", "blog")
+
+
+def parse_front_matter(text: str) -> Tuple[Dict[str, str], str]:
+    """
+    Split a post file into its front matter fields and body
+
+    Front matter is a block of "key: value" lines between two "---" lines.
+    Values are kept as strings; only the first ": " separates key and value.
+    """
+    if not text.startswith("---"):
+        return {}, text
+
+    end = text.find("\n---", 3)
+    if end == -1:
+        return {}, text
+
+    fields = {}
+    for line in text[3:end].splitlines():
+        if ":" in line:
+            key, value = line.split(":", 1)
+            fields[key.strip()] = value.strip()
+
+    body_start = text.find("\n", end + 4)
+    body = text[body_start + 1 :] if body_start != -1 else ""
+    return fields, body
+
+
+def _render_markdown(body: str) -> str:
+    """Render a Markdown body to HTML if the markdown package is installed"""
+    try:
+        import markdown
+    except ImportError:
+        print("Markdown library not installed. Install with: poetry add markdown")
+        return ""
+    return markdown.markdown(body, extensions=["extra"])
+
+
+def _parse_file(path: Path, data: bytes) -> Any:
+    """Parse the contents of one content file into a plain record"""
+    text = data.decode("utf-8")
+    if path.suffix == ".json":
+        return json.loads(text)
+
+    fields, body = parse_front_matter(text)
+    if path.suffix == ".md" and body.strip():
+        body = _render_markdown(body)
+    fields["content"] = body.strip()
+    return fields
+
+
+def _validate(kind: str, record: Any):
+    """
+    Check a parsed record has the shape the registry build expects
+
+    Args:
+        kind: Collection directory or document name the file belongs to
+
+    Raises:
+        ValueError: If the record would break the registry build
+    """
+    expected = list if kind == "resource_categories" else dict
+    if not isinstance(record, expected):
+        raise ValueError(f"expected a {expected.__name__}")
+    if kind in _SLUGGED and not (
+        isinstance(record.get("slug"), str) and record["slug"]
+    ):
+        raise ValueError("missing slug")
+
+
+def _modified_time(record: Dict[str, Any]) -> Optional[float]:
+    """
+    When a record last changed, from its "updated" field, else its "date"
+
+    File mtimes are not used: a fresh checkout or deploy resets them, which
+    would report every record as just changed. Records with neither field
+    have no known modification time.
+    """
+    for field in ("updated", "date"):
+        value = record.get(field)
+        if not value:
+            continue
+        try:
+            parsed = datetime.fromisoformat(str(value))
+        except ValueError:
+            print(f"Invalid {field} date {value!r} for {record.get('slug')}")
+            continue
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.timestamp()
+    return None
+
+
+def _empty_registry() -> ContentRegistry:
+    """Registry served when the content cannot be built at all"""
+    return ContentRegistry(
+        products=[],
+        case_studies=[],
+        resources=[],
+        resource_categories=["All"],
+        blog_posts=[],
+        blog_articles={},
+        faqs={},
+    )
+
+
+class ContentStore:
+    """
+    File-backed source for the content registry
+
+    refresh() stats every content file and re-parses only the ones whose
+    mtime or size changed. When anything changed, a new ContentRegistry is
+    built from the cached records and swapped in with a single assignment,
+    so readers always see a complete registry, and listeners are notified.
+    Files that fail to parse or validate are logged and skipped, and a
+    registry that fails to build leaves the previous one in place.
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self.registry: Optional[ContentRegistry] = None
+        # path -> ((mtime_ns, size), sha256 of the contents, parsed record)
+        self._files: Dict[Path, Tuple[Tuple[int, int], str, Any]] = {}
+        # path -> (mtime_ns, size) of a version that was rejected, so it is
+        # reported once rather than on every refresh
+        self._rejected: Dict[Path, Tuple[int, int]] = {}
+        self._listeners: List[Callable[[ContentRegistry], None]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, listener: Callable[[ContentRegistry], None]):
+        """Call listener(registry) after every reload that changed content"""
+        self._listeners.append(listener)
+
+    def _scan(self) -> List[Path]:
+        """List the content files currently on disk"""
+        paths = []
+        for name in _COLLECTIONS:
+            paths.extend((self.root / name).glob("*.json"))
+        for name in _DOCUMENTS:
+            path = self.root / f"{name}.json"
+            if path.exists():
+                paths.append(path)
+        for suffix in _BLOG_SUFFIXES:
+            paths.extend((self.root / "blog").glob(f"*{suffix}"))
+        return sorted(paths)
+
+    def refresh(self) -> bool:
+        """
+        Re-parse changed files and swap in a new registry if needed
+
+        Returns:
+            True if the content changed
+        """
+        with self._lock:
+            changed = False
+            seen = set()
+            for path in self._scan():
+                seen.add(path)
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                key = (stat.st_mtime_ns, stat.st_size)
+                cached = self._files.get(path)
+                if cached is not None and cached[0] == key:
+                    continue
+                if self._rejected.get(path) == key:
+                    continue
+                kind = path.stem if path.parent == self.root else path.parent.name
+                try:
+                    data = path.read_bytes()
+                    record = _parse_file(path, data)
+                    _validate(kind, record)
+                except (OSError, ValueError) as e:
+                    # Keep serving the last good version of the file, if any
+                    print(f"Error loading content file {path}: {e}")
+                    self._rejected[path] = key
+                    continue
+                self._rejected.pop(path, None)
+                self._files[path] = (key, hashlib.sha256(data).hexdigest(), record)
+                changed = True
+
+            for path in set(self._files) - seen:
+                del self._files[path]
+                changed = True
+            for path in set(self._rejected) - seen:
+                del self._rejected[path]
+
+            if not changed and self.registry is not None:
+                return False
+
+            try:
+                registry = self._build_registry()
+            except Exception as e:
+                print(f"Error building content registry: {e}")
+                if self.registry is not None:
+                    return False
+                registry = _empty_registry()
+            self.registry = registry
+
+        for listener in self._listeners:
+            try:
+                listener(registry)
+            except Exception as e:
+                print(f"Error notifying content listener {listener}: {e}")
+        return True
+
+    def _records(self, directory: str) -> List[Any]:
+        """Parsed records of one directory, in filename order"""
+        folder = self.root / directory
+        return [
+            record
+            for path, (_, _, record) in sorted(self._files.items())
+            if path.parent == folder
+        ]
+
+    def _document(self, name: str, default: Any) -> Any:
+        """Parsed contents of a single-document file"""
+        cached = self._files.get(self.root / f"{name}.json")
+        return cached[2] if cached is not None else default
+
+    def _build_registry(self) -> ContentRegistry:
+        """Assemble a registry from the parsed files"""
+        posts = self._records("blog")
+        blog_posts = []
+        blog_articles = {}
+        for post in sorted(posts, key=lambda p: p.get("date", ""), reverse=True):
+            listing = {
+                key: post[key]
+                for key in ("title", "excerpt", "date", "slug", "author")
+                if key in post
+            }
+            blog_posts.append(listing)
+            if post["content"]:
+                aliases = [a.strip() for a in post.get("aliases", "").split(",")]
+                for slug in [post["slug"], *filter(None, aliases)]:
+                    blog_articles[slug] = {
+                        **listing,
+                        "slug": slug,
+                        "content": post["content"],
+                    }
+
+        # Derived from file contents rather than mtimes so every instance
+        # serving the same content agrees on the version
+        digest = hashlib.sha256()
+        modified = {}
+        for path, (_, content_hash, record) in sorted(self._files.items()):
+            digest.update(f"{path.relative_to(self.root)}:{content_hash}\n".encode())
+            if (
+                path.parent.name in _COLLECTIONS + ("blog",)
+                and isinstance(record, dict)
+                and record.get("slug")
+            ):
+                timestamp = _modified_time(record)
+                if timestamp is not None:
+                    modified[f"{path.parent.name}/{record['slug']}"] = timestamp
+
+        return ContentRegistry(
+            products=self._records("products"),
+            case_studies=self._records("case_studies"),
+            resources=self._records("resources"),
+            resource_categories=self._document("resource_categories", ["All"]),
+            blog_posts=blog_posts,
+            blog_articles=blog_articles,
+            faqs=self._document("faqs", {}),
+            version=digest.hexdigest()[:16],
+            modified=modified,
+        )
+
+    async def watch(self, interval: float):
+        """
+        Reload content whenever files change
+
+        Uses filesystem notifications through watchfiles when it is installed
+        (it ships with uvicorn[standard]) and falls back to polling mtimes
+        every `interval` seconds. A failed reload is logged and watching
+        continues.
+        """
+        try:
+            from watchfiles import awatch
+        except ImportError:
+            awatch = None
+
+        if awatch is not None:
+            async for _ in awatch(self.root, step=int(interval * 1000)):
+                await self._reload()
+        else:
+            while True:
+                await asyncio.sleep(interval)
+                await self._reload()
+
+    async def _reload(self):
+        """Run refresh() off the event loop, logging rather than raising"""
+        try:
+            await asyncio.to_thread(self.refresh)
+        except Exception as e:
+            print(f"Error reloading content from {self.root}: {e}")
+
+
+# Global content store instance
+_store: Optional[ContentStore] = None
+
+
+def get_content_store() -> ContentStore:
+    """Get or create the global content store, loading it on first use"""
+    global _store
+    if _store is None:
+        from app.config import settings
+
+        store = ContentStore(settings.content_dir)
+        store.refresh()
+        _store = store
+    return _store
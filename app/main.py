@@ -1,28 +1,101 @@
+from contextlib import asynccontextmanager, suppress
+import asyncio
+
 from fastapi import FastAPI, Request, status
-from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
-from app.middleware import SecurityHeadersMiddleware
+from app.config import settings
+from app.content.store import get_content_store
+from app.middleware import (
+    CompressionMiddleware,
+    PrerenderedMiddleware,
+    SecurityHeadersMiddleware,
+)
+from app.utils.assets import HashedStaticFiles, asset_url, get_asset_manifest
+from app.utils.email import close_email_providers
+from app.utils.images import picture
+from app.utils.mail_queue import get_mail_queue
+from app.utils.search import get_search_index
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm per-worker state before serving requests"""
+    store = get_content_store()
+    # Map the search index snapshot (or rebuild it) at startup rather than
+    # on the first /search request
+    get_search_index()
+
+    # Pick up edited content files without a restart
+    watcher = None
+    if settings.content_reload_interval > 0:
+        watcher = asyncio.create_task(store.watch(settings.content_reload_interval))
+    # Deliver queued email in the background
+    mailer = None
+    if settings.email_enabled:
+        mailer = asyncio.create_task(
+            get_mail_queue().run_worker(
+                batch_size=settings.mail_queue_batch_size,
+                poll_interval=settings.mail_queue_poll_interval,
+            )
+        )
+    yield
+    for task in (watcher, mailer):
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+    await close_email_providers()
+
 
 # Initialize FastAPI app
-app = FastAPI(title="Ishtar AI", description="AI Solutions for Regulated Enterprises and Media")
+app = FastAPI(
+    title="Ishtar AI",
+    description="AI Solutions for Regulated Enterprises and Media",
+    lifespan=lifespan,
+)
 
-# Add security headers middleware
-app.add_middleware(SecurityHeadersMiddleware)
+# Answer from the pre-rendered build when enabled; added first so the
+# security headers middleware still wraps its responses
+if settings.serve_prerendered:
+    app.add_middleware(PrerenderedMiddleware, directory=settings.prerender_dir)
 
-# Mount static files
-app.mount("/static", StaticFiles(directory="app/static"), name="static")
+# Compress dynamic responses; responses that are already encoded pass through
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_min_size,
+    gzip_level=settings.compression_gzip_level,
+    brotli_quality=settings.compression_brotli_quality,
+)
+
+# Add security and cache headers; route cache policies are resolved against
+# app.routes when the middleware stack is built, after every router is included
+app.add_middleware(SecurityHeadersMiddleware, routes=app.routes)
+
+# Mount static files (plain and content-hashed names)
+app.mount(
+    "/static",
+    HashedStaticFiles(
+        directory="app/static",
+        manifest=get_asset_manifest(),
+        precompressed_dir=settings.static_precompressed_dir,
+    ),
+    name="static",
+)
 
 # Templates
 templates = Jinja2Templates(directory="app/templates")
+templates.env.globals["asset_url"] = asset_url
+templates.env.globals["picture"] = picture
 
 # Include routes
-from app.routes import pages, seo
+from app.routes import api, pages, seo
 
 app.include_router(pages.router)
 app.include_router(seo.router)
+app.include_router(api.router)
 
 
 # Error handlers
@@ -52,5 +125,8 @@ async def server_error_handler(request: Request, exc: Exception):
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
     """Handle HTTP exceptions (excluding 404 which is handled by not_found_handler)"""
     return templates.TemplateResponse(
-        "500.html", {"request": request, "config": None}, status_code=exc.status_code
+        "500.html",
+        {"request": request, "config": None},
+        status_code=exc.status_code,
+        headers=getattr(exc, "headers", None),
     )
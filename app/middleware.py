@@ -1,56 +1,481 @@
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
-from typing import Callable
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Dict, List, Optional, Pattern, Tuple
 
+from app.utils.cache_policy import (
+    NO_STORE,
+    PATH_POLICIES,
+    CachePolicy,
+    route_policies,
+)
+from app.utils.compression import (
+    StreamCompressor,
+    accepted_encodings,
+    available_encodings,
+    compress,
+    is_compressible_type,
+)
+from app.utils.http import (
+    is_not_modified,
+    make_etag,
+    not_modified_headers,
+    variant_etag,
+)
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    """Add security headers to all responses"""
+HeaderList = List[Tuple[bytes, bytes]]
+# A page variant: body, headers, ETag and the headers of its 304
+Variant = Tuple[bytes, HeaderList, str, HeaderList]
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        response = await call_next(request)
+# Content Security Policy
+# Allow inline styles and scripts for Font Awesome and our own assets
+CONTENT_SECURITY_POLICY = (
+    "default-src 'self'; "
+    "script-src 'self' 'unsafe-inline' https://cdnjs.cloudflare.com https://www.googletagmanager.com https://plausible.io; "
+    "style-src 'self' 'unsafe-inline' https://cdnjs.cloudflare.com; "
+    "img-src 'self' data: https:; "
+    "font-src 'self' https://cdnjs.cloudflare.com data:; "
+    "connect-src 'self' https://www.google-analytics.com https://plausible.io; "
+    "frame-src https://calendly.com; "
+    "base-uri 'self'; "
+    "form-action 'self';"
+)
 
-        # Security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Permissions-Policy"] = (
-            "geolocation=(), microphone=(), camera=()"
+SECURITY_HEADERS = {
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "DENY",
+    "X-XSS-Protection": "1; mode=block",
+    "Referrer-Policy": "strict-origin-when-cross-origin",
+    "Permissions-Policy": "geolocation=(), microphone=(), camera=()",
+    "Content-Security-Policy": CONTENT_SECURITY_POLICY,
+}
+
+# Prebuilt headers for one policy: the policy, the headers to add and the
+# names of the headers they replace
+Built = Tuple[Optional[CachePolicy], HeaderList, frozenset]
+
+
+def _encode_headers(headers: Dict[str, str]) -> HeaderList:
+    return [
+        (name.lower().encode("latin-1"), value.encode("latin-1"))
+        for name, value in headers.items()
+    ]
+
+
+def _merge_vary(raw_headers, vary: Tuple[str, ...]) -> Tuple[bytes, bytes]:
+    """One Vary header listing the response's own values and the policy's"""
+    values: List[str] = []
+    for name, value in raw_headers:
+        if name.lower() == b"vary":
+            values.extend(v.strip() for v in value.decode("latin-1").split(","))
+    seen = set()
+    merged = []
+    for value in [*values, *vary]:
+        if value and value.lower() not in seen:
+            seen.add(value.lower())
+            merged.append(value)
+    return b"vary", ", ".join(merged).encode("latin-1")
+
+
+class SecurityHeadersMiddleware:
+    """
+    Add security and cache headers to all responses
+
+    A plain ASGI middleware: the header lists for each cache policy are built
+    once, and each response only picks one and splices it into its
+    http.response.start message. Headers the app already set under the same
+    names are replaced.
+
+    The policy comes from, in order:
+    - NO_STORE for errors and for methods other than GET and HEAD
+    - the response itself, when it sets its own Cache-Control (it then gets
+      only the security headers)
+    - the route that handled the request, from ROUTE_POLICIES, resolved once
+      per route when the middleware stack is built
+    - PATH_POLICIES for unrouted paths (static files), else NO_STORE
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        routes=None,
+        route_table: Optional[Dict[str, CachePolicy]] = None,
+    ):
+        self.app = app
+        self.default = self._build(NO_STORE)
+        self.security = self._build(None)
+        # (prefix, pattern, prebuilt headers) per path policy
+        self.paths: List[Tuple[str, Optional[Pattern], Built]] = [
+            (prefix, pattern, self._build(policy))
+            for prefix, pattern, policy in PATH_POLICIES
+        ]
+        # Route endpoint (from the scope once routed) -> prebuilt headers
+        self.endpoints: Dict[object, Built] = {}
+        if routes is not None:
+            self.endpoints = {
+                endpoint: self._build(policy)
+                for endpoint, policy in route_policies(routes, route_table).items()
+            }
+
+    @staticmethod
+    def _build(policy: Optional[CachePolicy]) -> Built:
+        headers = _encode_headers(
+            {**SECURITY_HEADERS, **(policy.headers if policy else {})}
+        )
+        names = {name for name, _ in headers}
+        if policy is not None and policy.vary:
+            names.add(b"vary")
+        if policy is not None and policy.surrogate_keys:
+            names.add(b"surrogate-key")
+        return policy, headers, frozenset(names)
+
+    def _select(self, scope: Scope, path: str, message: Message) -> Built:
+        """Pick the prebuilt headers for a response to a request for path"""
+        if message["status"] >= 400 or scope["method"] not in ("GET", "HEAD"):
+            return self.default
+        if any(
+            name.lower() == b"cache-control" for name, _ in message.get("headers", ())
+        ):
+            return self.security
+        built = self.endpoints.get(scope.get("endpoint"))
+        if built is not None:
+            return built
+        for prefix, pattern, built in self.paths:
+            if path.startswith(prefix) and (pattern is None or pattern.search(path)):
+                return built
+        return self.default
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Routing fills in the endpoint, but mounts also rewrite the path
+        path = scope["path"]
+
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                policy, extra, names = self._select(scope, path, message)
+                raw_headers = message.get("headers", ())
+                headers = [
+                    header for header in raw_headers if header[0].lower() not in names
+                ]
+                headers.extend(extra)
+                if policy is not None:
+                    if policy.vary:
+                        headers.append(_merge_vary(raw_headers, policy.vary))
+                    key = policy.surrogate_key(scope.get("path_params", {}))
+                    if key:
+                        headers.append((b"surrogate-key", key.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+class PrerenderedMiddleware:
+    """
+    Serve pages from a pre-rendered build before routing
+
+    GET and HEAD requests whose path and query match a page in the build are
+    answered from memory, as the best precompressed variant the client
+    accepts; everything else (forms, search, static files, unknown query
+    strings) goes to the app. Add this before SecurityHeadersMiddleware so
+    pre-rendered pages still get its headers.
+
+    Pages keep the validators and cache headers they were built with; each
+    precompressed variant gets its own ETag, and conditional requests for an
+    unchanged variant are answered with 304.
+    """
+
+    def __init__(self, app: ASGIApp, directory: Optional[str] = None, pages=None):
+        from app.utils.prerender import load_site
+
+        self.app = app
+        if pages is None and directory:
+            pages = load_site(directory)
+            # Edited content files make the build stale; render dynamically
+            # from then on
+            from app.content.store import get_content_store
+
+            get_content_store().subscribe(lambda registry: self.pages.clear())
+        # (path, canonical query) -> ({encoding or None: variant}, last modified)
+        self.pages: Dict[
+            Tuple[str, str], Tuple[Dict[Optional[str], Variant], Optional[datetime]]
+        ] = {key: self._variants(*page) for key, page in (pages or {}).items()}
+
+    @staticmethod
+    def _variants(
+        body: bytes,
+        content_type: str,
+        variants: Dict[str, bytes],
+        headers: Dict[str, str],
+    ) -> Tuple[Dict[Optional[str], Variant], Optional[datetime]]:
+        """Prebuild the body, headers and 304 headers for each encoding of a page"""
+        etag = headers.get("etag") or make_etag(body)
+        last_modified = None
+        if headers.get("last-modified"):
+            try:
+                last_modified = parsedate_to_datetime(headers["last-modified"])
+            except (TypeError, ValueError):
+                pass
+
+        base = [(b"content-type", content_type.encode("latin-1"))]
+        vary = headers.get("vary") or ("Accept-Encoding" if variants else None)
+        if vary:
+            base.append((b"vary", vary.encode("latin-1")))
+        base.extend(
+            (name.encode("latin-1"), value.encode("latin-1"))
+            for name, value in headers.items()
+            if name not in ("etag", "vary")
+        )
+
+        built = {}
+        for encoding, data in [(None, body), *variants.items()]:
+            tag = variant_etag(etag, encoding)
+            raw_headers = [
+                (b"content-length", str(len(data)).encode("latin-1")),
+                (b"etag", tag.encode("latin-1")),
+                *base,
+            ]
+            if encoding:
+                raw_headers.insert(1, (b"content-encoding", encoding.encode("latin-1")))
+            built[encoding] = (
+                data,
+                raw_headers,
+                tag,
+                not_modified_headers(raw_headers),
+            )
+        return built, last_modified
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in ("GET", "HEAD")
+            or not self.pages
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        from app.utils.prerender import query_key
+
+        query = scope.get("query_string", b"").decode("latin-1")
+        page = self.pages.get((scope["path"], query_key(query) if query else ""))
+        if page is None:
+            await self.app(scope, receive, send)
+            return
+        page, last_modified = page
+        request_headers = Headers(scope=scope)
+
+        # Pick the preferred precompressed variant the client accepts
+        encoding = None
+        if len(page) > 1:
+            accept = request_headers.get("accept-encoding", "")
+            for candidate in accepted_encodings(accept) if accept else ():
+                if candidate in page:
+                    encoding = candidate
+                    break
+        body, raw_headers, etag, cached_headers = page[encoding]
+        if is_not_modified(request_headers, etag, last_modified):
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 304,
+                    "headers": list(cached_headers),
+                }
+            )
+            await send({"type": "http.response.body", "body": b""})
+            return
+        await send(
+            {"type": "http.response.start", "status": 200, "headers": list(raw_headers)}
+        )
+        await send(
+            {
+                "type": "http.response.body",
+                "body": b"" if scope["method"] == "HEAD" else body,
+            }
         )
 
-        # Content Security Policy
-        # Allow inline styles and scripts for Font Awesome and our own assets
-        csp = (
-            "default-src 'self'; "
-            "script-src 'self' 'unsafe-inline' https://cdnjs.cloudflare.com https://www.googletagmanager.com https://plausible.io; "
-            "style-src 'self' 'unsafe-inline' https://cdnjs.cloudflare.com; "
-            "img-src 'self' data: https:; "
-            "font-src 'self' https://cdnjs.cloudflare.com data:; "
-            "connect-src 'self' https://www.google-analytics.com https://plausible.io; "
-            "frame-src https://calendly.com; "
-            "base-uri 'self'; "
-            "form-action 'self';"
+
+class CompressionMiddleware:
+    """
+    Compress dynamic responses with brotli or gzip as they stream
+
+    Only responses with an allowlisted Content-Type, no Content-Encoding of
+    their own and at least minimum_size bytes are compressed. Body chunks are
+    buffered only until that threshold is reached; after that each chunk is
+    compressed and flushed as it arrives. A response that fits in a single
+    chunk is compressed whole and keeps an exact Content-Length.
+
+    Responses that already carry Content-Encoding (precompressed static
+    files, pre-rendered pages, cached variants from the render cache) pass
+    through untouched. Static files are excluded so they are never
+    compressed on the request path.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 500,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        exclude_prefixes: Tuple[str, ...] = ("/static/",),
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {"gzip": gzip_level, "br": brotli_quality}
+        self.exclude_prefixes = exclude_prefixes
+        self.encodings = available_encodings()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] == "HEAD"
+            or scope["path"].startswith(self.exclude_prefixes)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match:
+            send = _matching_not_modified(send, if_none_match)
+
+        accept = request_headers.get("accept-encoding", "")
+        encodings = accepted_encodings(accept, self.encodings) if accept else []
+        if not encodings:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(
+            send, encodings[0], self.levels[encodings[0]], self.minimum_size
         )
-        response.headers["Content-Security-Policy"] = csp
-
-        # Cache control for static assets
-        # In development, disable caching for CSS/JS to see changes immediately
-        if request.url.path.startswith("/static/"):
-            # For CSS and JS files, disable cache in development
-            if request.url.path.endswith((".css", ".js")):
-                response.headers["Cache-Control"] = (
-                    "no-cache, no-store, must-revalidate"
-                )
-                response.headers["Pragma"] = "no-cache"
-                response.headers["Expires"] = "0"
-            else:
-                response.headers["Cache-Control"] = (
-                    "public, max-age=31536000, immutable"
-                )
-        else:
-            response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-            response.headers["Pragma"] = "no-cache"
-            response.headers["Expires"] = "0"
-
-        return response
+        await self.app(scope, receive, responder.send)
+
+
+def _matching_not_modified(send: Send, if_none_match: str) -> Send:
+    """
+    Wrap send so a 304 carries the validator form the client holds
+
+    The app answers conditional requests with its strong ETag, but a body
+    this middleware compressed went out with the weak form. When the client
+    presents that weak tag, the 304 echoes it too, so caches see the same
+    validator on the 200 and the 304.
+    """
+    held = {tag.strip().encode("latin-1") for tag in if_none_match.split(",")}
+
+    async def send_matching(message: Message):
+        if message["type"] == "http.response.start" and message["status"] == 304:
+            headers = []
+            for name, value in message.get("headers", []):
+                if (
+                    name.lower() == b"etag"
+                    and not value.startswith(b"W/")
+                    and b"W/" + value in held
+                ):
+                    value = b"W/" + value
+                headers.append((name, value))
+            message = {**message, "headers": headers}
+        await send(message)
+
+    return send_matching
+
+
+class _CompressionResponder:
+    """Per-response state for CompressionMiddleware"""
+
+    def __init__(self, send: Send, encoding: str, level: int, minimum_size: int):
+        self._send = send
+        self.encoding = encoding
+        self.level = level
+        self.minimum_size = minimum_size
+        self.start: Optional[Message] = None
+        # "passthrough" or "buffering" once the start message is seen;
+        # "buffering" becomes "streaming" when the body passes minimum_size
+        self.state = "passthrough"
+        self.buffer: List[bytes] = []
+        self.buffered = 0
+        self.compressor: Optional[StreamCompressor] = None
+
+    def _should_compress(self, message: Message) -> bool:
+        if message["status"] < 200 or message["status"] in (204, 304):
+            return False
+        headers = Headers(raw=message.get("headers", []))
+        if "content-encoding" in headers:
+            return False
+        if not is_compressible_type(headers.get("content-type", "")):
+            return False
+        length = headers.get("content-length")
+        return length is None or int(length) >= self.minimum_size
+
+    def _compressed_start(self, content_length: Optional[int]) -> Message:
+        """The start message with encoding headers and a new length"""
+        headers = []
+        for name, value in self.start.get("headers", []):
+            if name.lower() in (b"content-length", b"vary"):
+                continue
+            if name.lower() == b"etag" and not value.startswith(b"W/"):
+                # The encoded body is a different representation, so a strong
+                # validator of the original no longer applies byte-for-byte
+                value = b"W/" + value
+            headers.append((name, value))
+        vary = [
+            value
+            for name, value in self.start.get("headers", [])
+            if name.lower() == b"vary"
+        ]
+        if not any(b"accept-encoding" in value.lower() for value in vary):
+            vary.append(b"Accept-Encoding")
+        headers.append((b"vary", b", ".join(vary)))
+        headers.append((b"content-encoding", self.encoding.encode("latin-1")))
+        if content_length is not None:
+            headers.append((b"content-length", str(content_length).encode("latin-1")))
+        return {**self.start, "headers": headers}
+
+    async def send(self, message: Message):
+        if message["type"] == "http.response.start":
+            self.start = message
+            self.state = (
+                "buffering" if self._should_compress(message) else "passthrough"
+            )
+            if self.state == "passthrough":
+                await self._send(message)
+            return
+
+        if message["type"] != "http.response.body" or self.state == "passthrough":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.state == "streaming":
+            chunk = self.compressor.compress(body) if body else b""
+            if not more_body:
+                chunk += self.compressor.finish()
+            await self._send({**message, "body": chunk})
+            return
+
+        # Buffering: hold chunks until the body is known to be big enough
+        self.buffer.append(body)
+        self.buffered += len(body)
+        if more_body and self.buffered < self.minimum_size:
+            return
+
+        data = b"".join(self.buffer)
+        self.buffer = []
+        if not more_body:
+            if self.buffered < self.minimum_size:
+                await self._send(self.start)
+                await self._send({**message, "body": data})
+                return
+            compressed = compress(data, self.encoding, self.level)
+            await self._send(self._compressed_start(len(compressed)))
+            await self._send({**message, "body": compressed})
+            return
+
+        self.state = "streaming"
+        self.compressor = StreamCompressor(self.encoding, self.level)
+        await self._send(self._compressed_start(None))
+        await self._send({**message, "body": self.compressor.compress(data)})
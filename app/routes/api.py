@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Header, HTTPException, Query
+from typing import Optional
+import hmac
+
+from app.config import settings
+
+router = APIRouter(prefix="/api")
+
+
+@router.get("/search/suggest")
+async def search_suggest(
+    q: str = Query("", max_length=100),
+    limit: int = Query(8, ge=1, le=20),
+):
+    """Typeahead completions for the search box"""
+    from app.utils.search import suggest
+
+    return {"query": q, **suggest(q, limit=limit)}
+
+
+def require_metrics_token(authorization: Optional[str]):
+    """Reject metrics requests without the configured bearer token"""
+    if not settings.metrics_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    expected = f"Bearer {settings.metrics_token}"
+    if not hmac.compare_digest((authorization or "").encode(), expected.encode()):
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+@router.get("/metrics/mail")
+async def mail_metrics(authorization: Optional[str] = Header(None)):
+    """Outgoing mail queue depth, delivery latency and provider send latency"""
+    require_metrics_token(authorization)
+    from app.utils.email import email_provider_stats
+    from app.utils.mail_queue import get_mail_queue
+
+    return {**get_mail_queue().stats(), "providers": email_provider_stats()}
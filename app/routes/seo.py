@@ -1,29 +1,61 @@
-from fastapi import APIRouter
-from fastapi.responses import Response
-from datetime import datetime
-
-from app.utils.rss import generate_rss_feed
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+import hashlib
+
+from app.config import settings
+from app.utils.cache import LRUCache
+from app.utils.feeds import iter_atom_feed, iter_json_feed
+from app.utils.http import (
+    conditional_response,
+    is_not_modified,
+    make_etag,
+    validator_headers,
+)
+from app.utils.rss import iter_rss_feed, post_date
+from app.utils.sitemap import build_sitemaps
 
 router = APIRouter()
 
+# Feed format -> (serializer, media type, path)
+FEED_FORMATS = {
+    "rss": (iter_rss_feed, "application/rss+xml", "/feed"),
+    "atom": (iter_atom_feed, "application/atom+xml", "/atom.xml"),
+    "json": (iter_json_feed, "application/feed+json", "/feed.json"),
+}
+
+# (content version, post records) for the feeds
+_feed_posts: Optional[Tuple[str, List[Dict]]] = None
+
+# (body, ETag) of the first page of each feed, which readers poll; archive
+# pages are streamed from the serializer
+_feed_cache = LRUCache(maxsize=8)
+
+# (content and template versions, sitemap files) of the sitemaps last built
+_sitemap_cache: Optional[
+    Tuple[Tuple, Dict[str, Tuple[bytes, str, Optional[datetime]]]]
+] = None
+
 
 def get_blog_posts_for_rss():
     """Get blog posts formatted for RSS feed"""
-    # Import blog posts data
-    from app.routes.pages import get_blog_posts
+    from app.content.registry import get_registry
 
-    posts_data = get_blog_posts()
+    posts_data = get_registry().blog_posts
     rss_posts = []
 
     for post in posts_data:
+        # Posts without a valid date are listed without pubDate/updated
+        published = post_date(post.get("date"))
+        if published is not None and published.tzinfo is None:
+            published = published.replace(tzinfo=timezone.utc)
         rss_posts.append(
             {
                 "title": post.get("title", ""),
                 "slug": post.get("slug", ""),
                 "description": post.get("excerpt", ""),
-                "published_date": datetime.fromisoformat(
-                    post.get("date", "2024-01-15")
-                ),
+                "published_date": published,
                 "author": post.get("author", "Ishtar AI Team"),
                 "categories": [
                     "AI",
@@ -37,80 +69,59 @@ def get_blog_posts_for_rss():
     return rss_posts
 
 
+def get_sitemaps(request: Request) -> Dict[str, Tuple[bytes, str, Optional[datetime]]]:
+    """
+    Get the sitemap files as {path: (body, ETag, last modified)}
+
+    Built once per content version and template version, and reused until
+    either changes.
+    """
+    from app.content.registry import get_registry
+    from app.routes.pages import render_cache
+
+    global _sitemap_cache
+    registry = get_registry()
+    key = (registry.version, render_cache.template_version(), settings.sitemap_gzip)
+    if _sitemap_cache is None or _sitemap_cache[0] != key:
+        files = build_sitemaps(
+            request.app.routes, registry, settings.site_url, settings.sitemap_gzip
+        )
+        _sitemap_cache = (
+            key,
+            {
+                path: (
+                    body,
+                    make_etag(body),
+                    datetime.fromtimestamp(lastmod, timezone.utc) if lastmod else None,
+                )
+                for path, (body, lastmod) in files.items()
+            },
+        )
+    return _sitemap_cache[1]
+
+
+def sitemap_response(request: Request, path: str) -> Response:
+    """Serve a sitemap file, or 304 if the crawler's copy is current"""
+    entry = get_sitemaps(request).get(path)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Sitemap not found")
+    body, etag, last_modified = entry
+    media_type = "application/gzip" if path.endswith(".gz") else "application/xml"
+    return conditional_response(
+        request.headers, body, media_type, etag=etag, last_modified=last_modified
+    )
+
+
 @router.get("/sitemap.xml")
-async def sitemap():
-    """Generate sitemap.xml for search engines"""
-    base_url = "https://ishtar-ai.com"
-    current_date = datetime.now().strftime("%Y-%m-%d")
-
-    pages = [
-        {"loc": "/", "changefreq": "weekly", "priority": "1.0"},
-        {"loc": "/services", "changefreq": "monthly", "priority": "0.9"},
-        {"loc": "/pricing", "changefreq": "monthly", "priority": "0.8"},
-        {"loc": "/case-studies", "changefreq": "monthly", "priority": "0.8"},
-        {"loc": "/resources", "changefreq": "monthly", "priority": "0.8"},
-        {"loc": "/demo", "changefreq": "monthly", "priority": "0.8"},
-        {"loc": "/finance", "changefreq": "monthly", "priority": "0.8"},
-        {"loc": "/media-ads", "changefreq": "monthly", "priority": "0.8"},
-        {"loc": "/blog", "changefreq": "weekly", "priority": "0.8"},
-        {"loc": "/faq", "changefreq": "monthly", "priority": "0.7"},
-        {"loc": "/contact", "changefreq": "monthly", "priority": "0.7"},
-        {"loc": "/privacy", "changefreq": "yearly", "priority": "0.3"},
-        {"loc": "/terms", "changefreq": "yearly", "priority": "0.3"},
-        {"loc": "/security", "changefreq": "monthly", "priority": "0.8"},
-        {"loc": "/trust-center", "changefreq": "monthly", "priority": "0.8"},
-        {"loc": "/about", "changefreq": "monthly", "priority": "0.8"},
-        {"loc": "/implementation", "changefreq": "monthly", "priority": "0.7"},
-        {"loc": "/responsible-ai", "changefreq": "monthly", "priority": "0.7"},
-        {"loc": "/products/rag-copilots", "changefreq": "monthly", "priority": "0.8"},
-        {
-            "loc": "/products/agent-automation",
-            "changefreq": "monthly",
-            "priority": "0.8",
-        },
-        {
-            "loc": "/products/llmops-foundation",
-            "changefreq": "monthly",
-            "priority": "0.8",
-        },
-        {"loc": "/products/genai-security", "changefreq": "monthly", "priority": "0.8"},
-        {
-            "loc": "/products/synthetic-media-compliance",
-            "changefreq": "monthly",
-            "priority": "0.8",
-        },
-    ]
-
-    # Add individual case studies
-    try:
-        from app.content.case_studies import get_case_studies
-
-        case_studies = get_case_studies()
-        for case_study in case_studies:
-            pages.append(
-                {
-                    "loc": f"/case-studies/{case_study.get('slug', '')}",
-                    "changefreq": "monthly",
-                    "priority": "0.7",
-                }
-            )
-    except Exception:
-        pass  # Silently fail if case studies can't be loaded
-
-    sitemap_xml = '<?xml version="1.0" encoding="UTF-8"?>\n'
-    sitemap_xml += '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
-
-    for page in pages:
-        sitemap_xml += f"  <url>\n"
-        sitemap_xml += f'    <loc>{base_url}{page["loc"]}</loc>\n'
-        sitemap_xml += f"    <lastmod>{current_date}</lastmod>\n"
-        sitemap_xml += f'    <changefreq>{page["changefreq"]}</changefreq>\n'
-        sitemap_xml += f'    <priority>{page["priority"]}</priority>\n'
-        sitemap_xml += f"  </url>\n"
-
-    sitemap_xml += "</urlset>"
-
-    return Response(content=sitemap_xml, media_type="application/xml")
+async def sitemap(request: Request):
+    """Sitemap index for search engines"""
+    return sitemap_response(request, "/sitemap.xml")
+
+
+@router.get("/sitemaps/{name}")
+async def child_sitemap(request: Request, name: str):
+    """One section's sitemap, plain or gzipped"""
+    return sitemap_response(request, f"/sitemaps/{name}")
 
 
 @router.get("/robots.txt")
@@ -124,10 +135,113 @@ Sitemap: https://ishtar-ai.com/sitemap.xml
     return Response(content=robots_txt, media_type="text/plain")
 
 
+def get_feed_posts() -> List[Dict]:
+    """Get the post records for the feeds, with article bodies, per content version"""
+    from app.content.registry import get_registry
+
+    global _feed_posts
+    registry = get_registry()
+    if _feed_posts is None or _feed_posts[0] != registry.version:
+        posts = get_blog_posts_for_rss()
+        for post in posts:
+            article = registry.blog_articles_by_slug.get(post["slug"])
+            if article:
+                post["content"] = article["content"]
+        _feed_posts = (registry.version, posts)
+    return _feed_posts[1]
+
+
+def _page_links(path: str, page: int, pages: int) -> Dict[str, str]:
+    """Self and RFC 5005 paging links for a feed page"""
+
+    def url(number: int) -> str:
+        return f"{settings.site_url}{path}" + (f"?page={number}" if number > 1 else "")
+
+    links = {"self": url(page)}
+    if pages > 1:
+        links["first"] = url(1)
+        if page > 1:
+            links["previous"] = url(page - 1)
+        if page < pages:
+            links["next"] = url(page + 1)
+        links["last"] = url(pages)
+    return links
+
+
+def feed_response(request: Request, feed_format: str, page: int) -> Response:
+    """
+    Serve one page of a feed
+
+    The first page, which readers poll, is cached as bytes and tagged with a
+    hash of the body. Archive pages are streamed, so their ETag is derived
+    from the content version and everything else the output depends on, and
+    a conditional GET is answered with 304 without serializing anything.
+    """
+    from app.content.registry import get_registry
+
+    serializer, media_type, path = FEED_FORMATS[feed_format]
+    posts = get_feed_posts()
+    size = settings.feed_page_size
+    pages = max(1, -(-len(posts) // size))
+    if page > pages:
+        raise HTTPException(status_code=404, detail="Feed page not found")
+
+    items = posts[(page - 1) * size : page * size]
+    full = settings.feed_full_content
+    site_url = settings.site_url
+    version = get_registry().version
+    last_modified = max(
+        (post["published_date"] for post in items if post["published_date"]),
+        default=None,
+    )
+
+    def render():
+        return serializer(items, site_url, _page_links(path, page, pages), full)
+
+    if page == 1:
+        key = (version, feed_format, site_url, size, full)
+        cached = _feed_cache.get(key)
+        if cached is None:
+            body = "".join(render()).encode("utf-8")
+            cached = (body, make_etag(body))
+            _feed_cache.set(key, cached)
+        body, etag = cached
+        return conditional_response(
+            request.headers, body, media_type, etag=etag, last_modified=last_modified
+        )
+
+    # The registry version is a hash of the content files, so this tag is
+    # the same on every instance serving the same content
+    etag = (
+        '"%s"'
+        % hashlib.sha256(
+            f"{version}:{site_url}:{feed_format}:{page}:{size}:{full}".encode()
+        ).hexdigest()[:32]
+    )
+    headers = validator_headers(etag, last_modified)
+    if is_not_modified(request.headers, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    return StreamingResponse(
+        (chunk.encode("utf-8") for chunk in render()),
+        media_type=media_type,
+        headers=headers,
+    )
+
+
 @router.get("/feed")
 @router.get("/rss.xml")
-async def rss_feed():
-    """Generate RSS feed for blog posts"""
-    posts = get_blog_posts_for_rss()
-    rss_xml = generate_rss_feed(posts)
-    return Response(content=rss_xml, media_type="application/rss+xml")
+async def rss_feed(request: Request, page: int = Query(1, ge=1)):
+    """RSS 2.0 feed of blog posts"""
+    return feed_response(request, "rss", page)
+
+
+@router.get("/atom.xml")
+async def atom_feed(request: Request, page: int = Query(1, ge=1)):
+    """Atom 1.0 feed of blog posts"""
+    return feed_response(request, "atom", page)
+
+
+@router.get("/feed.json")
+async def json_feed(request: Request, page: int = Query(1, ge=1)):
+    """JSON Feed 1.1 of blog posts"""
+    return feed_response(request, "json", page)
@@ -377,6 +377,40 @@ function showError(input, message) {
     });
 })();
 
+// Search Typeahead
+(function () {
+    const searchInput = document.getElementById('search-input');
+    const suggestionList = document.getElementById('search-suggestions');
+    if (!searchInput || !suggestionList) return;
+
+    let debounceTimer = null;
+    let lastQuery = '';
+
+    searchInput.addEventListener('input', function () {
+        clearTimeout(debounceTimer);
+        debounceTimer = setTimeout(function () {
+            const query = searchInput.value.trim();
+            if (query.length < 2 || query === lastQuery) return;
+            lastQuery = query;
+
+            fetch('/api/search/suggest?limit=6&q=' + encodeURIComponent(searchInput.value))
+                .then(response => response.ok ? response.json() : null)
+                .then(data => {
+                    if (!data || searchInput.value.trim() !== query) return;
+                    suggestionList.innerHTML = '';
+                    const options = data.terms.map(t => t.text)
+                        .concat(data.documents.map(d => d.title));
+                    options.forEach(text => {
+                        const option = document.createElement('option');
+                        option.value = text;
+                        suggestionList.appendChild(option);
+                    });
+                })
+                .catch(() => { });
+        }, 120);
+    });
+})();
+
 // Social Sharing
 (function () {
     const socialShare = document.getElementById('social-share');
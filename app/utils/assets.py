@@ -0,0 +1,341 @@
+"""
+Static Asset Utility Module
+Content-hashed URLs for files under app/static so they can be cached forever
+"""
+
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import time
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from app.utils.compression import (
+    accepted_encodings,
+    is_compressible,
+    variant_path,
+    warn_if_no_brotli,
+    write_variants,
+)
+
+HASH_LENGTH = 12
+
+# "css/styles.0123456789ab.css" -> ("css/styles", "0123456789ab", ".css")
+HASHED_NAME_RE = re.compile(
+    r"^(?P<stem>.+)\.(?P<hash>[0-9a-f]{%d})(?P<ext>\.[^./]+)$" % HASH_LENGTH
+)
+
+
+def hashed_name(path: str, digest: str) -> str:
+    """Insert a content hash before the file extension"""
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.{digest[:HASH_LENGTH]}{ext}"
+
+
+def file_digest(path: Path) -> str:
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class AssetManifest:
+    """
+    Maps static file paths to content-hashed names
+
+    In production the mapping is read from a manifest written at build time
+    (`python -m app.utils.assets build`). Without one, as in development,
+    hashes are computed on first use and recomputed whenever a file's mtime
+    or size changes, so edited CSS/JS gets a new URL on the next render.
+    Requests for hashed names are always checked against the file's current
+    contents, so a manifest older than the files never serves new content
+    under an old hash.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        url_prefix: str = "/static",
+        manifest_path: Optional[str] = None,
+        check_interval: float = 1.0,
+    ):
+        self.directory = Path(directory)
+        self.url_prefix = url_prefix
+        self.check_interval = check_interval
+        # path -> hashed path, when loaded from a manifest
+        self.manifest: Optional[Dict[str, str]] = None
+        # path -> ((mtime_ns, size), hashed path), when computed on the fly
+        self._hashed: Dict[str, Tuple[Tuple[int, int], str]] = {}
+        self._version = ""
+        self._checked_at = float("-inf")
+
+        if manifest_path and os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                self.manifest = json.load(f)
+            self._version = hashlib.sha1(
+                json.dumps(self.manifest, sort_keys=True).encode()
+            ).hexdigest()
+
+    def hashed_path(self, path: str) -> Optional[str]:
+        """
+        Get the hashed name for a file relative to the static directory
+
+        Returns:
+            The hashed path, or None if the file does not exist
+        """
+        if self.manifest is not None:
+            return self.manifest.get(path.lstrip("/"))
+        return self.current_hashed_path(path)
+
+    def current_hashed_path(self, path: str) -> Optional[str]:
+        """
+        Hashed name from the file's current contents, ignoring the manifest
+
+        The digest is cached until the file's mtime or size changes.
+
+        Returns:
+            The hashed path, or None if the file does not exist
+        """
+        path = path.lstrip("/")
+        try:
+            stat = (self.directory / path).stat()
+        except OSError:
+            return None
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._hashed.get(path)
+        if cached is None or cached[0] != key:
+            cached = (key, hashed_name(path, file_digest(self.directory / path)))
+            self._hashed[path] = cached
+        return cached[1]
+
+    def url(self, path: str) -> str:
+        """URL of a static file with its content hash, or the plain URL if missing"""
+        hashed = self.hashed_path(path)
+        if hashed is None:
+            print(f"Static asset not found: {path}")
+            hashed = path.lstrip("/")
+        return f"{self.url_prefix}/{hashed}"
+
+    def resolve(self, path: str) -> Optional[str]:
+        """
+        Map a hashed path back to the file it names
+
+        Returns:
+            The unhashed path, or None if the name has no hash or the hash is
+            not the file's current one
+        """
+        match = HASHED_NAME_RE.match(path.lstrip("/"))
+        if not match:
+            return None
+        original = match.group("stem") + match.group("ext")
+        if self.current_hashed_path(original) != path.lstrip("/"):
+            return None
+        return original
+
+    def version(self) -> str:
+        """
+        Fingerprint of the current asset hashes, for caches of rendered HTML
+
+        Without a manifest the static directory is stat'ed at most once per
+        check_interval seconds.
+        """
+        if self.manifest is not None:
+            return self._version
+        now = time.monotonic()
+        if now - self._checked_at >= self.check_interval:
+            digest = hashlib.sha1()
+            for path in sorted(p for p in self.directory.rglob("*") if p.is_file()):
+                stat = path.stat()
+                digest.update(f"{path}:{stat.st_mtime_ns}:{stat.st_size}".encode())
+            self._version = digest.hexdigest()
+            self._checked_at = now
+        return self._version
+
+
+def build_manifest(directory: str = "app/static", path: Optional[str] = None) -> str:
+    """
+    Hash every static file and write the manifest
+
+    Args:
+        directory: Static directory
+        path: Output file (defaults to settings.asset_manifest_path)
+
+    Returns:
+        The path written
+    """
+    from app.config import settings
+
+    path = path or settings.asset_manifest_path
+    root = Path(directory)
+    manifest = {
+        file.relative_to(root).as_posix(): hashed_name(
+            file.relative_to(root).as_posix(), file_digest(file)
+        )
+        for file in sorted(root.rglob("*"))
+        if file.is_file() and not file.name.startswith(".")
+    }
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return path
+
+
+def precompress_static(
+    directory: str = "app/static", out_dir: Optional[str] = None
+) -> int:
+    """
+    Write .br and .gz variants of compressible static files
+
+    Variants are named after the content-hashed file name (for example
+    css/styles.<hash>.css.br), so a variant can never be served for a
+    different version of its file.
+
+    Args:
+        directory: Static directory
+        out_dir: Output directory (defaults to settings.static_precompressed_dir)
+
+    Returns:
+        Number of variant files written
+    """
+    from app.config import settings
+
+    warn_if_no_brotli()
+    out = Path(out_dir or settings.static_precompressed_dir)
+    root = Path(directory)
+    written = 0
+    for file in sorted(root.rglob("*")):
+        if (
+            not file.is_file()
+            or file.name.startswith(".")
+            or not is_compressible(file.name)
+        ):
+            continue
+        relative = file.relative_to(root).as_posix()
+        data = file.read_bytes()
+        written += len(
+            write_variants(data, out / hashed_name(relative, file_digest(file)))
+        )
+    return written
+
+
+class HashedStaticFiles(StaticFiles):
+    """
+    StaticFiles that also serves content-hashed names and precompressed files
+
+    "css/styles.<hash>.css" is served from "css/styles.css" only while the
+    hash matches the file's contents; stale hashes get a 404 so a cache can
+    never store old content under a new URL or the reverse.
+
+    For compressible files, the best .br or .gz variant written by the build
+    step that the client accepts is sent with Content-Encoding. Nothing is
+    compressed while serving; without a variant the file goes out as-is.
+    """
+
+    def __init__(
+        self,
+        *args,
+        manifest: AssetManifest,
+        precompressed_dir: Optional[str] = None,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.manifest = manifest
+        self.precompressed_dir = precompressed_dir
+
+    def get_path(self, scope: Scope) -> str:
+        original = self.manifest.resolve(scope["path"])
+        if original is not None:
+            return os.path.normpath(os.path.join(*original.split("/")))
+        return super().get_path(scope)
+
+    def _variant(self, full_path, scope: Scope):
+        """Find the preferred precompressed variant the client accepts"""
+        if not self.precompressed_dir or not is_compressible(str(full_path)):
+            return None
+        accept = Headers(scope=scope).get("accept-encoding", "")
+        encodings = accepted_encodings(accept) if accept else []
+        if not encodings:
+            return None
+
+        relative = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+        # Variants are named after the hash of the content they were built
+        # from, so one built from an older version of the file is not found
+        hashed = self.manifest.current_hashed_path(relative)
+        if hashed is None:
+            return None
+        for encoding in encodings:
+            path = os.path.join(self.precompressed_dir, variant_path(hashed, encoding))
+            try:
+                return encoding, path, os.stat(path)
+            except OSError:
+                continue
+        return None
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        variant = self._variant(full_path, scope)
+        if variant is None:
+            response = super().file_response(full_path, stat_result, scope, status_code)
+            if is_compressible(str(full_path)):
+                response.headers["Vary"] = "Accept-Encoding"
+            return response
+
+        encoding, path, variant_stat = variant
+        response = FileResponse(
+            path,
+            status_code=status_code,
+            stat_result=variant_stat,
+            method=scope["method"],
+            media_type=mimetypes.guess_type(str(full_path))[0] or "text/plain",
+            headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"},
+        )
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+# Global asset manifest instance
+_asset_manifest: Optional[AssetManifest] = None
+
+
+def get_asset_manifest() -> AssetManifest:
+    """Get the global asset manifest, loading the built manifest if present"""
+    global _asset_manifest
+    if _asset_manifest is None:
+        from app.config import settings
+
+        _asset_manifest = AssetManifest(
+            "app/static", manifest_path=settings.asset_manifest_path
+        )
+    return _asset_manifest
+
+
+def asset_url(path: str) -> str:
+    """Jinja global: content-hashed URL for a file under app/static"""
+    return get_asset_manifest().url(path)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if sys.argv[1:2] != ["build"]:
+        print("Usage: python -m app.utils.assets build [OUTPUT_PATH]")
+        sys.exit(2)
+    print(
+        f"Wrote asset manifest to {build_manifest(path=(sys.argv[2:3] or [None])[0])}"
+    )
+    print(f"Wrote {precompress_static()} precompressed static files")
@@ -0,0 +1,188 @@
+"""
+Cache Policy Module
+Declarative HTTP caching rules for browsers and the CDN, by route and by
+static path
+"""
+
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+import re
+
+from app.utils.assets import HASH_LENGTH
+
+
+class CachePolicy:
+    """
+    How browsers and shared caches may store a response
+
+    Args:
+        cache_control: Cache-Control for browsers, and for CDNs when there
+            is no surrogate_control
+        surrogate_control: Caching instructions for the CDN only; the CDN
+            strips the header before the response reaches the browser
+        surrogate_keys: Purge tags for the CDN; "{name}" placeholders are
+            filled from the route's path parameters
+        vary: Request headers the response varies on, merged with any Vary
+            the response already has
+        headers: Other headers to send, e.g. Pragma for old HTTP/1.0 caches
+    """
+
+    def __init__(
+        self,
+        cache_control: str,
+        surrogate_control: Optional[str] = None,
+        surrogate_keys: Iterable[str] = (),
+        vary: Iterable[str] = (),
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        self.cache_control = cache_control
+        self.surrogate_control = surrogate_control
+        self.surrogate_keys = tuple(surrogate_keys)
+        self.vary = tuple(vary)
+        self.headers = {"Cache-Control": cache_control, **(headers or {})}
+        if surrogate_control:
+            self.headers["Surrogate-Control"] = surrogate_control
+        # Keys without placeholders are joined once here
+        self._keys_static = not any("{" in key for key in self.surrogate_keys)
+        if self.surrogate_keys and self._keys_static:
+            self.headers["Surrogate-Key"] = " ".join(self.surrogate_keys)
+
+    def surrogate_key(self, path_params: Dict[str, str]) -> Optional[str]:
+        """The Surrogate-Key header for a request, if it depends on the path"""
+        if self._keys_static:
+            return None
+        try:
+            return " ".join(key.format(**path_params) for key in self.surrogate_keys)
+        except KeyError as e:
+            print(
+                f"Missing path parameter {e} for surrogate keys {self.surrogate_keys}"
+            )
+            return (
+                " ".join(key for key in self.surrogate_keys if "{" not in key) or None
+            )
+
+    def __repr__(self) -> str:
+        return f"CachePolicy({self.headers!r})"
+
+
+def public(
+    max_age: int,
+    cdn_max_age: Optional[int] = None,
+    stale_while_revalidate: int = 60,
+    stale_if_error: int = 86400,
+    surrogate_keys: Iterable[str] = (),
+) -> CachePolicy:
+    """
+    A policy for pages anyone may cache
+
+    Browsers keep the page for max_age seconds and the CDN for cdn_max_age
+    (defaulting to max_age); both may serve a stale copy while they
+    revalidate, and the CDN may serve one while the app is failing.
+    """
+    return CachePolicy(
+        f"public, max-age={max_age}, stale-while-revalidate={stale_while_revalidate}",
+        surrogate_control=(
+            f"max-age={cdn_max_age if cdn_max_age is not None else max_age}, "
+            f"stale-while-revalidate={stale_while_revalidate}, stale-if-error={stale_if_error}"
+        ),
+        surrogate_keys=surrogate_keys,
+        vary=("Accept-Encoding",),
+    )
+
+
+# Forms, API responses, errors and anything not listed below
+NO_STORE = CachePolicy(
+    "no-cache, no-store, must-revalidate",
+    headers={"Pragma": "no-cache", "Expires": "0"},
+)
+# Browsers may store the response but must revalidate it (StaticFiles
+# answers with ETag/Last-Modified, so unchanged files cost a 304)
+REVALIDATE = CachePolicy("no-cache")
+IMMUTABLE = CachePolicy("public, max-age=31536000, immutable")
+# Per-user or per-query results: the browser may reuse them briefly, shared
+# caches must not store them
+PRIVATE = CachePolicy("private, max-age=60", vary=("Accept-Encoding",))
+
+# Marketing pages change with deployments and content edits; the CDN keeps
+# them longer than browsers do and can be purged by surrogate key
+PAGES = public(300, cdn_max_age=3600, surrogate_keys=("pages",))
+PRICING = public(600, cdn_max_age=3600, surrogate_keys=("pages", "pricing"))
+FEEDS = public(900, surrogate_keys=("blog", "feeds"))
+SITEMAPS = public(3600, surrogate_keys=("sitemaps",))
+
+# Policies by route path, as declared on the router. Looked up once per
+# route when the app starts; only GET and HEAD responses use them.
+ROUTE_POLICIES: Dict[str, CachePolicy] = {
+    "/": PAGES,
+    "/services": PAGES,
+    "/finance": PAGES,
+    "/media-ads": PAGES,
+    "/privacy": PAGES,
+    "/terms": PAGES,
+    "/security": PAGES,
+    "/about": PAGES,
+    "/trust-center": PAGES,
+    "/implementation": PAGES,
+    "/responsible-ai": PAGES,
+    "/faq": PAGES,
+    "/pricing": PRICING,
+    "/products/{slug}": public(
+        300, cdn_max_age=3600, surrogate_keys=("products", "products/{slug}")
+    ),
+    "/case-studies": public(300, cdn_max_age=3600, surrogate_keys=("case-studies",)),
+    "/case-studies/{slug}": public(
+        300, cdn_max_age=3600, surrogate_keys=("case-studies", "case-studies/{slug}")
+    ),
+    "/resources": public(300, cdn_max_age=3600, surrogate_keys=("resources",)),
+    "/blog": public(300, cdn_max_age=3600, surrogate_keys=("blog",)),
+    "/blog/{slug}": public(
+        300, cdn_max_age=3600, surrogate_keys=("blog", "blog/{slug}")
+    ),
+    # Pages with forms
+    "/contact": NO_STORE,
+    "/demo": NO_STORE,
+    "/search": PRIVATE,
+    "/feed": FEEDS,
+    "/rss.xml": FEEDS,
+    "/atom.xml": FEEDS,
+    "/feed.json": FEEDS,
+    "/sitemap.xml": SITEMAPS,
+    "/sitemaps/{name}": SITEMAPS,
+    "/robots.txt": public(86400),
+}
+
+# Content-hashed static names, e.g. /static/css/styles.0123456789ab.css
+HASHED_ASSET_RE = re.compile(r"\.[0-9a-f]{%d}\.[^./]+$" % HASH_LENGTH)
+
+# Policies for responses without a route policy (static files), by path
+# prefix and an optional pattern searched in the path; the first match wins
+PATH_POLICIES: List[Tuple[str, Optional[Pattern], CachePolicy]] = [
+    ("/static/", HASHED_ASSET_RE, IMMUTABLE),
+    ("/static/", None, REVALIDATE),
+]
+
+
+def route_policies(
+    routes, table: Optional[Dict[str, CachePolicy]] = None
+) -> Dict[object, CachePolicy]:
+    """
+    Resolve the policy table against the app's routes
+
+    Returns:
+        Mapping of route endpoint to its policy
+    """
+    table = ROUTE_POLICIES if table is None else table
+    policies = {}
+    matched = set()
+    for route in routes:
+        policy = table.get(getattr(route, "path", None))
+        endpoint = getattr(route, "endpoint", None)
+        if policy is None or endpoint is None:
+            continue
+        if policies.get(endpoint, policy) is not policy:
+            print(f"Conflicting cache policies for {route.path}; using the first")
+            continue
+        policies[endpoint] = policy
+        matched.add(route.path)
+    for path in table.keys() - matched:
+        print(f"Cache policy for unknown route {path}")
+    return policies
@@ -0,0 +1,201 @@
+"""
+Compression Utility Module
+Accept-Encoding negotiation and build-time gzip/brotli compression
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+import gzip
+import os
+import zlib
+
+# Encodings we produce, in order of preference
+ENCODINGS = ("br", "gzip")
+SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+COMPRESSIBLE_EXTENSIONS = {
+    ".css",
+    ".js",
+    ".mjs",
+    ".html",
+    ".htm",
+    ".json",
+    ".map",
+    ".svg",
+    ".txt",
+    ".xml",
+    ".webmanifest",
+    ".ico",
+}
+
+# Keep a compressed variant only if it saves at least this fraction
+MIN_SAVINGS = 0.1
+
+# Response types worth compressing on the fly
+COMPRESSIBLE_TYPES = {
+    "text/html",
+    "text/plain",
+    "text/css",
+    "text/xml",
+    "text/javascript",
+    "application/javascript",
+    "application/json",
+    "application/xml",
+    "application/rss+xml",
+    "application/atom+xml",
+    "application/feed+json",
+    "image/svg+xml",
+}
+
+# Levels for build-time files (maximum) and for responses compressed once at
+# runtime and then reused from a cache (brotli 11 costs ~70ms per page)
+BUILD_LEVELS = {"gzip": 9, "br": 11}
+CACHED_LEVELS = {"gzip": 9, "br": 9}
+
+
+def _get_brotli():
+    """Get the brotli module (brotli or brotlicffi), or None if not installed"""
+    try:
+        import brotli
+    except ImportError:
+        try:
+            import brotlicffi as brotli
+        except ImportError:
+            return None
+    return brotli
+
+
+def warn_if_no_brotli():
+    """Tell build steps that .br variants will be skipped"""
+    if _get_brotli() is None:
+        print(
+            "Brotli library not installed, skipping .br variants. Install with: poetry add brotli"
+        )
+
+
+def available_encodings() -> Sequence[str]:
+    """Encodings this process can produce, in order of preference"""
+    if _get_brotli() is None:
+        return tuple(encoding for encoding in ENCODINGS if encoding != "br")
+    return ENCODINGS
+
+
+def accepted_encodings(
+    accept_encoding: str, encodings: Sequence[str] = ENCODINGS
+) -> List[str]:
+    """
+    Encodings that a client accepts, in our preference order
+
+    Args:
+        accept_encoding: Accept-Encoding request header value
+        encodings: Candidate encodings, most preferred first
+
+    Returns:
+        List such as ["br", "gzip"]; empty if only identity is acceptable
+    """
+    qualities: Dict[str, float] = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[name.strip()] = quality
+
+    wildcard = qualities.get("*", 0.0)
+    return [encoding for encoding in encodings if qualities.get(encoding, wildcard) > 0]
+
+
+def is_compressible_type(content_type: str) -> bool:
+    """Whether a Content-Type header value is worth compressing"""
+    return content_type.split(";", 1)[0].strip().lower() in COMPRESSIBLE_TYPES
+
+
+def compress(
+    data: bytes, encoding: str, level: Optional[int] = None
+) -> Optional[bytes]:
+    """
+    Compress data in one go
+
+    Args:
+        data: Bytes to compress
+        encoding: "br" or "gzip"
+        level: Compression level (defaults to BUILD_LEVELS)
+
+    Returns:
+        Compressed bytes, or None if the encoder is unavailable
+    """
+    level = BUILD_LEVELS[encoding] if level is None else level
+    if encoding == "gzip":
+        # mtime=0 keeps the output identical across builds
+        return gzip.compress(data, compresslevel=level, mtime=0)
+    if encoding == "br":
+        brotli = _get_brotli()
+        if brotli is None:
+            return None
+        return brotli.compress(data, quality=level)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+class StreamCompressor:
+    """
+    Incremental gzip or brotli encoder
+
+    compress() flushes after every chunk so each piece of a streamed
+    response reaches the client as soon as it is produced.
+    """
+
+    def __init__(self, encoding: str, level: int):
+        self.encoding = encoding
+        if encoding == "gzip":
+            # wbits=31 writes a gzip header and trailer
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        elif encoding == "br":
+            self._compressor = _get_brotli().Compressor(quality=level)
+        else:
+            raise ValueError(f"Unsupported encoding: {encoding}")
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk and flush it"""
+        if self.encoding == "gzip":
+            return self._compressor.compress(data) + self._compressor.flush(
+                zlib.Z_SYNC_FLUSH
+            )
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        """End the stream"""
+        if self.encoding == "gzip":
+            return self._compressor.flush(zlib.Z_FINISH)
+        return self._compressor.finish()
+
+
+def is_compressible(path: str) -> bool:
+    """Whether a file type benefits from compression"""
+    return os.path.splitext(path)[1].lower() in COMPRESSIBLE_EXTENSIONS
+
+
+def write_variants(data: bytes, target: Path) -> List[str]:
+    """
+    Write target.br and target.gz for data when they save enough space
+
+    Returns:
+        The encodings written
+    """
+    written = []
+    for encoding in ENCODINGS:
+        compressed = compress(data, encoding)
+        if compressed is None or len(compressed) > len(data) * (1 - MIN_SAVINGS):
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        Path(str(target) + SUFFIXES[encoding]).write_bytes(compressed)
+        written.append(encoding)
+    return written
+
+
+def variant_path(path: str, encoding: str) -> str:
+    """Path of the precompressed sibling of a file"""
+    return path + SUFFIXES[encoding]
@@ -1,83 +1,401 @@
+import asyncio
 import smtplib
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from email.message import Message
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.config import settings
+from app.utils.metrics import LatencyHistogram
 
 
-async def send_email_smtp(
-    to_email: str, subject: str, body_html: str, body_text: Optional[str] = None
-) -> bool:
-    """Send email using SMTP"""
-    if not settings.email_enabled or not settings.smtp_host:
-        return False
+class SMTPConnectionPool:
+    """
+    Reusable, authenticated SMTP connections driven from worker threads
 
-    try:
-        msg = MIMEMultipart("alternative")
-        msg["Subject"] = subject
-        msg["From"] = (
-            f"{settings.contact_email_from_name} <{settings.contact_email_from}>"
-        )
-        msg["To"] = to_email
+    smtplib is blocking, so each send runs on a small dedicated executor and
+    the event loop only awaits the result. Connections are kept open between
+    messages (saving the connect, STARTTLS and AUTH round trips), closed once
+    idle for longer than idle_timeout, and a message whose reused connection
+    turns out to have been dropped by the server is retried once on a fresh
+    connection.
+    """
 
-        if body_text:
-            msg.attach(MIMEText(body_text, "plain"))
-        msg.attach(MIMEText(body_html, "html"))
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        user: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: bool = True,
+        size: int = 2,
+        idle_timeout: float = 60.0,
+        timeout: float = 30.0,
+    ):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.use_tls = use_tls
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        # (connection, last used) pairs, most recently used last
+        self._idle: List[Tuple[smtplib.SMTP, float]] = []
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="smtp")
 
-        with smtplib.SMTP(settings.smtp_host, settings.smtp_port) as server:
-            if settings.smtp_use_tls:
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
                 server.starttls()
-            if settings.smtp_user and settings.smtp_password:
-                server.login(settings.smtp_user, settings.smtp_password)
+            if self.user and self.password:
+                server.login(self.user, self.password)
+        except Exception:
+            self._close(server)
+            raise
+        return server
+
+    @staticmethod
+    def _close(server: smtplib.SMTP):
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    def _acquire(self) -> Tuple[smtplib.SMTP, bool]:
+        """Get an idle connection, or a new one; the flag is True if reused"""
+        expired = []
+        server = None
+        now = time.monotonic()
+        with self._lock:
+            while self._idle:
+                candidate, last_used = self._idle.pop()
+                if now - last_used > self.idle_timeout:
+                    expired.append(candidate)
+                else:
+                    server = candidate
+                    break
+        for candidate in expired:
+            self._close(candidate)
+        if server is not None:
+            return server, True
+        return self._connect(), False
+
+    def _release(self, server: smtplib.SMTP):
+        with self._lock:
+            self._idle.append((server, time.monotonic()))
+
+    def _send(self, msg: Message):
+        server, reused = self._acquire()
+        try:
             server.send_message(msg)
+        except (smtplib.SMTPServerDisconnected, ConnectionError) as e:
+            self._close(server)
+            if not reused:
+                raise
+            # The server dropped a pooled connection while it sat idle
+            print(f"SMTP connection lost ({e}), reconnecting")
+            server = self._connect()
+            try:
+                server.send_message(msg)
+            except Exception:
+                self._close(server)
+                raise
+        except smtplib.SMTPRecipientsRefused:
+            # Refused by the server, but the session is still usable
+            self._release(server)
+            raise
+        except Exception:
+            self._close(server)
+            raise
+        self._release(server)
 
-        return True
-    except Exception as e:
-        print(f"Error sending email via SMTP: {e}")
-        return False
+    async def send(self, msg: Message):
+        """Send a message without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._send, msg)
 
+    def close(self):
+        """Close idle connections and stop the worker threads"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for server, _ in idle:
+            self._close(server)
+        self._executor.shutdown(wait=False)
 
-async def send_email_sendgrid(
+
+def build_message(
     to_email: str, subject: str, body_html: str, body_text: Optional[str] = None
-) -> bool:
-    """Send email using SendGrid API"""
-    if not settings.email_enabled or not settings.sendgrid_api_key:
-        return False
+) -> MIMEMultipart:
+    """Build a MIME message from the configured sender"""
+    msg = MIMEMultipart("alternative")
+    msg["Subject"] = subject
+    msg["From"] = f"{settings.contact_email_from_name} <{settings.contact_email_from}>"
+    msg["To"] = to_email
+
+    if body_text:
+        msg.attach(MIMEText(body_text, "plain"))
+    msg.attach(MIMEText(body_html, "html"))
+    return msg
 
-    try:
-        import sendgrid
-        from sendgrid.helpers.mail import Mail, Email, To, Content
 
-        sg = sendgrid.SendGridAPIClient(api_key=settings.sendgrid_api_key)
+def _error_text(error: Exception) -> str:
+    return str(error) or type(error).__name__
+
+
+class EmailProvider(ABC):
+    """
+    Delivery backend interface
+
+    Messages are dicts with to, subject, body_html and body_text. Each
+    provider keeps its connections open for the life of the process and
+    records a latency histogram of its sends.
+    """
+
+    name = ""
 
-        from_email = Email(
-            settings.contact_email_from, settings.contact_email_from_name
+    def __init__(self):
+        self.latency = LatencyHistogram()
+
+    @abstractmethod
+    async def _deliver(self, message: Dict[str, Any]) -> Optional[str]:
+        """Hand one message to the backend; returns None or the error"""
+
+    async def send(self, message: Dict[str, Any]) -> Optional[str]:
+        """
+        Send one message
+
+        Returns:
+            None if the provider accepted it, else the error
+        """
+        start = time.perf_counter()
+        try:
+            error = await self._deliver(message)
+        except Exception as e:
+            error = _error_text(e)
+        self.latency.observe(time.perf_counter() - start, ok=error is None)
+        return error
+
+    async def send_batch(self, messages: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """Send messages over the provider's open connections, in order"""
+        return [await self.send(message) for message in messages]
+
+    async def close(self):
+        """Close open connections"""
+
+
+class SMTPProvider(EmailProvider):
+    """SMTP through a pool of reusable connections"""
+
+    name = "smtp"
+
+    def __init__(self, pool: Optional[SMTPConnectionPool] = None):
+        super().__init__()
+        self._pool = pool
+
+    @property
+    def pool(self) -> SMTPConnectionPool:
+        if self._pool is None:
+            self._pool = SMTPConnectionPool(
+                settings.smtp_host,
+                settings.smtp_port,
+                user=settings.smtp_user,
+                password=settings.smtp_password,
+                use_tls=settings.smtp_use_tls,
+                size=settings.smtp_pool_size,
+                idle_timeout=settings.smtp_idle_timeout,
+                timeout=settings.smtp_timeout,
+            )
+        return self._pool
+
+    async def _deliver(self, message: Dict[str, Any]) -> Optional[str]:
+        if not settings.smtp_host:
+            return "SMTP host not configured"
+        await self.pool.send(
+            build_message(
+                message["to"],
+                message["subject"],
+                message["body_html"],
+                message["body_text"],
+            )
         )
-        to_email_obj = To(to_email)
+        return None
+
+    async def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+
+class SendGridProvider(EmailProvider):
+    """
+    SendGrid v3 Mail Send API over one long-lived async HTTP client
+
+    The client keeps TLS connections alive between messages. base_url can
+    point at a local stand-in, and tests can pass an httpx transport.
+    """
+
+    name = "sendgrid"
+
+    def __init__(
+        self,
+        api_key: Optional[str],
+        base_url: str = "https://api.sendgrid.com",
+        timeout: float = 30.0,
+        max_connections: int = 10,
+        transport=None,
+    ):
+        super().__init__()
+        self.api_key = api_key
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.transport = transport
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                transport=self.transport,
+            )
+        return self._client
+
+    @staticmethod
+    def payload(message: Dict[str, Any]) -> Dict[str, Any]:
+        """Mail Send request body for a message"""
+        content = []
+        # The API requires text/plain before text/html
+        if message.get("body_text"):
+            content.append({"type": "text/plain", "value": message["body_text"]})
+        content.append({"type": "text/html", "value": message["body_html"]})
+        return {
+            "personalizations": [{"to": [{"email": message["to"]}]}],
+            "from": {
+                "email": settings.contact_email_from,
+                "name": settings.contact_email_from_name,
+            },
+            "subject": message["subject"],
+            "content": content,
+        }
+
+    async def _deliver(self, message: Dict[str, Any]) -> Optional[str]:
+        if not self.api_key:
+            return "SendGrid API key not configured"
+        try:
+            client = self._get_client()
+        except ImportError:
+            print("httpx library not installed. Install with: poetry add httpx")
+            return "httpx not installed"
+        response = await client.post("/v3/mail/send", json=self.payload(message))
+        if response.status_code in [200, 201, 202]:
+            return None
+        return f"SendGrid returned HTTP {response.status_code}: {response.text[:200]}"
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
-        content_html = Content("text/html", body_html)
-        if body_text:
-            content_text = Content("text/plain", body_text)
-            mail = Mail(from_email, to_email_obj, subject, content_text)
-            mail.add_content(content_html)
+
+# Provider instances, created on first use
+_providers: Dict[str, EmailProvider] = {}
+
+
+def get_email_provider(name: Optional[str] = None) -> EmailProvider:
+    """
+    Get a delivery provider
+
+    Args:
+        name: "smtp" or "sendgrid" (defaults to settings.email_provider)
+    """
+    name = name or settings.email_provider
+    if name not in _providers:
+        if name == "sendgrid":
+            _providers[name] = SendGridProvider(
+                settings.sendgrid_api_key,
+                base_url=settings.sendgrid_api_url,
+                timeout=settings.sendgrid_timeout,
+            )
         else:
-            mail = Mail(from_email, to_email_obj, subject, content_html)
+            _providers[name] = SMTPProvider()
+    return _providers[name]
 
-        response = sg.send(mail)
-        return response.status_code in [200, 201, 202]
-    except ImportError:
-        print("SendGrid library not installed. Install with: poetry add sendgrid")
-        return False
-    except Exception as e:
-        print(f"Error sending email via SendGrid: {e}")
+
+async def close_email_providers():
+    """Close every provider's connections"""
+    while _providers:
+        _, provider = _providers.popitem()
+        await provider.close()
+
+
+def email_provider_stats() -> Dict[str, Any]:
+    """Latency histograms of the providers used by this process"""
+    return {name: provider.latency.stats() for name, provider in _providers.items()}
+
+
+async def _send_email(
+    provider: str, to_email: str, subject: str, body_html: str, body_text: Optional[str]
+) -> bool:
+    if not settings.email_enabled:
         return False
+    error = await get_email_provider(provider).send(
+        {
+            "to": to_email,
+            "subject": subject,
+            "body_html": body_html,
+            "body_text": body_text,
+        }
+    )
+    if error is not None:
+        print(f"Error sending email via {provider}: {error}")
+    return error is None
 
 
-async def send_contact_form_email(
-    name: str, email: str, phone: Optional[str], company: Optional[str], message: str
+async def send_email_smtp(
+    to_email: str, subject: str, body_html: str, body_text: Optional[str] = None
 ) -> bool:
-    """Send contact form submission email"""
+    """Send email using SMTP"""
+    return await _send_email("smtp", to_email, subject, body_html, body_text)
+
+
+async def send_email_sendgrid(
+    to_email: str, subject: str, body_html: str, body_text: Optional[str] = None
+) -> bool:
+    """Send email using SendGrid API"""
+    return await _send_email("sendgrid", to_email, subject, body_html, body_text)
+
+
+async def deliver_batch(messages: List[Dict[str, Any]]) -> List[Optional[str]]:
+    """
+    Send queued messages with the configured provider
+
+    Args:
+        messages: Dicts with to, subject, body_html and body_text
+
+    Returns:
+        One entry per message: None if it was accepted, else the error
+    """
+    return await get_email_provider().send_batch(messages)
+
+
+def contact_form_email(
+    name: str, email: str, phone: Optional[str], company: Optional[str], message: str
+) -> Tuple[str, str, str]:
+    """Build the (subject, HTML body, text body) of a contact form submission"""
     subject = f"New Contact Form Submission from {name}"
 
     body_html = f"""
@@ -105,6 +423,16 @@ Email: {email}
 Message:
 {message}
     """
+    return subject, body_html, body_text
+
+
+async def send_contact_form_email(
+    name: str, email: str, phone: Optional[str], company: Optional[str], message: str
+) -> bool:
+    """Send contact form submission email"""
+    subject, body_html, body_text = contact_form_email(
+        name, email, phone, company, message
+    )
 
     if settings.email_provider == "sendgrid":
         return await send_email_sendgrid(
@@ -114,3 +442,23 @@ Message:
         return await send_email_smtp(
             settings.contact_email_to, subject, body_html, body_text
         )
+
+
+def queue_contact_form_email(
+    name: str, email: str, phone: Optional[str], company: Optional[str], message: str
+) -> bool:
+    """
+    Queue a contact form submission for the background mail worker
+
+    Returns:
+        True if queued, False if email is disabled
+    """
+    from app.utils.mail_queue import get_mail_queue
+
+    if not settings.email_enabled:
+        return False
+    subject, body_html, body_text = contact_form_email(
+        name, email, phone, company, message
+    )
+    get_mail_queue().enqueue(settings.contact_email_to, subject, body_html, body_text)
+    return True
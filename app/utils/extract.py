@@ -0,0 +1,265 @@
+"""
+Text Extraction Utility Module
+Turns article HTML and structured content records into plain-text sections
+for the search index
+"""
+
+from collections.abc import Mapping
+from html import unescape
+from html.parser import HTMLParser
+from typing import Dict, Iterator, List, Optional, Tuple
+import re
+
+HEADING_TAGS = {"h2", "h3"}
+
+# Tags whose text is never indexed
+_SKIP_TAGS = {"script", "style", "template", "noscript"}
+
+# Tags that separate words even when the markup has no whitespace
+_BLOCK_TAGS = {
+    "p",
+    "div",
+    "section",
+    "article",
+    "li",
+    "ul",
+    "ol",
+    "br",
+    "hr",
+    "pre",
+    "table",
+    "tr",
+    "td",
+    "th",
+    "blockquote",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+}
+
+# Record fields that hold links or asset paths rather than prose
+_SKIP_KEYS = {"slug", "link", "primary_link", "secondary_link", "diagram", "file_path"}
+
+_HEADING_RE = re.compile(r"<(h[23])(\s[^>]*)?>(.*?)</\1\s*>", re.IGNORECASE | re.DOTALL)
+_ID_ATTR_RE = re.compile(r"""\sid\s*=\s*["']([^"']*)["']""", re.IGNORECASE)
+_TAG_RE = re.compile(r"<[^>]+>")
+_WHITESPACE_RE = re.compile(r"\s+")
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+_JINJA_RE = re.compile(r"{#.*?#}|{%.*?%}|{{.*?}}", re.DOTALL)
+
+
+def slugify(text: str) -> str:
+    """Turn heading text into a URL fragment"""
+    return _SLUG_RE.sub("-", text.lower()).strip("-") or "section"
+
+
+def _unique(anchor: str, seen: Dict[str, int]) -> str:
+    """Suffix repeated anchors the same way everywhere (-2, -3, ...)"""
+    count = seen.get(anchor, 0) + 1
+    seen[anchor] = count
+    return anchor if count == 1 else f"{anchor}-{count}"
+
+
+def add_heading_anchors(html: str) -> str:
+    """
+    Give every h2/h3 an id so search results can link to the section
+
+    Uses the same anchors that iter_html_sections() generates; headings that
+    already have an id keep it.
+    """
+    seen: Dict[str, int] = {}
+
+    def add_id(match: "re.Match[str]") -> str:
+        tag, attrs, inner = match.group(1), match.group(2) or "", match.group(3)
+        existing = _ID_ATTR_RE.search(attrs)
+        if existing:
+            _unique(existing.group(1), seen)
+            return match.group(0)
+        text = _WHITESPACE_RE.sub(" ", unescape(_TAG_RE.sub("", inner))).strip()
+        anchor = _unique(slugify(text), seen)
+        return f'<{tag}{attrs} id="{anchor}">{inner}</{tag}>'
+
+    return _HEADING_RE.sub(add_id, html)
+
+
+class _SectionParser(HTMLParser):
+    """Incremental HTML parser that splits text at h2/h3 headings"""
+
+    def __init__(self, generate_anchors: bool):
+        super().__init__(convert_charrefs=True)
+        self.generate_anchors = generate_anchors
+        self.completed: List[Dict] = []
+        self._heading = ""
+        self._anchor: Optional[str] = None
+        self._parts: List[str] = []
+        self._heading_parts: Optional[List[str]] = None
+        self._heading_id: Optional[str] = None
+        self._skip_depth = 0
+        self._seen: Dict[str, int] = {}
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+            return
+        if tag in HEADING_TAGS:
+            self._flush()
+            self._heading_parts = []
+            self._heading_id = dict(attrs).get("id")
+        elif tag in _BLOCK_TAGS:
+            self._parts.append(" ")
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+            return
+        if tag in HEADING_TAGS and self._heading_parts is not None:
+            heading = _WHITESPACE_RE.sub(" ", "".join(self._heading_parts)).strip()
+            if self._heading_id:
+                self._anchor = _unique(self._heading_id, self._seen)
+            elif self.generate_anchors:
+                self._anchor = _unique(slugify(heading), self._seen)
+            else:
+                self._anchor = None
+            self._heading = heading
+            self._heading_parts = None
+        elif tag in _BLOCK_TAGS:
+            self._parts.append(" ")
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        if self._heading_parts is not None:
+            self._heading_parts.append(data)
+        else:
+            self._parts.append(data)
+
+    def _flush(self):
+        """Close the current section and queue it if it has any text"""
+        text = _WHITESPACE_RE.sub(" ", "".join(self._parts)).strip()
+        if text:
+            self.completed.append(
+                {"heading": self._heading, "anchor": self._anchor, "text": text}
+            )
+        self._parts = []
+
+    def finish(self):
+        """Flush the last section"""
+        self.close()
+        self._flush()
+
+    def drain(self) -> List[Dict]:
+        """Take the sections completed so far"""
+        completed, self.completed = self.completed, []
+        return completed
+
+
+def _split_text(text: str, max_chars: int) -> Iterator[str]:
+    """Split text into chunks of at most max_chars, breaking at spaces"""
+    while len(text) > max_chars:
+        cut = text.rfind(" ", 0, max_chars)
+        if cut <= 0:
+            cut = max_chars
+        yield text[:cut]
+        text = text[cut:].lstrip()
+    if text:
+        yield text
+
+
+def iter_html_sections(
+    html: str,
+    generate_anchors: bool = True,
+    max_chars: int = 2000,
+    feed_size: int = 8192,
+) -> Iterator[Dict]:
+    """
+    Stream plain-text sections out of an HTML document
+
+    The document is fed to the parser in slices and each section is yielded
+    as soon as the next heading closes it, so only one section's text is
+    held at a time. Long sections are split into several chunks that share
+    the section's heading and anchor.
+
+    Args:
+        html: HTML source
+        generate_anchors: Derive anchors for headings without an id, matching
+            add_heading_anchors(); otherwise only explicit ids are used
+        max_chars: Maximum characters of text per chunk
+        feed_size: Characters handed to the parser per step
+
+    Yields:
+        Dictionaries with "heading", "anchor" (or None) and "text"
+    """
+    parser = _SectionParser(generate_anchors)
+    for start in range(0, len(html), feed_size):
+        parser.feed(html[start : start + feed_size])
+        yield from _chunks(parser.drain(), max_chars)
+    parser.finish()
+    yield from _chunks(parser.drain(), max_chars)
+
+
+def _chunks(sections: List[Dict], max_chars: int) -> Iterator[Dict]:
+    """Split each section's text into chunks that keep its heading and anchor"""
+    for section in sections:
+        for chunk in _split_text(section["text"], max_chars):
+            yield {**section, "text": chunk}
+
+
+def template_block_html(source: str, block: str = "content") -> str:
+    """
+    Get the markup of one block of a Jinja template with template syntax removed
+
+    Used to index the prose of static marketing pages without rendering them.
+    """
+    start = re.search(r"{%-?\s*block\s+" + re.escape(block) + r"\s*-?%}", source)
+    if not start:
+        return ""
+    end = re.search(r"{%-?\s*endblock", source[start.end() :])
+    body = (
+        source[start.end() : start.end() + end.start()]
+        if end
+        else source[start.end() :]
+    )
+    return _JINJA_RE.sub(" ", body)
+
+
+def iter_strings(value, skip_keys=_SKIP_KEYS) -> Iterator[str]:
+    """Walk nested dicts and lists and yield their prose strings"""
+    if isinstance(value, str):
+        if value and not value.startswith(("/", "http://", "https://")):
+            yield value
+    elif isinstance(value, Mapping):
+        for key, item in value.items():
+            if key not in skip_keys:
+                yield from iter_strings(item, skip_keys)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from iter_strings(item, skip_keys)
+
+
+def iter_record_sections(
+    record: Mapping, sections: List[Tuple[str, str, Tuple[str, ...]]]
+) -> Iterator[Dict]:
+    """
+    Turn a structured content record into sections
+
+    Args:
+        record: Product or case study dictionary
+        sections: (anchor, default heading, record keys) for each section; a
+            nested dict's own "title" replaces the default heading
+
+    Yields:
+        Dictionaries with "heading", "anchor" and "text"
+    """
+    for anchor, heading, keys in sections:
+        values = [record[key] for key in keys if record.get(key)]
+        if not values:
+            continue
+        first = values[0]
+        if isinstance(first, Mapping) and first.get("title"):
+            heading = first["title"]
+        text = " ".join(iter_strings(values))
+        if text:
+            yield {"heading": heading, "anchor": anchor, "text": text}
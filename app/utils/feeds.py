@@ -0,0 +1,173 @@
+"""
+Feed Generator Utility
+Atom 1.0 and JSON Feed 1.1 versions of the blog feed, serialized one entry
+at a time from the same post records as the RSS feed
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional
+import json
+
+from app.utils.rss import (
+    FEED_DESCRIPTION,
+    FEED_TITLE,
+    XMLWriter,
+    absolute_urls,
+    post_date,
+)
+
+
+def rfc3339(value: datetime) -> str:
+    """Format a datetime for Atom and JSON Feed (naive values are taken as UTC)"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.isoformat()
+
+
+def _categories(post: Dict) -> List[str]:
+    categories = post.get("categories", [])
+    return [categories] if isinstance(categories, str) else list(categories)
+
+
+def iter_atom_feed(
+    posts: List[Dict],
+    site_url: str = "https://ishtar-ai.com",
+    links: Optional[Dict[str, str]] = None,
+    full_content: bool = True,
+) -> Iterator[str]:
+    """
+    Serialize an Atom 1.0 feed one entry at a time
+
+    Args:
+        posts: Post records, as for iter_rss_feed()
+        site_url: Base URL of the site
+        links: Feed URLs by relation ("self", and "first", "previous",
+            "next", "last" for paged feeds)
+        full_content: Include article bodies as HTML content, with their
+            URLs made absolute
+
+    Yields:
+        Consecutive pieces of the Atom XML document
+    """
+    links = links or {"self": f"{site_url}/atom.xml"}
+    dates = [post_date(post.get("published_date")) for post in posts]
+    known_dates = [date for date in dates if date is not None]
+    # Atom requires an updated date; an empty feed has nothing newer than 1970
+    updated = (
+        max(known_dates) if known_dates else datetime.fromtimestamp(0, timezone.utc)
+    )
+
+    xml = XMLWriter()
+    xml.start_document()
+    # xml:base also covers readers that resolve relative URLs themselves
+    xml.start(
+        "feed",
+        {
+            "xmlns": "http://www.w3.org/2005/Atom",
+            "xml:lang": "en-US",
+            "xml:base": f"{site_url}/",
+        },
+    )
+    xml.element("title", FEED_TITLE)
+    xml.element("subtitle", FEED_DESCRIPTION)
+    xml.element("id", f"{site_url}/blog")
+    xml.element("updated", rfc3339(updated))
+    xml.element(
+        "link",
+        attrs={"rel": "alternate", "type": "text/html", "href": f"{site_url}/blog"},
+    )
+    for rel, href in links.items():
+        xml.element(
+            "link", attrs={"rel": rel, "type": "application/atom+xml", "href": href}
+        )
+    xml.start("author")
+    xml.element("name", "Ishtar AI")
+    xml.end("author")
+    xml.element("generator", "Ishtar AI FastAPI")
+    yield xml.drain()
+
+    for post, published in zip(posts, dates):
+        link = f"{site_url}/blog/{post.get('slug', '')}"
+        xml.start("entry")
+        xml.element("title", post.get("title", ""))
+        xml.element(
+            "link", attrs={"rel": "alternate", "type": "text/html", "href": link}
+        )
+        xml.element("id", link)
+        if published is not None:
+            xml.element("published", rfc3339(published))
+        xml.element("updated", rfc3339(published or updated))
+        if post.get("author"):
+            xml.start("author")
+            xml.element("name", post["author"])
+            xml.end("author")
+        xml.element("summary", post.get("description", ""))
+        if full_content and post.get("content"):
+            xml.element(
+                "content", absolute_urls(post["content"], link), {"type": "html"}
+            )
+        for category in _categories(post):
+            xml.element("category", attrs={"term": category})
+        xml.end("entry")
+        yield xml.drain()
+
+    xml.end("feed")
+    xml.end_document()
+    yield xml.drain()
+
+
+def iter_json_feed(
+    posts: List[Dict],
+    site_url: str = "https://ishtar-ai.com",
+    links: Optional[Dict[str, str]] = None,
+    full_content: bool = True,
+) -> Iterator[str]:
+    """
+    Serialize a JSON Feed 1.1 document one item at a time
+
+    Args:
+        posts: Post records, as for iter_rss_feed()
+        site_url: Base URL of the site
+        links: Feed URLs by relation; "self" becomes feed_url and "next"
+            next_url
+        full_content: Include article bodies as content_html, with their
+            URLs made absolute
+
+    Yields:
+        Consecutive pieces of the JSON document
+    """
+    links = links or {"self": f"{site_url}/feed.json"}
+    head = {
+        "version": "https://jsonfeed.org/version/1.1",
+        "title": FEED_TITLE,
+        "home_page_url": f"{site_url}/blog",
+        "feed_url": links["self"],
+        "description": FEED_DESCRIPTION,
+        "language": "en-US",
+        "authors": [{"name": "Ishtar AI"}],
+    }
+    if "next" in links:
+        head["next_url"] = links["next"]
+    # Leave the object open for the items array
+    yield json.dumps(head, ensure_ascii=False)[:-1] + ', "items": ['
+
+    for index, post in enumerate(posts):
+        link = f"{site_url}/blog/{post.get('slug', '')}"
+        item = {"id": link, "url": link, "title": post.get("title", "")}
+        if post.get("description"):
+            item["summary"] = post["description"]
+        if full_content and post.get("content"):
+            item["content_html"] = absolute_urls(post["content"], link)
+        else:
+            # Every item needs content_html or content_text
+            item["content_text"] = post.get("description", "")
+        published = post_date(post.get("published_date"))
+        if published is not None:
+            item["date_published"] = rfc3339(published)
+        if post.get("author"):
+            item["authors"] = [{"name": post["author"]}]
+        if _categories(post):
+            item["tags"] = _categories(post)
+        yield ("," if index else "") + json.dumps(item, ensure_ascii=False)
+
+    yield "]}\n"
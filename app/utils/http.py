@@ -0,0 +1,139 @@
+"""
+HTTP Utility Module
+Validators (ETag, Last-Modified) and conditional GET handling for
+responses whose bytes are built once and cached
+"""
+
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, List, Optional, Tuple
+import hashlib
+
+from starlette.datastructures import Headers
+from starlette.responses import Response
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag for a response body"""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def variant_etag(etag: str, encoding: Optional[str]) -> str:
+    """
+    ETag for a content-coded variant of a response
+
+    Each encoding of the same body is a different representation, so it gets
+    its own strong tag: "<hash>" becomes "<hash>-br" for brotli.
+    """
+    if not encoding:
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+# Headers a 304 repeats from the 200 it stands in for (RFC 9110, 15.4.5)
+_NOT_MODIFIED_HEADERS = frozenset(
+    (
+        b"cache-control",
+        b"content-location",
+        b"etag",
+        b"expires",
+        b"last-modified",
+        b"surrogate-control",
+        b"surrogate-key",
+        b"vary",
+    )
+)
+
+
+def not_modified_headers(
+    raw_headers: List[Tuple[bytes, bytes]],
+) -> List[Tuple[bytes, bytes]]:
+    """The subset of a 200 response's raw headers that its 304 carries"""
+    return [header for header in raw_headers if header[0] in _NOT_MODIFIED_HEADERS]
+
+
+def http_date(value: datetime) -> str:
+    """Format a datetime as an HTTP date (naive values are taken as UTC)"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _opaque_tag(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(
+    request_headers: Headers, etag: Optional[str], last_modified: Optional[datetime]
+) -> bool:
+    """
+    Whether a conditional GET can be answered with 304 Not Modified
+
+    If-None-Match takes precedence over If-Modified-Since (RFC 9110) and is
+    compared weakly, so a compressed response's W/ tag still matches.
+    """
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        if etag is None:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        return _opaque_tag(etag) in {
+            _opaque_tag(tag) for tag in if_none_match.split(",")
+        }
+
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        # HTTP dates have whole-second precision
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def validator_headers(
+    etag: str,
+    last_modified: Optional[datetime] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> Dict[str, str]:
+    """ETag and Last-Modified response headers, plus any extra headers"""
+    validators = {"ETag": etag, **(headers or {})}
+    if last_modified is not None:
+        validators["Last-Modified"] = http_date(last_modified)
+    return validators
+
+
+def conditional_response(
+    request_headers: Headers,
+    body: bytes,
+    media_type: str,
+    etag: Optional[str] = None,
+    last_modified: Optional[datetime] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """
+    Respond with body, or with 304 if the client's copy is current
+
+    Args:
+        request_headers: Request headers
+        body: Encoded response body
+        media_type: Content type of the body
+        etag: Validator for the body (defaults to make_etag(body))
+        last_modified: When the content last changed, if known
+        headers: Extra response headers, sent on both 200 and 304
+
+    Returns:
+        Response with ETag and Last-Modified set
+    """
+    validators = validator_headers(etag or make_etag(body), last_modified, headers)
+
+    if is_not_modified(request_headers, validators["ETag"], last_modified):
+        return Response(status_code=304, headers=validators)
+    return Response(content=body, media_type=media_type, headers=validators)
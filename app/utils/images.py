@@ -0,0 +1,273 @@
+"""
+Image Utility Module
+Offline WebP/AVIF derivatives of the images in app/static/img, and
+<picture>/srcset markup that serves them
+"""
+
+from html import escape, unescape
+from pathlib import Path
+from typing import Dict, List, Optional
+import json
+import os
+import re
+
+from markupsafe import Markup
+
+from app.utils.assets import asset_url
+
+SOURCE_DIR = "app/static/img"
+# Written under the static directory so derivatives get hashed URLs and
+# immutable caching like every other asset
+OUTPUT_DIR = "app/static/img/derived"
+STATIC_DIR = "app/static"
+
+SOURCE_EXTENSIONS = {".png", ".jpg", ".jpeg"}
+DERIVATIVE_WIDTHS = (320, 640, 960, 1280, 1920)
+
+# Preferred format first; <source> elements are emitted in this order
+FORMATS = ("avif", "webp")
+SAVE_OPTIONS = {
+    "avif": {"quality": 60},
+    "webp": {"quality": 80, "method": 6},
+}
+
+# <img> tags, and the <picture> tags around them so nesting can be tracked
+# in the same pass
+_TAG_RE = re.compile(r"<(?P<picture>/?picture)\b[^>]*>|<img\s[^>]*>", re.IGNORECASE)
+_ATTR_RE = re.compile(r"""([a-zA-Z_:][-a-zA-Z0-9_:.]*)\s*=\s*("[^"]*"|'[^']*')""")
+
+
+def _load_pillow():
+    """Import Pillow, or return None if it is not installed"""
+    try:
+        from PIL import Image, features
+    except ImportError:
+        print("Pillow not installed. Install with: poetry add pillow")
+        return None
+    return Image, features
+
+
+def _supported_formats(features) -> List[str]:
+    """Formats the installed Pillow can encode"""
+    formats = []
+    avif = False
+    try:
+        avif = bool(features.check("avif"))
+    except ValueError:
+        pass
+    if not avif:
+        try:
+            # Plugin for Pillow versions without built-in AVIF
+            import pillow_avif  # noqa: F401
+
+            avif = True
+        except ImportError:
+            pass
+    if avif:
+        formats.append("avif")
+    if features.check("webp"):
+        formats.append("webp")
+    return formats
+
+
+def build_images(
+    source_dir: str = SOURCE_DIR,
+    out_dir: str = OUTPUT_DIR,
+    manifest_path: Optional[str] = None,
+) -> Optional[str]:
+    """
+    Generate resized WebP/AVIF derivatives and write the image manifest
+
+    Each source image gets one derivative per format at every width in
+    DERIVATIVE_WIDTHS smaller than the image, plus one at its own width.
+    Derivatives newer than their source are reused.
+
+    Args:
+        source_dir: Directory of source images (not recursive)
+        out_dir: Directory for derivatives, inside the static directory
+        manifest_path: Output file (defaults to settings.image_manifest_path)
+
+    Returns:
+        The manifest path, or None if Pillow is not installed
+    """
+    from app.config import settings
+
+    pillow = _load_pillow()
+    if pillow is None:
+        return None
+    Image, features = pillow
+
+    formats = _supported_formats(features)
+    if "avif" not in formats:
+        print("AVIF encoder not available, writing WebP only")
+
+    manifest_path = manifest_path or settings.image_manifest_path
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    manifest: Dict[str, Dict] = {}
+
+    for source in sorted(Path(source_dir).iterdir()):
+        if source.suffix.lower() not in SOURCE_EXTENSIONS:
+            continue
+        with Image.open(source) as image:
+            image.load()
+            width, height = image.size
+            widths = [w for w in DERIVATIVE_WIDTHS if w < width] + [width]
+            variants: Dict[str, List[Dict]] = {}
+            for fmt in formats:
+                variants[fmt] = []
+                for target_width in widths:
+                    target = out / f"{source.stem}-{target_width}w.{fmt}"
+                    if (
+                        not target.exists()
+                        or target.stat().st_mtime < source.stat().st_mtime
+                    ):
+                        resized = image
+                        if target_width != width:
+                            resized = image.resize(
+                                (target_width, round(height * target_width / width)),
+                                Image.LANCZOS,
+                            )
+                        resized.save(target, format=fmt.upper(), **SAVE_OPTIONS[fmt])
+                    variants[fmt].append(
+                        {
+                            "path": target.relative_to(STATIC_DIR).as_posix(),
+                            "width": target_width,
+                        }
+                    )
+
+        key = source.relative_to(STATIC_DIR).as_posix()
+        manifest[key] = {"width": width, "height": height, "formats": variants}
+
+    Path(manifest_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest_path
+
+
+# Global image manifest
+_image_manifest: Optional[Dict[str, Dict]] = None
+
+
+def get_image_manifest() -> Dict[str, Dict]:
+    """Get the image manifest, or an empty one if it has not been built"""
+    global _image_manifest
+    if _image_manifest is None:
+        from app.config import settings
+
+        manifest = {}
+        path = settings.image_manifest_path
+        if path and os.path.exists(path):
+            with open(path) as f:
+                manifest = json.load(f)
+        _image_manifest = manifest
+    return _image_manifest
+
+
+def _attributes(attrs: Dict[str, Optional[str]]) -> str:
+    return "".join(
+        f' {name}="{escape(str(value))}"'
+        for name, value in attrs.items()
+        if value is not None
+    )
+
+
+def picture(
+    path: str,
+    alt: str = "",
+    sizes: str = "100vw",
+    loading: Optional[str] = "lazy",
+    **attrs,
+) -> Markup:
+    """
+    Jinja global: <picture> markup for an image under app/static
+
+    Emits one <source> per derivative format with a width-descriptor srcset
+    and a fallback <img> of the original file. Images missing from the
+    manifest (or before the pipeline has run) get the plain <img>.
+
+    Args:
+        path: Image path relative to app/static, e.g. "img/logo.png"
+        alt: Alternative text
+        sizes: The sizes attribute for the sources
+        loading: "lazy" (default), "eager", or None to omit
+        **attrs: Extra <img> attributes; class_ becomes class
+
+    Returns:
+        Safe markup
+    """
+    entry = get_image_manifest().get(path.lstrip("/"))
+    img_attrs: Dict[str, Optional[str]] = {"src": asset_url(path), "alt": alt}
+    if entry:
+        img_attrs.setdefault("width", str(entry["width"]))
+        img_attrs.setdefault("height", str(entry["height"]))
+    for name, value in attrs.items():
+        img_attrs[name.rstrip("_").replace("_", "-")] = value
+    img_attrs["loading"] = loading
+    img_attrs.setdefault("decoding", "async")
+    img = f"<img{_attributes(img_attrs)}>"
+
+    if not entry:
+        return Markup(img)
+
+    sources = []
+    for fmt in FORMATS:
+        variants = entry["formats"].get(fmt)
+        if not variants:
+            continue
+        srcset = ", ".join(f"{asset_url(v['path'])} {v['width']}w" for v in variants)
+        sources.append(
+            f"<source{_attributes({'type': f'image/{fmt}', 'srcset': srcset, 'sizes': sizes})}>"
+        )
+    return Markup(f"<picture>{''.join(sources)}{img}</picture>")
+
+
+def responsive_images(html: str, sizes: str = "(max-width: 900px) 100vw, 900px") -> str:
+    """
+    Rewrite <img src="/static/..."> tags in article HTML to <picture> markup
+
+    Tags whose image is not in the manifest, or that are already inside a
+    <picture>, are left alone.
+    """
+    manifest = get_image_manifest()
+    if not manifest:
+        return html
+
+    depth = 0
+
+    def replace(match: "re.Match[str]") -> str:
+        nonlocal depth
+        tag = match.group("picture")
+        if tag is not None:
+            depth = max(0, depth - 1) if tag.startswith("/") else depth + 1
+            return match.group(0)
+        if depth:
+            return match.group(0)
+        attrs = {
+            name.lower(): unescape(value[1:-1])
+            for name, value in _ATTR_RE.findall(match.group(0))
+        }
+        src = attrs.pop("src", "")
+        path = src[len("/static/") :]
+        if not src.startswith("/static/") or path not in manifest:
+            return match.group(0)
+        alt = attrs.pop("alt", "")
+        loading = attrs.pop("loading", "lazy")
+        return str(picture(path, alt=alt, sizes=sizes, loading=loading, **attrs))
+
+    return _TAG_RE.sub(replace, html)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if sys.argv[1:2] != ["build"]:
+        print("Usage: python -m app.utils.images build [MANIFEST_PATH]")
+        sys.exit(2)
+    path = build_images(manifest_path=(sys.argv[2:3] or [None])[0])
+    if path is None:
+        # Derivatives are optional: pages fall back to plain <img> tags, so a
+        # missing Pillow must not fail the deploy build
+        print("Skipped image derivatives")
+    else:
+        print(f"Wrote image manifest to {path}")
@@ -0,0 +1,303 @@
+"""
+Mail Queue Utility Module
+Durable SQLite outbox for outgoing email, drained by a background worker
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import asyncio
+import sqlite3
+import threading
+import time
+
+# Statuses of a queued message
+PENDING = "pending"
+SENT = "sent"
+FAILED = "failed"
+
+# Sent messages are kept this long for the latency metrics
+SENT_RETENTION = 7 * 24 * 3600
+
+
+class MailQueue:
+    """
+    Outgoing messages stored in SQLite until a provider accepts them
+
+    Every worker process on a host shares the database. A batch is claimed
+    by leasing its rows for lease_seconds, so two workers never send the
+    same message at once; a worker that dies mid-batch leaves its lease to
+    expire and the messages are sent again (delivery is at least once).
+    Failed attempts are retried with exponential backoff until
+    max_attempts, after which the message is kept as failed.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_attempts: int = 8,
+        retry_base: float = 30.0,
+        retry_max: float = 3600.0,
+        lease_seconds: float = 300.0,
+    ):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        # Set by enqueue() so a worker in this process wakes up immediately
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, timeout=5, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS messages ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "recipient TEXT NOT NULL, subject TEXT NOT NULL, "
+            "body_html TEXT NOT NULL, body_text TEXT, "
+            "status TEXT NOT NULL DEFAULT 'pending', "
+            "attempts INTEGER NOT NULL DEFAULT 0, last_error TEXT, "
+            "created_at REAL NOT NULL, next_attempt_at REAL NOT NULL, "
+            "leased_until REAL NOT NULL DEFAULT 0, sent_at REAL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS messages_due "
+            "ON messages (status, next_attempt_at)"
+        )
+
+    def enqueue(
+        self,
+        to_email: str,
+        subject: str,
+        body_html: str,
+        body_text: Optional[str] = None,
+    ) -> int:
+        """
+        Store a message for delivery
+
+        Returns:
+            The message id
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO messages (recipient, subject, body_html, body_text, "
+                "created_at, next_attempt_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (to_email, subject, body_html, body_text, now, now),
+            )
+        self._notify()
+        return cursor.lastrowid
+
+    def _notify(self):
+        if self._wakeup is not None and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def claim(self, limit: int) -> List[Dict[str, Any]]:
+        """Lease up to limit due messages, oldest first"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT id, recipient, subject, body_html, body_text, created_at "
+                    "FROM messages WHERE status = ? AND next_attempt_at <= ? "
+                    "AND leased_until <= ? ORDER BY id LIMIT ?",
+                    (PENDING, now, now, limit),
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE messages SET leased_until = ? WHERE id = ?",
+                    [(now + self.lease_seconds, row[0]) for row in rows],
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [
+            {
+                "id": row[0],
+                "to": row[1],
+                "subject": row[2],
+                "body_html": row[3],
+                "body_text": row[4],
+                "created_at": row[5],
+            }
+            for row in rows
+        ]
+
+    def mark_sent(self, message_id: int):
+        """Record a delivered message"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE messages SET status = ?, sent_at = ?, attempts = attempts + 1, "
+                "last_error = NULL, leased_until = 0 WHERE id = ?",
+                (SENT, time.time(), message_id),
+            )
+
+    def mark_failed(self, message_id: int, error: str):
+        """Record a failed attempt and schedule the retry"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT attempts FROM messages WHERE id = ?", (message_id,)
+            ).fetchone()
+            if row is None:
+                return
+            attempts = row[0] + 1
+            status = FAILED if attempts >= self.max_attempts else PENDING
+            delay = min(self.retry_max, self.retry_base * 2 ** (attempts - 1))
+            self._conn.execute(
+                "UPDATE messages SET status = ?, attempts = ?, last_error = ?, "
+                "next_attempt_at = ?, leased_until = 0 WHERE id = ?",
+                (status, attempts, error, now + delay, message_id),
+            )
+        if status == FAILED:
+            print(f"Giving up on email {message_id} after {attempts} attempts: {error}")
+
+    def purge(self, older_than: float = SENT_RETENTION) -> int:
+        """Delete sent messages older than the given number of seconds"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM messages WHERE status = ? AND sent_at < ?",
+                (SENT, time.time() - older_than),
+            )
+        return cursor.rowcount
+
+    def next_due_in(self) -> Optional[float]:
+        """Seconds until the next pending message is due, or None if none"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(MAX(next_attempt_at, leased_until)) FROM messages "
+                "WHERE status = ?",
+                (PENDING,),
+            ).fetchone()
+        if row[0] is None:
+            return None
+        return max(0.0, row[0] - time.time())
+
+    def stats(self, window: float = 3600.0) -> Dict[str, Any]:
+        """
+        Get queue depth and delivery latency
+
+        Latency is the time from enqueue to acceptance by the provider, over
+        messages sent in the last window seconds, across all workers.
+        """
+        now = time.time()
+        with self._lock:
+            counts = dict(
+                self._conn.execute(
+                    "SELECT status, COUNT(*) FROM messages GROUP BY status"
+                ).fetchall()
+            )
+            oldest = self._conn.execute(
+                "SELECT MIN(created_at) FROM messages WHERE status = ?", (PENDING,)
+            ).fetchone()[0]
+            latencies = [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT sent_at - created_at FROM messages "
+                    "WHERE status = ? AND sent_at >= ? ORDER BY 1",
+                    (SENT, now - window),
+                )
+            ]
+
+        def percentile(fraction: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(
+                latencies[min(len(latencies) - 1, int(len(latencies) * fraction))], 3
+            )
+
+        return {
+            "pending": counts.get(PENDING, 0),
+            "failed": counts.get(FAILED, 0),
+            "sent": counts.get(SENT, 0),
+            "oldest_pending_age": round(now - oldest, 3) if oldest else None,
+            "delivery_latency": {
+                "window": window,
+                "count": len(latencies),
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "max": round(latencies[-1], 3) if latencies else None,
+            },
+        }
+
+    async def run_worker(self, batch_size: int = 20, poll_interval: float = 5.0):
+        """
+        Drain the queue until cancelled
+
+        Each batch is sent over a single provider session. The worker sleeps
+        until the next retry is due, at most poll_interval seconds (so it
+        sees messages queued by other processes), and wakes immediately when
+        this process queues a message.
+        """
+        from app.utils.email import deliver_batch
+
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        last_purge = 0.0
+        try:
+            while True:
+                self._wakeup.clear()
+                try:
+                    batch = await asyncio.to_thread(self.claim, batch_size)
+                    if batch:
+                        try:
+                            errors = await deliver_batch(batch)
+                        except Exception as e:
+                            errors = [str(e) or type(e).__name__] * len(batch)
+                        for message, error in zip(batch, errors):
+                            if error is None:
+                                await asyncio.to_thread(self.mark_sent, message["id"])
+                            else:
+                                print(f"Error sending email {message['id']}: {error}")
+                                await asyncio.to_thread(
+                                    self.mark_failed, message["id"], error
+                                )
+                        if len(batch) == batch_size:
+                            continue
+
+                    if time.monotonic() - last_purge > 3600:
+                        await asyncio.to_thread(self.purge)
+                        last_purge = time.monotonic()
+                    due_in = await asyncio.to_thread(self.next_due_in)
+                except sqlite3.Error as e:
+                    print(f"Mail queue error: {e}")
+                    due_in = None
+
+                timeout = (
+                    poll_interval if due_in is None else min(due_in, poll_interval)
+                )
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._wakeup = None
+            self._loop = None
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+# Global mail queue instance
+_mail_queue: Optional[MailQueue] = None
+
+
+def get_mail_queue() -> MailQueue:
+    """Get the global mail queue"""
+    global _mail_queue
+    if _mail_queue is None:
+        from app.config import settings
+
+        _mail_queue = MailQueue(
+            settings.mail_queue_path,
+            max_attempts=settings.mail_queue_max_attempts,
+            retry_base=settings.mail_queue_retry_base,
+        )
+    return _mail_queue
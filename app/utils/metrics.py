@@ -0,0 +1,47 @@
+"""
+Metrics Utility Module
+In-process latency histograms for reporting through the API
+"""
+
+from typing import Any, Dict, Sequence
+import bisect
+import threading
+
+# Upper bounds in seconds; slower observations land in the overflow bucket
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram with success and error counts
+
+    Counters are per process and reset on restart.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, ok: bool = True):
+        """Record one operation"""
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            self.total += seconds
+            self.count += 1
+            if not ok:
+                self.errors += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get counts per bucket (non-cumulative), totals and the mean"""
+        with self._lock:
+            labels = [f"le_{bound:g}" for bound in self.buckets] + ["inf"]
+            return {
+                "count": self.count,
+                "errors": self.errors,
+                "mean": round(self.total / self.count, 4) if self.count else None,
+                "buckets": dict(zip(labels, self.counts)),
+            }
@@ -0,0 +1,373 @@
+"""
+Pre-rendering Utility Module
+Renders every public GET page once at build time and writes the output to a
+directory that the app (or a fronting web server) can serve as-is
+"""
+
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, quote, urlencode
+import asyncio
+import hashlib
+import json
+import shutil
+import time
+
+from app.utils.compression import (
+    is_compressible,
+    variant_path,
+    warn_if_no_brotli,
+    write_variants,
+)
+
+MANIFEST_NAME = "manifest.json"
+
+# GET routes that depend on the query or are JSON APIs
+_SKIP_PATHS = {"/search"}
+_SKIP_PREFIXES = ("/api/",)
+
+# Response headers kept with each page and replayed when it is served; the
+# build goes through the middleware, so these are the cache headers the
+# dynamic response would get
+_KEPT_HEADERS = (
+    "etag",
+    "last-modified",
+    "cache-control",
+    "pragma",
+    "expires",
+    "vary",
+    "surrogate-control",
+    "surrogate-key",
+)
+
+# File extension for routes whose path has none (e.g. "/feed")
+_EXTENSIONS = {
+    "text/html": ".html",
+    "application/xml": ".xml",
+    "application/rss+xml": ".xml",
+    "application/json": ".json",
+    "text/plain": ".txt",
+}
+
+# Sources the rendered output depends on, besides the content directory, the
+# image manifest and the template times; pages embed content-hashed static
+# URLs, so static files count too. Relative to the app package, so the
+# fingerprint does not depend on the working directory.
+_PACKAGE_DIR = Path(__file__).resolve().parent.parent
+_FINGERPRINT_SOURCES = [
+    "templates/**/*.html",
+    "routes/*.py",
+    "content/*.py",
+    "middleware.py",
+    "utils/cache_policy.py",
+    # Feed, sitemap and template helpers that shape the output
+    "utils/assets.py",
+    "utils/extract.py",
+    "utils/feeds.py",
+    "utils/images.py",
+    "utils/rss.py",
+    "utils/sitemap.py",
+    "static/**/*",
+]
+
+# Settings the templates, feeds and sitemaps read; other settings (secrets,
+# serving options) may differ between the build and the running app
+_FINGERPRINT_SETTINGS = {
+    "google_analytics_id",
+    "plausible_domain",
+    "site_url",
+    "feed_full_content",
+    "feed_page_size",
+    "sitemap_gzip",
+}
+
+
+def site_fingerprint() -> str:
+    """Hash the templates, routes, content files and settings pages are built from"""
+    from app.config import settings
+
+    digest = hashlib.sha256(
+        settings.model_dump_json(include=_FINGERPRINT_SETTINGS).encode()
+    )
+    sources = [
+        path for pattern in _FINGERPRINT_SOURCES for path in _PACKAGE_DIR.glob(pattern)
+    ]
+    for path in sorted(p for p in sources if p.is_file()):
+        digest.update(path.relative_to(_PACKAGE_DIR).as_posix().encode())
+        digest.update(path.read_bytes())
+
+    paths = list(Path(settings.content_dir).rglob("*"))
+    # Image derivatives and sitemap lastmod come from build-time files
+    for path in (settings.image_manifest_path, settings.template_times_path):
+        if path:
+            paths.append(Path(path))
+    for path in sorted(p for p in paths if p.is_file()):
+        digest.update(str(path).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def query_key(query_string: str) -> str:
+    """Canonical form of a query string, independent of order and encoding"""
+    return urlencode(sorted(parse_qsl(query_string, keep_blank_values=True)))
+
+
+def iter_public_urls(app) -> Iterator[Tuple[str, str]]:
+    """
+    List the (path, query) pairs to pre-render
+
+    Covers every parameterless GET route on the app plus the slug routes and
+    list filters backed by the content registry.
+    """
+    from fastapi.routing import APIRoute
+    from app.content.registry import get_registry
+    from app.utils.sitemap import SECTIONS as SITEMAP_SECTIONS
+
+    for route in app.routes:
+        if not isinstance(route, APIRoute) or "GET" not in route.methods:
+            continue
+        if "{" in route.path or route.path in _SKIP_PATHS:
+            continue
+        if route.path.startswith(_SKIP_PREFIXES):
+            continue
+        yield route.path, ""
+
+    registry = get_registry()
+    for slug in registry.products_by_slug:
+        yield f"/products/{slug}", ""
+    for slug in registry.case_studies_by_slug:
+        yield f"/case-studies/{slug}", ""
+    # Posts without an article still have a (placeholder) page
+    blog_slugs = [post["slug"] for post in registry.blog_posts]
+    blog_slugs.extend(registry.blog_articles_by_slug)
+    for slug in dict.fromkeys(blog_slugs):
+        yield f"/blog/{slug}", ""
+    for section in SITEMAP_SECTIONS:
+        yield f"/sitemaps/{section}.xml", ""
+        yield f"/sitemaps/{section}.xml.gz", ""
+    for industry in registry.case_studies_by_industry:
+        yield "/case-studies", urlencode({"industry": industry})
+    for category in registry.resource_categories:
+        yield "/resources", urlencode({"category": category})
+
+
+def output_path(path: str, query: str, content_type: str) -> str:
+    """
+    Relative file path for a rendered URL
+
+    Pages map to <path>/index.html so a static server can serve them by
+    directory; query variants get the encoded query in the file name.
+    Compressible files also get .br and .gz siblings.
+    """
+    parts = [part for part in path.split("/") if part]
+    if parts and "." in parts[-1] and not query:
+        return "/".join(parts)
+
+    extension = _EXTENSIONS.get(content_type.split(";")[0].strip(), ".html")
+    name = f"index.{quote(query, safe='')}{extension}" if query else f"index{extension}"
+    return "/".join(parts + [name])
+
+
+async def call_app(
+    app, method: str, path: str, query: str = ""
+) -> Tuple[int, Dict[str, str], bytes]:
+    """
+    Send one request straight through an ASGI app, without a server
+
+    Returns:
+        Tuple of (status code, response headers, body)
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "https",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"ishtar-ai.com")],
+        "client": ("127.0.0.1", 0),
+        "server": ("ishtar-ai.com", 443),
+    }
+    response: Dict = {"status": 500, "headers": [], "body": []}
+    request_sent = False
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Block until cancelled, like a client that keeps the connection open
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = message.get("headers", [])
+        elif message["type"] == "http.response.body":
+            response["body"].append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    headers = {
+        key.decode("latin-1"): value.decode("latin-1")
+        for key, value in response["headers"]
+    }
+    return response["status"], headers, b"".join(response["body"])
+
+
+async def _render_site(app, out_dir: Path) -> List[Dict]:
+    """Render every public URL into out_dir and return the manifest entries"""
+    entries = []
+    for path, query in iter_public_urls(app):
+        status, headers, body = await call_app(app, "GET", path, query)
+        if status != 200:
+            print(f"Skipping {path}{'?' + query if query else ''}: HTTP {status}")
+            continue
+
+        content_type = headers.get("content-type", "text/html; charset=utf-8")
+        file = output_path(path, query, content_type)
+        target = out_dir / file
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(body)
+        encodings = write_variants(body, target) if is_compressible(file) else []
+        entries.append(
+            {
+                "path": path,
+                "query": query_key(query),
+                "file": file,
+                "content_type": content_type,
+                "encodings": encodings,
+                "headers": {
+                    name: headers[name] for name in _KEPT_HEADERS if name in headers
+                },
+            }
+        )
+    return entries
+
+
+def build_site(out_dir: Optional[str] = None) -> str:
+    """
+    Pre-render the site into a directory with a manifest
+
+    Pages are written to a staging directory that replaces the target only
+    once every page rendered, so a failed build leaves the previous one.
+
+    Args:
+        out_dir: Output directory (defaults to settings.prerender_dir)
+
+    Returns:
+        The directory written
+    """
+    from app.config import settings
+    from app.main import app
+
+    target = Path(out_dir or settings.prerender_dir)
+    staging = target.with_name(target.name + ".tmp")
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+
+    warn_if_no_brotli()
+    entries = asyncio.run(_render_site(app, staging))
+    manifest = {"fingerprint": site_fingerprint(), "pages": entries}
+    (staging / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2))
+
+    shutil.rmtree(target, ignore_errors=True)
+    staging.rename(target)
+    return str(target)
+
+
+def load_site(
+    directory: str,
+) -> Optional[
+    Dict[Tuple[str, str], Tuple[bytes, str, Dict[str, bytes], Dict[str, str]]]
+]:
+    """
+    Load a pre-rendered site into memory
+
+    Args:
+        directory: Directory written by build_site()
+
+    Returns:
+        Mapping of (path, canonical query) to (body, content type,
+        precompressed bodies by encoding, kept response headers), or None if
+        the build is missing or was made from different sources
+    """
+    manifest_path = Path(directory) / MANIFEST_NAME
+    try:
+        manifest = json.loads(manifest_path.read_text())
+    except (OSError, ValueError):
+        print(f"No pre-rendered site at {directory}, rendering dynamically")
+        return None
+
+    if manifest.get("fingerprint") != site_fingerprint():
+        print(f"Pre-rendered site at {directory} is stale, rendering dynamically")
+        return None
+
+    pages = {}
+    for entry in manifest["pages"]:
+        file = Path(directory) / entry["file"]
+        variants = {
+            encoding: Path(variant_path(str(file), encoding)).read_bytes()
+            for encoding in entry.get("encodings", [])
+        }
+        pages[(entry["path"], entry["query"])] = (
+            file.read_bytes(),
+            entry["content_type"],
+            variants,
+            entry.get("headers", {}),
+        )
+    return pages
+
+
+async def _benchmark(app, pages, seconds: float) -> Dict[str, float]:
+    """Requests per second for each mode over the pre-rendered URLs"""
+    from app.middleware import PrerenderedMiddleware
+
+    urls = list(pages)
+    results = {}
+    for mode, target in (
+        ("dynamic", app),
+        ("prerendered", PrerenderedMiddleware(app, pages=pages)),
+    ):
+        count = 0
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            path, query = urls[count % len(urls)]
+            await call_app(target, "GET", path, query)
+            count += 1
+        results[mode] = count / seconds
+    return results
+
+
+def benchmark(
+    directory: Optional[str] = None, seconds: float = 5.0
+) -> Dict[str, float]:
+    """
+    Compare in-process throughput of dynamic and pre-rendered responses
+
+    Requests go straight through the ASGI app, so the numbers exclude the
+    server and network and show only the application's own cost.
+    """
+    from app.config import settings
+    from app.main import app
+
+    pages = load_site(directory or settings.prerender_dir)
+    if not pages:
+        raise SystemExit("Build the site first: python -m app.utils.prerender build")
+    return asyncio.run(_benchmark(app, pages, seconds))
+
+
+if __name__ == "__main__":
+    import sys
+
+    command = sys.argv[1:2]
+    if command == ["build"]:
+        print(f"Wrote pre-rendered site to {build_site(*sys.argv[2:3])}")
+    elif command == ["bench"]:
+        for mode, rate in benchmark(*sys.argv[2:3]).items():
+            print(f"{mode:>12}: {rate:,.0f} requests/s")
+    else:
+        print("Usage: python -m app.utils.prerender build|bench [DIRECTORY]")
+        sys.exit(2)
@@ -0,0 +1,221 @@
+"""
+Render Cache Utility Module
+Caches fully rendered HTML, and its compressed variants, for pages whose
+output depends only on the template, the settings and the site content
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import time
+
+from starlette.background import BackgroundTask
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.templating import Jinja2Templates
+
+from app.utils.cache import LRUCache
+from app.utils.compression import (
+    CACHED_LEVELS,
+    accepted_encodings,
+    available_encodings,
+    compress,
+)
+from app.utils.http import (
+    is_not_modified,
+    make_etag,
+    not_modified_headers,
+    variant_etag,
+)
+
+
+class PrerenderedResponse(Response):
+    """HTML response whose body and headers were built ahead of time"""
+
+    media_type = "text/html"
+
+    def __init__(
+        self,
+        body: bytes,
+        raw_headers: List[Tuple[bytes, bytes]],
+        status_code: int = 200,
+        background: Optional[BackgroundTask] = None,
+    ):
+        # Skip Response.__init__: the body is already encoded and the headers,
+        # including Content-Length, were computed when the page was cached.
+        # The list is copied so middleware can add headers to this response.
+        self.body = body
+        self.status_code = status_code
+        self.background = background
+        self.raw_headers = list(raw_headers)
+
+
+def _html_headers(
+    body: bytes,
+    encoding: Optional[str] = None,
+    vary: bool = False,
+    etag: Optional[str] = None,
+) -> List[Tuple[bytes, bytes]]:
+    """Response headers for an HTML body, optionally compressed"""
+    raw_headers = [
+        (b"content-length", str(len(body)).encode("latin-1")),
+        (b"content-type", b"text/html; charset=utf-8"),
+    ]
+    if etag:
+        raw_headers.append((b"etag", etag.encode("latin-1")))
+    if encoding:
+        raw_headers.append((b"content-encoding", encoding.encode("latin-1")))
+    if vary:
+        raw_headers.append((b"vary", b"Accept-Encoding"))
+    return raw_headers
+
+
+def prerender(
+    templates: Jinja2Templates, name: str, context: Dict[str, Any]
+) -> Tuple[bytes, List[Tuple[bytes, bytes]]]:
+    """Render a template to an encoded body and its response headers"""
+    body = templates.get_template(name).render(context).encode("utf-8")
+    return body, _html_headers(body)
+
+
+class RenderCache:
+    """
+    LRU/TTL cache of rendered pages
+
+    Entries are keyed by route, template name, a hash of the settings, the
+    template directory version, the static asset version and the content
+    version, so editing a template or asset, changing configuration or
+    reloading content makes old entries unreachable; they age out through
+    LRU eviction and the TTL. Settings are only read at startup, so their
+    hash is computed once; call refresh_settings() after changing them.
+
+    Pages of at least compress_min_size bytes are also kept compressed, one
+    variant per encoding, created the first time a client accepts it; the
+    response then carries Content-Encoding and CompressionMiddleware passes
+    it through instead of compressing the page again.
+
+    Each entry's strong ETag is hashed from the rendered body once, when it
+    is cached, and every variant carries it with its encoding appended, so
+    revalidating a cached page costs a dictionary lookup and a 304.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        maxsize: int = 64,
+        ttl: Optional[float] = None,
+        check_interval: float = 1.0,
+        compress_min_size: int = 500,
+    ):
+        self.directory = Path(directory)
+        self.check_interval = check_interval
+        self.compress_min_size = compress_min_size
+        self.encodings = available_encodings()
+        self._cache = LRUCache(maxsize=maxsize, ttl=ttl)
+        self._template_version = ""
+        self._checked_at = float("-inf")
+        self._settings_version: Optional[str] = None
+
+    def template_version(self) -> str:
+        """
+        Fingerprint of the template files (paths, mtimes and sizes)
+
+        The directory is stat'ed at most once per check_interval seconds.
+        """
+        now = time.monotonic()
+        if now - self._checked_at >= self.check_interval:
+            digest = hashlib.sha1()
+            for path in sorted(self.directory.rglob("*.html")):
+                stat = path.stat()
+                digest.update(f"{path}:{stat.st_mtime_ns}:{stat.st_size}".encode())
+            self._template_version = digest.hexdigest()
+            self._checked_at = now
+        return self._template_version
+
+    def settings_version(self) -> str:
+        """Hash of the settings, computed on first use"""
+        if self._settings_version is None:
+            from app.config import settings
+
+            self._settings_version = hashlib.sha1(
+                settings.model_dump_json().encode()
+            ).hexdigest()
+        return self._settings_version
+
+    def refresh_settings(self):
+        """Rehash the settings on the next render, after they were changed"""
+        self._settings_version = None
+
+    def render(
+        self,
+        templates: Jinja2Templates,
+        route: str,
+        name: str,
+        context: Dict[str, Any],
+        request_headers: Optional[Headers] = None,
+    ) -> PrerenderedResponse:
+        """
+        Serve a page from the cache, rendering it on a miss
+
+        Args:
+            templates: Template environment to render with
+            route: Route path the page is served under
+            name: Template name
+            context: Template context; must not vary between requests to the
+                same route beyond the settings and content
+            request_headers: Request headers, to pick a compressed variant
+                from Accept-Encoding and answer If-None-Match
+
+        Returns:
+            Response with the rendered page, or 304 if the client's copy is
+            current
+        """
+        from app.content.registry import get_registry
+        from app.utils.assets import get_asset_manifest
+
+        key = (
+            route,
+            name,
+            self.settings_version(),
+            self.template_version(),
+            get_asset_manifest().version(),
+            get_registry().version,
+        )
+        entry = self._cache.get(key)
+        if entry is None:
+            body, _ = prerender(templates, name, context)
+            vary = len(body) >= self.compress_min_size
+            etag = make_etag(body)
+            # encoding (None for identity) -> (body, headers, etag), filled lazily
+            entry = {None: (body, _html_headers(body, vary=vary, etag=etag), etag)}
+            self._cache.set(key, entry)
+
+        request_headers = request_headers or Headers()
+        accept_encoding = request_headers.get("accept-encoding", "")
+        encoding = None
+        if accept_encoding and len(entry[None][0]) >= self.compress_min_size:
+            encodings = accepted_encodings(accept_encoding, self.encodings)
+            encoding = encodings[0] if encodings else None
+        if encoding is not None and encoding not in entry:
+            data = compress(entry[None][0], encoding, CACHED_LEVELS[encoding])
+            etag = variant_etag(entry[None][2], encoding)
+            entry[encoding] = (
+                data,
+                _html_headers(data, encoding, vary=True, etag=etag),
+                etag,
+            )
+
+        body, raw_headers, etag = entry[encoding]
+        if is_not_modified(request_headers, etag, None):
+            return PrerenderedResponse(
+                b"", not_modified_headers(raw_headers), status_code=304
+            )
+        return PrerenderedResponse(body, raw_headers)
+
+    def clear(self):
+        """Drop every cached page"""
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get size and hit/miss counters"""
+        return self._cache.stats()
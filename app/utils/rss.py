@@ -4,104 +4,229 @@ Generates RSS 2.0 compliant feeds for blog posts
 """
 
 from datetime import datetime
-from typing import List, Dict
-from xml.etree import ElementTree as ET
-from xml.dom import minidom
+from io import StringIO
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import urljoin
+from xml.sax.saxutils import XMLGenerator
+import re
 
+from app.utils.http import http_date
 
-def generate_rss_feed(
-    posts: List[Dict], site_url: str = "https://ishtar-ai.com"
-) -> str:
+
+class XMLWriter:
+    """
+    Indented XML written with XMLGenerator into a buffer that the caller
+    drains as it goes
+
+    Elements are emitted as they are produced, with no tree to build and no
+    reparse to pretty-print it, so a feed can be sent one item at a time.
+    """
+
+    def __init__(self, indent: str = "  "):
+        self._out = StringIO()
+        self._generator = XMLGenerator(
+            self._out, encoding="utf-8", short_empty_elements=True
+        )
+        self._indent = indent
+        self._depth = 0
+
+    def drain(self) -> str:
+        """Take the text written since the last drain"""
+        text = self._out.getvalue()
+        self._out.seek(0)
+        self._out.truncate()
+        return text
+
+    def _newline(self):
+        self._generator.ignorableWhitespace("\n" + self._indent * self._depth)
+
+    def start_document(self):
+        self._generator.startDocument()
+
+    def start(self, name: str, attrs: Optional[Dict[str, str]] = None):
+        """Open an element whose children follow"""
+        # startDocument() already ended its line
+        if self._depth:
+            self._newline()
+        self._generator.startElement(name, attrs or {})
+        self._depth += 1
+
+    def end(self, name: str):
+        """Close the innermost open element"""
+        self._depth -= 1
+        self._newline()
+        self._generator.endElement(name)
+
+    def element(
+        self, name: str, text: str = "", attrs: Optional[Dict[str, str]] = None
+    ):
+        """Write an element with text content only"""
+        self._newline()
+        self._generator.startElement(name, attrs or {})
+        self._generator.characters(text)
+        self._generator.endElement(name)
+
+    def end_document(self):
+        self._generator.ignorableWhitespace("\n")
+        self._generator.endDocument()
+
+
+def post_date(value) -> Optional[datetime]:
+    """Parse a post date, or None if it is missing or invalid"""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return None
+
+
+_URL_ATTR_RE = re.compile(
+    r"""(\s(href|src|srcset|poster)\s*=\s*)("[^"]*"|'[^']*')""", re.IGNORECASE
+)
+
+
+def absolute_urls(html: str, base: str) -> str:
+    """
+    Resolve the URLs in href, src, srcset and poster attributes against base
+
+    Feed readers show article HTML away from the site and resolve relative
+    URLs against their own origin, so links and images in full-content
+    entries must be absolute. Absolute URLs and other schemes (mailto:,
+    data:) are left as they are.
     """
-    Generate RSS 2.0 compliant XML feed from blog posts
+
+    def replace(match: "re.Match[str]") -> str:
+        prefix, name, quoted = match.groups()
+        quote, value = quoted[0], quoted[1:-1]
+        if name.lower() == "srcset":
+            # Comma-separated "URL [descriptor]" candidates
+            candidates = []
+            for candidate in value.split(","):
+                parts = candidate.split()
+                if parts:
+                    parts[0] = urljoin(base, parts[0])
+                    candidates.append(" ".join(parts))
+            value = ", ".join(candidates)
+        else:
+            value = urljoin(base, value.strip())
+        return f"{prefix}{quote}{value}{quote}"
+
+    return _URL_ATTR_RE.sub(replace, html)
+
+
+FEED_TITLE = "Ishtar AI Blog"
+FEED_DESCRIPTION = "AI solutions for regulated enterprises and media organizations. Latest insights on RAG copilots, agent automation, LLMOps, and AI security."
+
+
+def iter_rss_feed(
+    posts: List[Dict],
+    site_url: str = "https://ishtar-ai.com",
+    links: Optional[Dict[str, str]] = None,
+    full_content: bool = True,
+) -> Iterator[str]:
+    """
+    Serialize an RSS 2.0 feed one item at a time
+
+    The output depends only on the arguments, so the same posts always give
+    the same bytes: lastBuildDate is the newest post's date, not the time of
+    the request.
 
     Args:
         posts: List of dictionaries containing post data:
             - title: Post title
             - slug: Post slug/URL
             - description: Post description/excerpt
+            - content: Full article HTML (optional)
             - published_date: datetime object or ISO string
             - author: Author name (optional)
             - categories: List of categories/tags (optional)
         site_url: Base URL of the site
+        links: Feed URLs by relation: "self" and, for paged feeds, "first",
+            "previous", "next" and "last" (RFC 5005)
+        full_content: Include article bodies as content:encoded, with their
+            URLs made absolute
 
-    Returns:
-        RSS XML string
+    Yields:
+        Consecutive pieces of the RSS XML document
     """
-    # Create root element
-    rss = ET.Element("rss", version="2.0")
-    rss.set("xmlns:atom", "http://www.w3.org/2005/Atom")
-    rss.set("xmlns:content", "http://purl.org/rss/1.0/modules/content/")
-
-    channel = ET.SubElement(rss, "channel")
-
-    # Channel metadata
-    ET.SubElement(channel, "title").text = "Ishtar AI Blog"
-    ET.SubElement(channel, "link").text = f"{site_url}/blog"
-    ET.SubElement(channel, "description").text = (
-        "AI solutions for regulated enterprises and media organizations. Latest insights on RAG copilots, agent automation, LLMOps, and AI security."
-    )
-    ET.SubElement(channel, "language").text = "en-US"
-    ET.SubElement(channel, "lastBuildDate").text = datetime.utcnow().strftime(
-        "%a, %d %b %Y %H:%M:%S GMT"
+    links = links or {"self": f"{site_url}/feed"}
+    dates = [post_date(post.get("published_date")) for post in posts]
+    xml = XMLWriter()
+    xml.start_document()
+    xml.start(
+        "rss",
+        {
+            "version": "2.0",
+            "xmlns:atom": "http://www.w3.org/2005/Atom",
+            "xmlns:content": "http://purl.org/rss/1.0/modules/content/",
+        },
     )
-    ET.SubElement(channel, "generator").text = "Ishtar AI FastAPI"
-
-    # Atom self-link
-    atom_link = ET.SubElement(channel, "atom:link")
-    atom_link.set("href", f"{site_url}/feed")
-    atom_link.set("rel", "self")
-    atom_link.set("type", "application/rss+xml")
-
-    # Add items for each post
-    for post in posts:
-        item = ET.SubElement(channel, "item")
+    xml.start("channel")
 
-        ET.SubElement(item, "title").text = post.get("title", "")
-        ET.SubElement(item, "link").text = f"{site_url}/blog/{post.get('slug', '')}"
-        ET.SubElement(item, "guid", isPermaLink="true").text = (
-            f"{site_url}/blog/{post.get('slug', '')}"
+    # Channel metadata
+    xml.element("title", FEED_TITLE)
+    xml.element("link", f"{site_url}/blog")
+    xml.element("description", FEED_DESCRIPTION)
+    xml.element("language", "en-US")
+    known_dates = [date for date in dates if date is not None]
+    if known_dates:
+        xml.element("lastBuildDate", http_date(max(known_dates)))
+    xml.element("generator", "Ishtar AI FastAPI")
+
+    # Atom self and paging links
+    for rel, href in links.items():
+        xml.element(
+            "atom:link", attrs={"href": href, "rel": rel, "type": "application/rss+xml"}
         )
+    yield xml.drain()
 
-        # Description
-        description = ET.SubElement(item, "description")
-        description.text = post.get("description", "")
-
-        # Published date
-        pub_date = post.get("published_date")
-        if pub_date:
-            if isinstance(pub_date, str):
-                # Try to parse ISO string
-                try:
-                    pub_date = datetime.fromisoformat(pub_date.replace("Z", "+00:00"))
-                except:
-                    pub_date = datetime.utcnow()
-            elif isinstance(pub_date, datetime):
-                pass
-            else:
-                pub_date = datetime.utcnow()
-
-            ET.SubElement(item, "pubDate").text = pub_date.strftime(
-                "%a, %d %b %Y %H:%M:%S GMT"
-            )
-        else:
-            ET.SubElement(item, "pubDate").text = datetime.utcnow().strftime(
-                "%a, %d %b %Y %H:%M:%S GMT"
-            )
+    # Add items for each post
+    for post, pub_date in zip(posts, dates):
+        link = f"{site_url}/blog/{post.get('slug', '')}"
+        xml.start("item")
+        xml.element("title", post.get("title", ""))
+        xml.element("link", link)
+        xml.element("guid", link, {"isPermaLink": "true"})
+        xml.element("description", post.get("description", ""))
+        if full_content and post.get("content"):
+            xml.element("content:encoded", absolute_urls(post["content"], link))
+        if pub_date is not None:
+            xml.element("pubDate", http_date(pub_date))
 
         # Author
         author = post.get("author")
         if author:
-            ET.SubElement(item, "author").text = f"{author} ({site_url})"
+            xml.element("author", f"{author} ({site_url})")
 
         # Categories
         categories = post.get("categories", [])
         if isinstance(categories, str):
             categories = [categories]
         for category in categories:
-            ET.SubElement(item, "category").text = category
+            xml.element("category", category)
+        xml.end("item")
+        yield xml.drain()
 
-    # Convert to string with pretty formatting
-    rough_string = ET.tostring(rss, encoding="unicode")
-    reparsed = minidom.parseString(rough_string)
-    return reparsed.toprettyxml(indent="  ")
+    xml.end("channel")
+    xml.end("rss")
+    xml.end_document()
+    yield xml.drain()
+
+
+def generate_rss_feed(
+    posts: List[Dict], site_url: str = "https://ishtar-ai.com"
+) -> str:
+    """
+    Generate RSS 2.0 compliant XML feed from blog posts
+
+    Args:
+        posts: Post records, as for iter_rss_feed()
+        site_url: Base URL of the site
+
+    Returns:
+        RSS XML string
+    """
+    return "".join(iter_rss_feed(posts, site_url))
@@ -3,15 +3,161 @@ Search Utility Module
 Provides full-text search across blog posts, pages, case studies, resources, and FAQ
 """
 
-from typing import List, Dict, Optional
+from collections import Counter
+from functools import lru_cache
+from html import escape
+from pathlib import Path
+from typing import FrozenSet, List, Dict, Optional, Tuple
+import bisect
+import hashlib
+import heapq
+import json
+import math
+import mmap
+import os
 import re
+import struct
+
+# Tokens are lowercase alphanumeric runs; everything else is a separator
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase search terms"""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _all_deletes(term: str, max_distance: int) -> FrozenSet[str]:
+    """The term itself plus every variant with up to max_distance characters removed"""
+    variants = {term}
+    frontier = {term}
+    for _ in range(max_distance):
+        frontier = {
+            variant[:i] + variant[i + 1 :]
+            for variant in frontier
+            for i in range(len(variant))
+        }
+        variants |= frontier
+    return frozenset(variants)
+
+
+# Query terms repeat; vocabulary terms are expanded once per build
+_deletes = lru_cache(maxsize=256)(_all_deletes)
+
+
+def _edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Optimal string alignment distance between two terms
+
+    Counts insertions, deletions, substitutions and adjacent transpositions.
+    Returns max_distance + 1 as soon as the distance is known to exceed it.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    previous_previous: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(
+                previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost
+            )
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+
+@lru_cache(maxsize=256)
+def _highlight_pattern(query_terms: Tuple[str, ...]) -> "re.Pattern[str]":
+    """Compile one alternation pattern matching any of the query terms"""
+    # Longest first so overlapping terms highlight the longer match
+    alternation = "|".join(
+        re.escape(term) for term in sorted(query_terms, key=len, reverse=True)
+    )
+    return re.compile(rf"(?<![a-z0-9])(?:{alternation})(?![a-z0-9])", re.IGNORECASE)
+
+
+# BM25F defaults: title hits count for more than body hits
+DEFAULT_TITLE_BOOST = 3.0
+DEFAULT_CONTENT_BOOST = 1.0
+DEFAULT_K1 = 1.2
+DEFAULT_TITLE_B = 0.5
+DEFAULT_CONTENT_B = 0.75
+
+# Fuzzy matching: terms shorter than this are never corrected, each
+# unknown term expands to at most FUZZY_EXPANSIONS_PER_TERM vocabulary terms
+# and a query to at most FUZZY_EXPANSIONS_PER_QUERY in total
+FUZZY_MIN_LENGTH = 4
+FUZZY_MAX_DISTANCE = 2
+FUZZY_MAX_TERM_LENGTH = 32
+FUZZY_EXPANSIONS_PER_TERM = 3
+FUZZY_EXPANSIONS_PER_QUERY = 6
+# Score multiplier for a corrected term, by edit distance
+FUZZY_PENALTY = {1: 0.7, 2: 0.5}
+
+# Packed posting: doc_id, bm25f weight, title tf, content tf
+_POSTING = struct.Struct("<IfHH")
+_MAX_TF = 0xFFFF
+
+# Snapshot header: magic, format version, fingerprint, then offset/length
+# pairs for the metadata, postings and document text regions
+_SNAPSHOT_MAGIC = b"ISIX"
+_SNAPSHOT_VERSION = 2
+_SNAPSHOT_HEADER = struct.Struct("<4sH32sQQQQQQ")
 
 
 class SearchIndex:
-    """Simple in-memory search index"""
+    """
+    Inverted index over titles and content, ranked with BM25F
 
-    def __init__(self):
-        self.index: List[Dict] = []
+    Documents are added with add_document() and finalize() then packs the
+    weighted postings into one contiguous buffer. The same packed layout is
+    written by save() and memory-mapped by load(), so workers that load a
+    snapshot share its pages instead of each holding a private copy.
+    """
+
+    def __init__(
+        self,
+        title_boost: float = DEFAULT_TITLE_BOOST,
+        content_boost: float = DEFAULT_CONTENT_BOOST,
+        k1: float = DEFAULT_K1,
+        title_b: float = DEFAULT_TITLE_B,
+        content_b: float = DEFAULT_CONTENT_B,
+    ):
+        self.title_boost = title_boost
+        self.content_boost = content_boost
+        self.k1 = k1
+        self.title_b = title_b
+        self.content_b = content_b
+
+        self.documents: List[Dict] = []
+        # term -> list of (doc_id, title_tf, content_tf), in doc_id order
+        self.postings: Dict[str, List[Tuple[int, int, int]]] = {}
+        # doc_id -> (title length, content length) in tokens
+        self.doc_lengths: List[Tuple[int, int]] = []
+
+        # Packed postings, filled in by finalize() or load()
+        self._terms: Dict[str, Tuple[int, int]] = {}
+        self._postings_data: memoryview = memoryview(b"")
+        self._text_data: memoryview = memoryview(b"")
+        self._mmap: Optional[mmap.mmap] = None
+        self._finalized = False
+        # Content fingerprint this index was built from, set by get_search_index()
+        self.version = ""
+
+        # Prefix structures for suggest(), built on first use
+        self._sorted_terms: List[str] = []
+        self._title_keys: List[Tuple[str, int]] = []
+        self._suggest_ready = False
+
+        # Symmetric-delete dictionary for fuzzy matching, built on first use
+        self._delete_map: Dict[str, List[str]] = {}
+        self._fuzzy_ready = False
 
     def add_document(
         self,
@@ -20,126 +166,499 @@ class SearchIndex:
         url: str,
         doc_type: str,
         excerpt: Optional[str] = None,
-    ):
-        """Add a document to the search index"""
-        self.index.append(
+        group: Optional[int] = None,
+    ) -> int:
+        """
+        Add a document to the search index
+
+        Args:
+            group: doc_id of the page this document is a section of; search
+                returns at most one result per group
+
+        Returns:
+            The new document's doc_id
+        """
+        if self._mmap is not None:
+            raise RuntimeError("Snapshot-backed search index is read-only")
+
+        doc_id = len(self.documents)
+        self.documents.append(
             {
                 "title": title,
-                "content": content.lower(),
+                "content": content,
                 "url": url,
                 "type": doc_type,
                 "excerpt": (
                     excerpt or content[:200] + "..." if len(content) > 200 else content
                 ),
+                "group": doc_id if group is None else group,
             }
         )
 
-    def search(self, query: str, doc_types: Optional[List[str]] = None) -> List[Dict]:
+        title_terms = Counter(tokenize(title))
+        content_terms = Counter(tokenize(content))
+        self.doc_lengths.append(
+            (sum(title_terms.values()), sum(content_terms.values()))
+        )
+
+        for term in title_terms.keys() | content_terms.keys():
+            self.postings.setdefault(term, []).append(
+                (doc_id, title_terms[term], content_terms[term])
+            )
+        self._finalized = False
+        return doc_id
+
+    def finalize(self):
+        """
+        Precompute BM25F weights for every posting and pack them
+
+        Field length norms and IDF only depend on the indexed documents, so
+        they are folded into a single weight per (term, document) here and
+        queries just sum those weights.
+        """
+        doc_count = len(self.documents)
+        avg_title = sum(t for t, _ in self.doc_lengths) / doc_count if doc_count else 0
+        avg_content = (
+            sum(c for _, c in self.doc_lengths) / doc_count if doc_count else 0
+        )
+
+        # Per-document length norms, one per field
+        title_norms = [
+            1 - self.title_b + self.title_b * (t / avg_title if avg_title else 0)
+            for t, _ in self.doc_lengths
+        ]
+        content_norms = [
+            1
+            - self.content_b
+            + self.content_b * (c / avg_content if avg_content else 0)
+            for _, c in self.doc_lengths
+        ]
+
+        packed = bytearray()
+        terms = {}
+        for term in sorted(self.postings):
+            postings = self.postings[term]
+            df = len(postings)
+            idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+            terms[term] = (len(packed), df)
+            for doc_id, title_tf, content_tf in postings:
+                tf = (
+                    self.title_boost * title_tf / title_norms[doc_id]
+                    + self.content_boost * content_tf / content_norms[doc_id]
+                )
+                packed += _POSTING.pack(
+                    doc_id,
+                    idf * tf / (self.k1 + tf),
+                    min(title_tf, _MAX_TF),
+                    min(content_tf, _MAX_TF),
+                )
+
+        self._terms = terms
+        self._postings_data = memoryview(bytes(packed))
+        self._finalized = True
+        self._suggest_ready = False
+        self._fuzzy_ready = False
+
+    def _iter_postings(self, term: str):
+        """Yield (doc_id, weight, title_tf, content_tf) for a term"""
+        entry = self._terms.get(term)
+        if entry is None:
+            return ()
+        offset, count = entry
+        return _POSTING.iter_unpack(
+            self._postings_data[offset : offset + count * _POSTING.size]
+        )
+
+    def _content(self, doc_id: int) -> str:
+        """Get a document's text, decoding it from the snapshot if needed"""
+        doc = self.documents[doc_id]
+        if "content" in doc:
+            return doc["content"]
+        offset, length = doc["text"]
+        return str(self._text_data[offset : offset + length], "utf-8")
+
+    def save(self, path: str, fingerprint: bytes):
+        """
+        Write the finalized index to a binary snapshot file
+
+        Args:
+            path: Destination file, replaced atomically
+            fingerprint: Content fingerprint the snapshot was built from
+        """
+        if not self._finalized:
+            self.finalize()
+
+        text = bytearray()
+        documents = []
+        for doc_id, doc in enumerate(self.documents):
+            encoded = self._content(doc_id).encode("utf-8")
+            documents.append(
+                {
+                    "title": doc["title"],
+                    "url": doc["url"],
+                    "type": doc["type"],
+                    "excerpt": doc["excerpt"],
+                    "group": doc["group"],
+                    "text": [len(text), len(encoded)],
+                }
+            )
+            text += encoded
+
+        meta = json.dumps(
+            {"documents": documents, "terms": self._terms}, separators=(",", ":")
+        ).encode("utf-8")
+        postings = bytes(self._postings_data)
+
+        meta_offset = _SNAPSHOT_HEADER.size
+        postings_offset = meta_offset + len(meta)
+        text_offset = postings_offset + len(postings)
+        header = _SNAPSHOT_HEADER.pack(
+            _SNAPSHOT_MAGIC,
+            _SNAPSHOT_VERSION,
+            fingerprint,
+            meta_offset,
+            len(meta),
+            postings_offset,
+            len(postings),
+            text_offset,
+            len(text),
+        )
+
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_suffix(target.suffix + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(header)
+            f.write(meta)
+            f.write(postings)
+            f.write(text)
+        os.replace(tmp_path, target)
+
+    @classmethod
+    def load(cls, path: str, fingerprint: bytes) -> Optional["SearchIndex"]:
+        """
+        Memory-map a snapshot written by save()
+
+        Returns:
+            The loaded index, or None if the file is missing, malformed or
+            was built from different content
+        """
+        try:
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+        try:
+            (
+                magic,
+                version,
+                snapshot_fingerprint,
+                meta_offset,
+                meta_length,
+                postings_offset,
+                postings_length,
+                text_offset,
+                text_length,
+            ) = _SNAPSHOT_HEADER.unpack_from(mapped)
+        except struct.error:
+            mapped.close()
+            return None
+
+        if (
+            magic != _SNAPSHOT_MAGIC
+            or version != _SNAPSHOT_VERSION
+            or snapshot_fingerprint != fingerprint
+        ):
+            mapped.close()
+            return None
+
+        # A truncated or corrupt file must not take the worker down: treat it
+        # like a missing snapshot so the index is rebuilt
+        regions = (
+            (meta_offset, meta_length),
+            (postings_offset, postings_length),
+            (text_offset, text_length),
+        )
+        if any(
+            offset < _SNAPSHOT_HEADER.size or offset + length > len(mapped)
+            for offset, length in regions
+        ):
+            mapped.close()
+            return None
+        try:
+            meta = json.loads(mapped[meta_offset : meta_offset + meta_length])
+            documents = meta["documents"]
+            terms = {term: tuple(entry) for term, entry in meta["terms"].items()}
+        except (ValueError, UnicodeDecodeError, KeyError, TypeError, AttributeError):
+            mapped.close()
+            return None
+        view = memoryview(mapped)
+
+        index = cls()
+        index.documents = documents
+        index._terms = terms
+        index._postings_data = view[postings_offset : postings_offset + postings_length]
+        index._text_data = view[text_offset : text_offset + text_length]
+        index._mmap = mapped
+        index._finalized = True
+        return index
+
+    def search(
+        self,
+        query: str,
+        doc_types: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict]:
         """
         Search the index for documents matching the query
 
         Args:
             query: Search query string
             doc_types: Optional list of document types to filter by
+            limit: Optional maximum number of results to return
 
         Returns:
-            List of matching documents with relevance scores
+            List of matching documents with relevance scores, best first
         """
         if not query or not query.strip():
             return []
 
-        query_lower = query.lower().strip()
-        query_terms = re.split(r"\s+", query_lower)
+        # Deduplicate while keeping query order for snippet highlighting
+        query_terms = list(dict.fromkeys(tokenize(query)))
+        if not query_terms:
+            return []
 
-        results = []
+        if not self._finalized:
+            self.finalize()
 
-        for doc in self.index:
-            # Filter by document type if specified
+        # Unknown terms are replaced by their closest vocabulary terms
+        weighted_terms = self._expand_terms(query_terms)
+
+        # Score is the dot product of the query with the precomputed weights
+        scores: Dict[int, float] = {}
+        title_matches: Dict[int, int] = {}
+        content_matches: Dict[int, int] = {}
+        for term, factor in weighted_terms:
+            for doc_id, weight, title_tf, content_tf in self._iter_postings(term):
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight * factor
+                if title_tf:
+                    title_matches[doc_id] = title_matches.get(doc_id, 0) + 1
+                content_matches[doc_id] = content_matches.get(doc_id, 0) + content_tf
+
+        # Keep the best-scoring section of each page
+        best: Dict[int, Tuple[float, int]] = {}
+        for doc_id, score in scores.items():
+            doc = self.documents[doc_id]
             if doc_types and doc["type"] not in doc_types:
                 continue
+            current = best.get(doc["group"])
+            if current is None or (score, -doc_id) > (current[0], -current[1]):
+                best[doc["group"]] = (score, doc_id)
+        candidates = list(best.values())
 
-            # Calculate relevance score
-            score = 0
-            title_matches = 0
-            content_matches = 0
-
-            # Check title matches (higher weight)
-            title_lower = doc["title"].lower()
-            for term in query_terms:
-                if term in title_lower:
-                    title_matches += 1
-                    score += 10  # Title matches are worth more
-
-            # Check content matches
-            content = doc["content"]
-            for term in query_terms:
-                # Count occurrences in content
-                count = content.count(term)
-                content_matches += count
-                score += count * 2  # Content matches worth less
-
-            # Exact phrase match bonus
-            if query_lower in title_lower:
-                score += 20
-            if query_lower in content:
-                score += 10
-
-            # Only include documents with matches
-            if score > 0:
-                # Generate snippet with highlighted terms
-                snippet = self._generate_snippet(
-                    doc["content"], query_terms, doc.get("excerpt", "")
-                )
+        # Ties fall back to index order so results are stable
+        if limit is not None and limit < len(candidates):
+            top = heapq.nlargest(limit, candidates, key=lambda c: (c[0], -c[1]))
+        else:
+            top = sorted(candidates, key=lambda c: (-c[0], c[1]))
 
-                results.append(
-                    {
-                        "title": doc["title"],
-                        "url": doc["url"],
-                        "type": doc["type"],
-                        "excerpt": snippet,
-                        "score": score,
-                        "title_matches": title_matches,
-                        "content_matches": content_matches,
-                    }
-                )
+        # Snippets are only generated for the results we actually return
+        pattern = _highlight_pattern(tuple(term for term, _ in weighted_terms))
+
+        results = []
+        for score, doc_id in top:
+            doc = self.documents[doc_id]
+            snippet = self._generate_snippet(
+                self._content(doc_id), pattern, doc.get("excerpt", "")
+            )
 
-        # Sort by score (descending)
-        results.sort(key=lambda x: x["score"], reverse=True)
+            results.append(
+                {
+                    "title": doc["title"],
+                    "url": doc["url"],
+                    "type": doc["type"],
+                    "excerpt": snippet,
+                    "score": round(score, 4),
+                    "title_matches": title_matches.get(doc_id, 0),
+                    "content_matches": content_matches.get(doc_id, 0),
+                }
+            )
 
         return results
 
+    def _build_fuzzy(self):
+        """Build the symmetric-delete dictionary over the vocabulary"""
+        delete_map: Dict[str, List[str]] = {}
+        for term in self._terms:
+            if FUZZY_MIN_LENGTH <= len(term) <= FUZZY_MAX_TERM_LENGTH:
+                for variant in _all_deletes(term, FUZZY_MAX_DISTANCE):
+                    delete_map.setdefault(variant, []).append(term)
+        self._delete_map = delete_map
+        self._fuzzy_ready = True
+
+    def _fuzzy_candidates(self, term: str) -> List[Tuple[str, int]]:
+        """
+        Find vocabulary terms within FUZZY_MAX_DISTANCE edits of a term
+
+        Both the vocabulary and the query term are expanded to every variant
+        with up to FUZZY_MAX_DISTANCE characters deleted, so any term within
+        that distance shares a variant with the query. Lookups are bounded by
+        the term length (one per variant), not by the vocabulary size.
+
+        Returns:
+            Up to FUZZY_EXPANSIONS_PER_TERM (term, distance) pairs, closest
+            and most common first
+        """
+        if not FUZZY_MIN_LENGTH <= len(term) <= FUZZY_MAX_TERM_LENGTH:
+            return []
+        if not self._fuzzy_ready:
+            self._build_fuzzy()
+
+        candidates = set()
+        for variant in _deletes(term, FUZZY_MAX_DISTANCE):
+            candidates.update(self._delete_map.get(variant, ()))
+
+        matches = []
+        for candidate in candidates:
+            distance = _edit_distance(term, candidate, FUZZY_MAX_DISTANCE)
+            if distance <= FUZZY_MAX_DISTANCE:
+                matches.append((distance, -self._terms[candidate][1], candidate))
+        matches.sort()
+        return [(c, d) for d, _, c in matches[:FUZZY_EXPANSIONS_PER_TERM]]
+
+    def _expand_terms(self, query_terms: List[str]) -> List[Tuple[str, float]]:
+        """Pair each query term with a score factor, correcting unknown terms"""
+        weighted = []
+        budget = FUZZY_EXPANSIONS_PER_QUERY
+        for term in query_terms:
+            if term in self._terms:
+                weighted.append((term, 1.0))
+                continue
+            if budget <= 0:
+                continue
+            for candidate, distance in self._fuzzy_candidates(term)[:budget]:
+                weighted.append((candidate, FUZZY_PENALTY[distance]))
+                budget -= 1
+        return weighted
+
+    def prepare_lookups(self):
+        """Build the suggestion and fuzzy structures ahead of the first query"""
+        if not self._finalized:
+            self.finalize()
+        if not self._suggest_ready:
+            self._build_suggest()
+        if not self._fuzzy_ready:
+            self._build_fuzzy()
+
+    def _build_suggest(self):
+        """Build the sorted term dictionary and title keys used by suggest()"""
+        self._sorted_terms = sorted(self._terms)
+
+        # One key per word start in each title, so "compliance" also
+        # completes to "Synthetic Media Compliance Checklist"
+        title_keys = []
+        for doc_id, doc in enumerate(self.documents):
+            title = doc["title"].lower()
+            for match in _TOKEN_RE.finditer(title):
+                title_keys.append((title[match.start() :], doc_id))
+        title_keys.sort()
+        self._title_keys = title_keys
+        self._suggest_ready = True
+
+    def suggest(self, prefix: str, limit: int = 8) -> Dict[str, List[Dict]]:
+        """
+        Complete a partially typed query
+
+        The last token of the prefix is completed from the sorted term
+        dictionary, ranked by document frequency; titles with a word starting
+        with the whole prefix are returned alongside.
+
+        Args:
+            prefix: Text typed so far
+            limit: Maximum number of completions of each kind
+
+        Returns:
+            Dictionary with "terms" and "documents" completion lists
+        """
+        if not self._finalized:
+            self.finalize()
+        if not self._suggest_ready:
+            self._build_suggest()
+
+        prefix_lower = prefix.lower().lstrip()
+        tokens = tokenize(prefix_lower)
+        if not tokens:
+            return {"terms": [], "documents": []}
+
+        # A trailing separator means the last word is complete already
+        head = tokens if not _TOKEN_RE.match(prefix_lower[-1:]) else tokens[:-1]
+        last = "" if head is tokens else tokens[-1]
+
+        terms = []
+        if last:
+            start = bisect.bisect_left(self._sorted_terms, last)
+            end = bisect.bisect_left(self._sorted_terms, last + "\uffff", lo=start)
+            ranked = heapq.nsmallest(
+                limit,
+                self._sorted_terms[start:end],
+                key=lambda term: (-self._terms[term][1], term),
+            )
+            lead = " ".join(head)
+            terms = [
+                {
+                    "text": f"{lead} {term}" if lead else term,
+                    "count": self._terms[term][1],
+                }
+                for term in ranked
+            ]
+
+        documents = []
+        seen_urls = set()
+        title_prefix = " ".join(tokens) if not last else prefix_lower.strip()
+        i = bisect.bisect_left(self._title_keys, (title_prefix,))
+        while i < len(self._title_keys) and len(documents) < limit:
+            key, doc_id = self._title_keys[i]
+            if not key.startswith(title_prefix):
+                break
+            doc = self.documents[doc_id]
+            if doc["url"] not in seen_urls:
+                seen_urls.add(doc["url"])
+                documents.append(
+                    {"title": doc["title"], "url": doc["url"], "type": doc["type"]}
+                )
+            i += 1
+
+        return {"terms": terms, "documents": documents}
+
     def _generate_snippet(
         self,
         content: str,
-        query_terms: List[str],
+        pattern: "re.Pattern[str]",
         fallback_excerpt: str,
         max_length: int = 200,
     ) -> str:
-        """Generate a snippet with highlighted search terms"""
+        """Generate an HTML-escaped snippet with highlighted search terms"""
         if not content:
-            return fallback_excerpt
+            return escape(fallback_excerpt)
 
-        # Find the first occurrence of any query term
-        first_match_pos = len(content)
-        for term in query_terms:
-            pos = content.find(term)
-            if pos != -1 and pos < first_match_pos:
-                first_match_pos = pos
+        # Center the snippet on the first occurrence of any query term
+        match = pattern.search(content)
+        first_match_pos = match.start() if match else 0
 
-        # Extract snippet around the match
         start = max(0, first_match_pos - 50)
         end = min(len(content), first_match_pos + max_length)
-
         snippet = content[start:end]
 
-        # Highlight query terms
-        for term in query_terms:
-            snippet = re.sub(
-                re.escape(term),
-                lambda m: f"<mark>{m.group()}</mark>",
-                snippet,
-                flags=re.IGNORECASE,
-            )
+        # Escape and highlight in a single pass over the snippet
+        parts = []
+        last = 0
+        for m in pattern.finditer(snippet):
+            parts.append(escape(snippet[last : m.start()]))
+            parts.append(f"<mark>{escape(m.group())}</mark>")
+            last = m.end()
+        parts.append(escape(snippet[last:]))
+        snippet = "".join(parts)
 
         # Add ellipsis if needed
         if start > 0:
@@ -150,123 +669,364 @@ class SearchIndex:
         return snippet
 
 
+# Files whose contents feed the index, besides the content directory; any
+# change invalidates snapshots
+# Relative to the app package, so the fingerprint does not depend on the
+# working directory the build or the server runs from
+_PACKAGE_DIR = Path(__file__).resolve().parent.parent
+_FINGERPRINT_SOURCES = [
+    "content/*.py",
+    "templates/*.html",
+    "utils/extract.py",
+    "utils/search.py",
+]
+
+
+def content_fingerprint() -> bytes:
+    """Hash the content sources and ranking settings the index is built from"""
+    from app.config import settings
+
+    digest = hashlib.sha256()
+    digest.update(
+        f"{_SNAPSHOT_VERSION}:{settings.search_title_boost}:{settings.search_content_boost}".encode()
+    )
+    sources = sorted(
+        path for pattern in _FINGERPRINT_SOURCES for path in _PACKAGE_DIR.glob(pattern)
+    )
+    for path in sources:
+        digest.update(path.relative_to(_PACKAGE_DIR).as_posix().encode())
+        digest.update(path.read_bytes())
+    content = Path(settings.content_dir)
+    for path in sorted(p for p in content.rglob("*") if p.is_file()):
+        digest.update(path.relative_to(content).as_posix().encode())
+        digest.update(path.read_bytes())
+    return digest.digest()
+
+
+def build_search_index() -> SearchIndex:
+    """Build and finalize a fresh index from the site content"""
+    from app.config import settings
+
+    index = SearchIndex(
+        title_boost=settings.search_title_boost,
+        content_boost=settings.search_content_boost,
+    )
+    _build_index(index)
+    index.finalize()
+    return index
+
+
+def build_snapshot(path: Optional[str] = None) -> str:
+    """
+    Build the index and write it as a snapshot for workers to memory-map
+
+    Args:
+        path: Output file (defaults to settings.search_index_path)
+
+    Returns:
+        The path written
+    """
+    from app.config import settings
+
+    path = path or settings.search_index_path
+    build_search_index().save(path, content_fingerprint())
+    return path
+
+
 # Global search index instance
 _search_index: Optional[SearchIndex] = None
+_result_cache = None
 
 
 def get_search_index() -> SearchIndex:
-    """Get or create the global search index"""
+    """Get the global search index, loading the snapshot when it is current"""
     global _search_index
     if _search_index is None:
-        _search_index = SearchIndex()
-        _build_index(_search_index)
+        from app.config import settings
+
+        fingerprint = content_fingerprint()
+        index = None
+        if settings.search_index_path:
+            index = SearchIndex.load(settings.search_index_path, fingerprint)
+            if index is None and os.path.exists(settings.search_index_path):
+                print("Search index snapshot is stale, rebuilding in-process")
+        index = index or build_search_index()
+        index.version = fingerprint.hex()
+        index.prepare_lookups()
+        _search_index = index
+
+        # Rebuild whenever the content store reloads changed files
+        from app.content.store import get_content_store
+
+        get_content_store().subscribe(lambda registry: rebuild_search_index())
     return _search_index
 
 
+def rebuild_search_index() -> SearchIndex:
+    """Rebuild the global search index in-process and drop cached results"""
+    global _search_index
+    index = build_search_index()
+    index.version = content_fingerprint().hex()
+    index.prepare_lookups()
+    _search_index = index
+    get_result_cache().clear()
+    return index
+
+
+def get_result_cache():
+    """Get the search result cache configured in settings"""
+    global _result_cache
+    if _result_cache is None:
+        from app.config import settings
+        from app.utils.cache import create_cache
+
+        _result_cache = create_cache(
+            settings.search_cache_backend,
+            maxsize=settings.search_cache_size,
+            ttl=settings.search_cache_ttl,
+            path=settings.search_cache_path,
+        )
+    return _result_cache
+
+
+def suggest(prefix: str, limit: int = 8) -> Dict[str, List[Dict]]:
+    """
+    Get typeahead completions for a partially typed query
+
+    Args:
+        prefix: Text typed so far
+        limit: Maximum number of completions of each kind
+
+    Returns:
+        Dictionary with "terms" and "documents" completion lists
+    """
+    return get_search_index().suggest(prefix, limit=limit)
+
+
+# Static pages indexed from their templates; the keywords cover synonyms
+# that don't appear in the page copy
+_STATIC_PAGES = [
+    {
+        "title": "Home",
+        "template": "index.html",
+        "url": "/",
+        "keywords": "Ishtar AI enterprise AI solutions",
+    },
+    {
+        "title": "Services",
+        "template": "services.html",
+        "url": "/services",
+        "keywords": "AI services RAG copilots agent automation LLMOps evaluation security synthetic media compliance",
+    },
+    {
+        "title": "Regulated Enterprise Solutions",
+        "template": "finance.html",
+        "url": "/finance",
+        "keywords": "Regulated enterprise RAG copilots policy research agent automation operations workflows governance audit trails evaluation",
+    },
+    {
+        "title": "Media & Advertising",
+        "template": "media_ads.html",
+        "url": "/media-ads",
+        "keywords": "Media advertising synthetic media compliance brand safety provenance disclosure workflows agentic content operations review approval",
+    },
+    {
+        "title": "Pricing",
+        "template": "pricing.html",
+        "url": "/pricing",
+        "keywords": "Pricing GenAI Launch Sprint RAG Copilot Agent Automation LLMOps Security Hardening Platform Partner",
+    },
+    {
+        "title": "Security & Compliance",
+        "template": "security.html",
+        "url": "/security",
+        "keywords": "security compliance",
+    },
+    {
+        "title": "Trust Center",
+        "template": "trust_center.html",
+        "url": "/trust-center",
+        "keywords": "trust center security documentation",
+    },
+    {
+        "title": "About",
+        "template": "about.html",
+        "url": "/about",
+        "keywords": "about company team",
+    },
+    {
+        "title": "Implementation Method",
+        "template": "implementation.html",
+        "url": "/implementation",
+        "keywords": "implementation method delivery process",
+    },
+    {
+        "title": "Responsible AI",
+        "template": "responsible_ai.html",
+        "url": "/responsible-ai",
+        "keywords": "responsible AI ethics governance",
+    },
+    {
+        "title": "Contact",
+        "template": "contact.html",
+        "url": "/contact",
+        "keywords": "Contact consultation schedule Calendly message",
+    },
+]
+
+# (anchor, heading, record keys) for each section of the detail templates
+_PRODUCT_SECTIONS = [
+    ("outcomes", "What It Does", ("outcomes",)),
+    ("target-users", "Target Users", ("target_users",)),
+    ("evidence-approach", "Evidence & Citations Approach", ("evidence_approach",)),
+    ("permissioning", "Permissioning Model", ("permissioning",)),
+    ("evaluation", "Evaluation Framework", ("evaluation",)),
+    ("deployment", "Deployment Patterns", ("deployment",)),
+    ("deliverables", "Deliverables", ("deliverables",)),
+    ("pricing", "Pricing", ("pricing",)),
+]
+
+_CASE_STUDY_SECTIONS = [
+    ("challenge", "The Challenge", ("challenge",)),
+    ("solution", "Our Solution", ("solution",)),
+    ("results", "Results", ("results", "metrics")),
+    ("timeline", "Time-to-Value", ("timeline",)),
+    ("architecture", "Architecture & Scope", ("architecture",)),
+    ("risk-controls", "Risk & Controls Implemented", ("risk_controls",)),
+    ("artifacts", "Artifacts", ("artifacts",)),
+]
+
+
+def _add_sections(
+    index: SearchIndex,
+    title: str,
+    url: str,
+    doc_type: str,
+    intro: str,
+    sections,
+    excerpt: Optional[str] = None,
+):
+    """
+    Index a page as one document per section
+
+    The intro (plus any sections without an anchor) goes on the page URL;
+    every anchored section becomes its own document on url#anchor, grouped
+    with the page so search shows the best-matching part of each page once.
+    """
+    group = index.add_document(
+        title=title, content=intro, url=url, doc_type=doc_type, excerpt=excerpt
+    )
+    for section in sections:
+        if section["anchor"]:
+            index.add_document(
+                title=(
+                    f"{title} — {section['heading']}" if section["heading"] else title
+                ),
+                content=section["text"],
+                url=f"{url}#{section['anchor']}",
+                doc_type=doc_type,
+                group=group,
+            )
+        else:
+            index.add_document(
+                title=title,
+                content=section["text"],
+                url=url,
+                doc_type=doc_type,
+                excerpt=excerpt,
+                group=group,
+            )
+
+
 def _build_index(index: SearchIndex):
     """Build the search index with all site content"""
-    # Import here to avoid circular imports
-    from app.routes.pages import get_blog_posts
+    from app.utils.extract import (
+        iter_html_sections,
+        iter_record_sections,
+        iter_strings,
+        template_block_html,
+    )
+
+    from app.content.registry import get_registry
 
-    # Add blog posts
+    registry = get_registry()
+
+    # Add blog posts, with the full article body where one exists
     try:
-        blog_posts = get_blog_posts()
-        for post in blog_posts:
-            content = f"{post.get('title', '')} {post.get('excerpt', '')}"
-            index.add_document(
+        articles = registry.blog_articles_by_slug
+        for post in registry.blog_posts:
+            slug = post.get("slug", "")
+            article = articles.get(slug)
+            _add_sections(
+                index,
                 title=post.get("title", ""),
-                content=content,
-                url=f"/blog/{post.get('slug', '')}",
+                url=f"/blog/{slug}",
                 doc_type="blog",
+                intro=f"{post.get('title', '')} {post.get('excerpt', '')}",
+                sections=iter_html_sections(article["content"]) if article else (),
                 excerpt=post.get("excerpt", ""),
             )
     except Exception:
         pass  # Silently fail if blog posts can't be loaded
 
-    # Add static pages
-    pages = [
-        {
-            "title": "Services",
-            "content": "AI services RAG copilots agent automation LLMOps evaluation security synthetic media compliance",
-            "url": "/services",
-            "type": "page",
-        },
-        {
-            "title": "Regulated Enterprise Solutions",
-            "content": "Regulated enterprise RAG copilots policy research agent automation operations workflows governance audit trails evaluation",
-            "url": "/finance",
-            "type": "page",
-        },
-        {
-            "title": "Media & Advertising",
-            "content": "Media advertising synthetic media compliance brand safety provenance disclosure workflows agentic content operations review approval",
-            "url": "/media-ads",
-            "type": "page",
-        },
-        {
-            "title": "Pricing",
-            "content": "Pricing GenAI Launch Sprint RAG Copilot Agent Automation LLMOps Security Hardening Platform Partner",
-            "url": "/pricing",
-            "type": "page",
-        },
-        {
-            "title": "Contact",
-            "content": "Contact consultation schedule Calendly message",
-            "url": "/contact",
-            "type": "page",
-        },
-        {
-            "title": "FAQ",
-            "content": "Frequently asked questions industries implementation timeline pricing support",
-            "url": "/faq",
-            "type": "page",
-        },
-    ]
-
-    for page in pages:
-        index.add_document(
+    # Add static pages from their template copy
+    for page in _STATIC_PAGES:
+        try:
+            with open(f"app/templates/{page['template']}", encoding="utf-8") as f:
+                html = template_block_html(f.read())
+        except OSError:
+            html = ""
+        _add_sections(
+            index,
             title=page["title"],
-            content=page["content"],
             url=page["url"],
-            doc_type=page["type"],
+            doc_type="page",
+            intro=page["keywords"],
+            sections=iter_html_sections(html, generate_anchors=False),
         )
 
-    # Add FAQ entries (basic ones)
-    faqs = [
-        {
-            "title": "What industries do you serve?",
-            "content": "We specialize in regulated enterprises and media/advertising organizations",
-            "url": "/faq#industries",
-            "type": "faq",
-        },
-        {
-            "title": "How long does a typical implementation take?",
-            "content": "Implementation timelines vary based on project scope",
-            "url": "/faq#timeline",
-            "type": "faq",
-        },
-    ]
-
-    for faq in faqs:
-        index.add_document(
-            title=faq["title"],
-            content=faq["content"],
-            url=faq["url"],
-            doc_type=faq["type"],
-        )
+    # Add FAQ entries
+    try:
+        for category, entries in registry.faqs.items():
+            for entry in entries:
+                index.add_document(
+                    title=entry["question"],
+                    content=f"{entry['question']} {entry['answer']}",
+                    url=f"/faq#{category.replace('_', '-')}",
+                    doc_type="faq",
+                )
+    except Exception:
+        pass
 
-    # Add case studies
+    # Add products
     try:
-        from app.content.case_studies import get_case_studies
+        for product in registry.products:
+            _add_sections(
+                index,
+                title=product.get("title", ""),
+                url=f"/products/{product.get('slug', '')}",
+                doc_type="page",
+                intro=" ".join(
+                    product.get(key, "") for key in ("title", "subtitle", "description")
+                ),
+                sections=iter_record_sections(product, _PRODUCT_SECTIONS),
+                excerpt=product.get("description", ""),
+            )
+    except Exception:
+        pass
 
-        case_studies = get_case_studies()
-        for case_study in case_studies:
-            content = f"{case_study.get('title', '')} {case_study.get('challenge', '')} {case_study.get('solution', '')} {case_study.get('results', '')}"
-            index.add_document(
+    # Add case studies
+    try:
+        for case_study in registry.case_studies:
+            _add_sections(
+                index,
                 title=case_study.get("title", ""),
-                content=content,
                 url=f"/case-studies/{case_study.get('slug', '')}",
                 doc_type="case_study",
+                intro=" ".join(
+                    case_study.get(key, "") for key in ("title", "industry", "client")
+                ),
+                sections=iter_record_sections(case_study, _CASE_STUDY_SECTIONS),
                 excerpt=case_study.get("challenge", "")[:200],
             )
     except Exception:
@@ -274,14 +1034,10 @@ def _build_index(index: SearchIndex):
 
     # Add resources
     try:
-        from app.content.resources import get_resources
-
-        resources = get_resources()
-        for resource in resources:
-            content = f"{resource.get('title', '')} {resource.get('description', '')}"
+        for resource in registry.resources:
             index.add_document(
                 title=resource.get("title", ""),
-                content=content,
+                content=" ".join(iter_strings(resource)),
                 url=f"/resources?category={resource.get('category', '')}",
                 doc_type="resource",
                 excerpt=resource.get("description", ""),
@@ -305,5 +1061,27 @@ def search(
         List of search results
     """
     index = get_search_index()
-    results = index.search(query, doc_types)
-    return results[:limit]
+    cache = get_result_cache()
+
+    # The index version is part of the key so entries from an older index
+    # are never served, even from a cache shared with other workers
+    key = (
+        index.version,
+        " ".join(sorted(set(tokenize(query)))),
+        tuple(sorted(doc_types)) if doc_types else (),
+        limit,
+    )
+    results = cache.get(key)
+    if results is None:
+        results = index.search(query, doc_types, limit=limit)
+        cache.set(key, results)
+    return results
+
+
+if __name__ == "__main__":
+    import sys
+
+    if sys.argv[1:2] != ["build"]:
+        print("Usage: python -m app.utils.search build [OUTPUT_PATH]")
+        sys.exit(2)
+    print(f"Wrote search index snapshot to {build_snapshot(*sys.argv[2:3])}")
@@ -0,0 +1,300 @@
+"""
+Sitemap Utility Module
+Sitemap index and per-section sitemaps built from the router and the content
+registry, with each URL's real modification time as lastmod
+"""
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import gzip
+import json
+import subprocess
+
+from app.utils.rss import XMLWriter
+
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+# Child sitemaps, served at /sitemaps/<name>.xml (and .xml.gz)
+SECTIONS = ("pages", "products", "case-studies", "blog")
+
+# Crawl hints (changefreq, priority) for pages; others get DEFAULT_HINTS
+PAGE_HINTS = {
+    "/": ("weekly", "1.0"),
+    "/services": ("monthly", "0.9"),
+    "/blog": ("weekly", "0.8"),
+    "/faq": ("monthly", "0.7"),
+    "/contact": ("monthly", "0.7"),
+    "/implementation": ("monthly", "0.7"),
+    "/responsible-ai": ("monthly", "0.7"),
+    "/privacy": ("yearly", "0.3"),
+    "/terms": ("yearly", "0.3"),
+}
+DEFAULT_HINTS = ("monthly", "0.8")
+SECTION_HINTS = {
+    "products": ("monthly", "0.8"),
+    "case-studies": ("monthly", "0.7"),
+    "blog": ("monthly", "0.7"),
+}
+
+# HTML routes that are not pages of their own
+_EXCLUDED_PATHS = {"/search"}
+
+# Listing pages whose lastmod includes their collection's records
+_LISTINGS = {"/blog": "blog", "/case-studies": "case_studies"}
+
+# (path, lastmod as Unix time or None, changefreq, priority)
+Entry = Tuple[str, Optional[float], str, str]
+
+
+def w3c_datetime(timestamp: float) -> str:
+    """Format a Unix time for <lastmod>"""
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat(timespec="seconds")
+
+
+def git_template_times(template_dir: str) -> Dict[str, float]:
+    """
+    Time of the last git commit that touched each template
+
+    Commit times stay the same across checkouts and deploys, unlike file
+    mtimes. This shells out to git, so it runs at build time
+    (`python -m app.utils.sitemap build`), never while serving; empty when
+    git or the repository history is not available.
+    """
+    try:
+        output = subprocess.run(
+            ["git", "log", "--format=%x00%ct", "--name-only", "--relative", "--", "."],
+            cwd=template_dir,
+            capture_output=True,
+            text=True,
+            timeout=60,
+            check=True,
+        ).stdout
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"No git history for {template_dir}: {e}")
+        return {}
+
+    times: Dict[str, float] = {}
+    # Newest commit first: keep the first time seen for each file
+    for block in output.split("\0")[1:]:
+        lines = block.strip().splitlines()
+        if not lines:
+            continue
+        for name in lines[1:]:
+            if name.strip():
+                times.setdefault(name.strip(), float(lines[0]))
+    return times
+
+
+def build_template_times(
+    template_dir: str = "app/templates", path: Optional[str] = None
+) -> str:
+    """
+    Write the template commit times read by template_times()
+
+    Args:
+        template_dir: Template directory
+        path: Output file (defaults to settings.template_times_path)
+
+    Returns:
+        The path written
+    """
+    from app.config import settings
+
+    path = path or settings.template_times_path
+    times = git_template_times(template_dir)
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(times, f, indent=2, sort_keys=True)
+    return path
+
+
+def template_times(template_dir: str, path: Optional[str] = None) -> Dict[str, float]:
+    """
+    When each template last changed, for page lastmod
+
+    Read from the commit times written at build time; without that file (or
+    for templates it does not list, such as ones added since) the template's
+    file mtime is used instead.
+
+    Args:
+        template_dir: Template directory
+        path: Commit times file (defaults to settings.template_times_path)
+    """
+    from app.config import settings
+
+    path = path or settings.template_times_path
+    times: Dict[str, float] = {}
+    if path and Path(path).exists():
+        try:
+            with open(path) as f:
+                times = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error loading template times {path}: {e}")
+
+    root = Path(template_dir)
+    for file in root.rglob("*.html"):
+        name = file.relative_to(root).as_posix()
+        if name not in times:
+            times[name] = file.stat().st_mtime
+    return times
+
+
+def _template_time(path: str, times: Dict[str, float]) -> Optional[float]:
+    """Last change time of the template a page path renders, if it follows the naming"""
+    name = path.strip("/").replace("-", "_") or "index"
+    return times.get(f"{name}.html")
+
+
+def _latest(*times: Optional[float]) -> Optional[float]:
+    known = [t for t in times if t is not None]
+    return max(known) if known else None
+
+
+def collect_entries(
+    routes,
+    registry,
+    template_dir: str = "app/templates",
+    times_path: Optional[str] = None,
+) -> Dict[str, List[Entry]]:
+    """
+    List the URLs of each section
+
+    Pages are the app's parameterless HTML GET routes, dated by their
+    template's last commit (see template_times()); products, case studies and blog articles come
+    from the content registry, dated by their "updated" or "date" field.
+    """
+    from fastapi.responses import HTMLResponse
+    from fastapi.routing import APIRoute
+
+    times = template_times(template_dir, times_path)
+    pages: List[Entry] = []
+    for route in routes:
+        if not isinstance(route, APIRoute) or "GET" not in route.methods:
+            continue
+        response_class = getattr(route.response_class, "value", route.response_class)
+        if response_class is not HTMLResponse:
+            continue
+        if "{" in route.path or route.path in _EXCLUDED_PATHS:
+            continue
+        lastmod = _template_time(route.path, times)
+        collection = _LISTINGS.get(route.path)
+        if collection:
+            lastmod = _latest(
+                lastmod,
+                *(
+                    t
+                    for key, t in registry.modified.items()
+                    if key.startswith(collection + "/")
+                ),
+            )
+        pages.append((route.path, lastmod, *PAGE_HINTS.get(route.path, DEFAULT_HINTS)))
+
+    def records(section: str, collection: str, slugs) -> List[Entry]:
+        return [
+            (
+                f"/{section}/{slug}",
+                registry.modified.get(f"{collection}/{slug}"),
+                *SECTION_HINTS[section],
+            )
+            for slug in slugs
+        ]
+
+    return {
+        "pages": pages,
+        "products": records("products", "products", registry.products_by_slug),
+        "case-studies": records(
+            "case-studies", "case_studies", registry.case_studies_by_slug
+        ),
+        # Articles only: posts without one have a placeholder page, and
+        # aliases would duplicate the canonical URL
+        "blog": records(
+            "blog",
+            "blog",
+            [
+                post["slug"]
+                for post in registry.blog_posts
+                if post["slug"] in registry.blog_articles_by_slug
+            ],
+        ),
+    }
+
+
+def render_urlset(entries: List[Entry], site_url: str) -> bytes:
+    """Serialize one sitemap"""
+    xml = XMLWriter()
+    xml.start_document()
+    xml.start("urlset", {"xmlns": SITEMAP_NS})
+    for path, lastmod, changefreq, priority in entries:
+        xml.start("url")
+        xml.element("loc", f"{site_url}{path}")
+        if lastmod is not None:
+            xml.element("lastmod", w3c_datetime(lastmod))
+        xml.element("changefreq", changefreq)
+        xml.element("priority", priority)
+        xml.end("url")
+    xml.end("urlset")
+    xml.end_document()
+    return xml.drain().encode("utf-8")
+
+
+def render_index(sitemaps: List[Tuple[str, Optional[float]]], site_url: str) -> bytes:
+    """Serialize the sitemap index from (path, lastmod) pairs"""
+    xml = XMLWriter()
+    xml.start_document()
+    xml.start("sitemapindex", {"xmlns": SITEMAP_NS})
+    for path, lastmod in sitemaps:
+        xml.start("sitemap")
+        xml.element("loc", f"{site_url}{path}")
+        if lastmod is not None:
+            xml.element("lastmod", w3c_datetime(lastmod))
+        xml.end("sitemap")
+    xml.end("sitemapindex")
+    xml.end_document()
+    return xml.drain().encode("utf-8")
+
+
+def build_sitemaps(
+    routes, registry, site_url: str, use_gzip: bool = False
+) -> Dict[str, Tuple[bytes, Optional[float]]]:
+    """
+    Build the index and every child sitemap
+
+    Args:
+        routes: The app's routes
+        registry: Content registry
+        site_url: Base URL of the site
+        use_gzip: Point the index at the gzipped child sitemaps
+
+    Returns:
+        Mapping of URL path to (body, lastmod) for "/sitemap.xml" and each
+        "/sitemaps/<section>.xml" and ".xml.gz"
+    """
+    files: Dict[str, Tuple[bytes, Optional[float]]] = {}
+    children = []
+    for section, entries in collect_entries(routes, registry).items():
+        if not entries:
+            continue
+        lastmod = _latest(*(entry[1] for entry in entries))
+        body = render_urlset(entries, site_url)
+        path = f"/sitemaps/{section}.xml"
+        files[path] = (body, lastmod)
+        # mtime=0 keeps the bytes, and so the ETag, stable
+        files[path + ".gz"] = (gzip.compress(body, mtime=0), lastmod)
+        children.append((path + ".gz" if use_gzip else path, lastmod))
+
+    files["/sitemap.xml"] = (
+        render_index(children, site_url),
+        _latest(*(lastmod for _, lastmod in children)),
+    )
+    return files
+
+
+if __name__ == "__main__":
+    import sys
+
+    if sys.argv[1:2] != ["build"]:
+        print("Usage: python -m app.utils.sitemap build [TIMES_PATH]")
+        sys.exit(2)
+    path = build_template_times(path=(sys.argv[2:3] or [None])[0])
+    print(f"Wrote template commit times to {path}")
@@ -0,0 +1,15 @@
+"""
+Shared test fixtures
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Test client for the app, with its lifespan run once per session"""
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
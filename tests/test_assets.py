@@ -0,0 +1,132 @@
+"""
+Tests for content-hashed and precompressed static files
+"""
+
+import json
+import os
+
+import pytest
+
+from app.utils.assets import (
+    AssetManifest,
+    HashedStaticFiles,
+    asset_url,
+    build_manifest,
+    hashed_name,
+    precompress_static,
+)
+from app.utils.compression import accepted_encodings, available_encodings
+
+
+@pytest.fixture
+def static_dir(tmp_path):
+    root = tmp_path / "static"
+    (root / "css").mkdir(parents=True)
+    (root / "css" / "site.css").write_text("body { color: black; }\n" * 40)
+    return root
+
+
+def test_hashed_name_follows_content(static_dir):
+    manifest = AssetManifest(str(static_dir), check_interval=0)
+    first = manifest.hashed_path("css/site.css")
+    assert first.startswith("css/site.") and first.endswith(".css")
+    assert manifest.url("/css/site.css") == f"/static/{first}"
+
+    path = static_dir / "css" / "site.css"
+    path.write_text("body { color: white; }\n")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert manifest.hashed_path("css/site.css") != first
+    assert manifest.hashed_path("css/missing.css") is None
+
+
+def test_resolve_only_accepts_the_current_hash(static_dir):
+    manifest = AssetManifest(str(static_dir))
+    current = manifest.hashed_path("css/site.css")
+
+    assert manifest.resolve(current) == "css/site.css"
+    assert manifest.resolve(hashed_name("css/site.css", "0" * 64)) is None
+    assert manifest.resolve("css/site.css") is None
+
+
+def test_built_manifest_is_used_without_touching_files(static_dir, tmp_path):
+    path = build_manifest(str(static_dir), str(tmp_path / "assets.json"))
+    entries = json.loads((tmp_path / "assets.json").read_text())
+    manifest = AssetManifest(str(static_dir), manifest_path=path)
+
+    (static_dir / "css" / "site.css").unlink()
+    assert manifest.hashed_path("css/site.css") == entries["css/site.css"]
+    assert manifest.version()
+
+
+def test_stale_manifest_hash_is_not_served(static_dir, tmp_path):
+    path = build_manifest(str(static_dir), str(tmp_path / "assets.json"))
+    manifest = AssetManifest(str(static_dir), manifest_path=path)
+    built = manifest.hashed_path("css/site.css")
+    assert manifest.resolve(built) == "css/site.css"
+
+    (static_dir / "css" / "site.css").write_text("body { color: white; }\n")
+    assert manifest.resolve(built) is None
+    current = manifest.current_hashed_path("css/site.css")
+    assert current != built and manifest.resolve(current) == "css/site.css"
+
+
+def test_pages_link_hashed_assets_and_stale_hashes_404(client):
+    url = asset_url("css/styles.css")
+
+    assert url in client.get("/about").text
+    assert client.get(url).status_code == 200
+    stale = "/static/" + hashed_name("css/styles.css", "0" * 64)
+    assert client.get(stale).status_code == 404
+
+
+@pytest.fixture
+def static_client(static_dir, tmp_path):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    out = tmp_path / "precompressed"
+    precompress_static(str(static_dir), str(out))
+    manifest = AssetManifest(str(static_dir))
+    app = FastAPI()
+    app.mount(
+        "/static",
+        HashedStaticFiles(
+            directory=str(static_dir), manifest=manifest, precompressed_dir=str(out)
+        ),
+    )
+    return TestClient(app), manifest.url("css/site.css")
+
+
+def test_accepted_encodings_follow_quality_values():
+    assert accepted_encodings("gzip, br") == ["br", "gzip"]
+    assert accepted_encodings("br;q=0, gzip") == ["gzip"]
+    assert accepted_encodings("*;q=0") == []
+    assert accepted_encodings("identity") == []
+
+
+@pytest.mark.parametrize("encoding", available_encodings())
+def test_precompressed_variant_is_served(static_client, static_dir, encoding):
+    client, url = static_client
+    response = client.get(url, headers={"Accept-Encoding": encoding})
+
+    assert response.headers["content-encoding"] == encoding
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.content == (static_dir / "css" / "site.css").read_bytes()
+
+    cached = client.get(
+        url,
+        headers={
+            "Accept-Encoding": encoding,
+            "If-None-Match": response.headers["etag"],
+        },
+    )
+    assert cached.status_code == 304
+
+
+def test_identity_gets_the_plain_file(static_client):
+    client, url = static_client
+    response = client.get(url, headers={"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
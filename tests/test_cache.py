@@ -0,0 +1,86 @@
+"""
+Tests for the LRU/TTL caches and the search result cache
+"""
+
+import itertools
+
+import pytest
+
+from app.utils import cache as cache_module
+from app.utils import search as search_module
+from app.utils.cache import LRUCache, SQLiteCache, create_cache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A clock that advances one second per reading unless set"""
+    ticks = itertools.count(1000)
+    now = {"value": None}
+
+    def read():
+        return now["value"] if now["value"] is not None else float(next(ticks))
+
+    monkeypatch.setattr(cache_module.time, "time", read)
+    monkeypatch.setattr(cache_module.time, "monotonic", read)
+    return now
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+def test_cache_evicts_least_recently_used(tmp_path, clock, backend):
+    cache = create_cache(backend, maxsize=2, path=str(tmp_path / "cache.sqlite3"))
+    cache.set("a", [1])
+    cache.set("b", [2])
+    assert cache.get("a") == [1]
+    cache.set("c", [3])
+
+    assert cache.get("b") is None
+    assert cache.get("a") == [1]
+    assert cache.get("c") == [3]
+    assert cache.stats()["size"] == 2
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+def test_cache_entries_expire(tmp_path, clock, backend):
+    cache = create_cache(
+        backend, maxsize=4, ttl=10.0, path=str(tmp_path / "cache.sqlite3")
+    )
+    clock["value"] = 0.0
+    cache.set("a", "value")
+    clock["value"] = 5.0
+    assert cache.get("a") == "value"
+    clock["value"] = 11.0
+    assert cache.get("a") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_create_cache_backends(tmp_path):
+    assert isinstance(create_cache("sqlite", 4, path=str(tmp_path / "c")), SQLiteCache)
+    disabled = create_cache("none", 4)
+    disabled.set("a", 1)
+    assert isinstance(disabled, LRUCache) and disabled.get("a") is None
+
+
+def test_search_results_are_cached_per_index_version(monkeypatch):
+    calls = []
+    index = search_module.SearchIndex()
+    index.add_document("Compliance", "Review workflows.", "/compliance", "page")
+    index.version = "v1"
+    original = index.search
+
+    def counting_search(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(index, "search", counting_search)
+    monkeypatch.setattr(search_module, "_search_index", index)
+    monkeypatch.setattr(search_module, "_result_cache", LRUCache(maxsize=8))
+
+    first = search_module.search("Compliance review")
+    assert search_module.search("review  compliance") == first
+    assert len(calls) == 1
+
+    index.version = "v2"
+    search_module.search("compliance review")
+    assert len(calls) == 2
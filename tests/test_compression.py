@@ -0,0 +1,129 @@
+"""
+Tests for streaming response compression
+"""
+
+import asyncio
+import gzip
+import zlib
+
+import pytest
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+
+from app.middleware import CompressionMiddleware
+from app.utils.compression import StreamCompressor, available_encodings
+
+
+async def request(app, path="/", headers=()):
+    """Call an ASGI app and collect the start message and body chunks"""
+    messages = []
+
+    async def receive():
+        # Streaming responses wait for a disconnect after the body
+        await asyncio.sleep(0.01)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": b"",
+        "headers": [(k.encode(), v.encode()) for k, v in headers],
+    }
+    await app(scope, receive, send)
+    start = messages[0]
+    chunks = [m.get("body", b"") for m in messages[1:]]
+    return (
+        start["status"],
+        dict((k.decode(), v.decode()) for k, v in start["headers"]),
+        chunks,
+    )
+
+
+def run(app, headers=(("accept-encoding", "gzip"),), path="/"):
+    return asyncio.run(
+        request(CompressionMiddleware(app, minimum_size=100), path, headers)
+    )
+
+
+def respond(response):
+    async def app(scope, receive, send):
+        await response(scope, receive, send)
+
+    return app
+
+
+def test_whole_responses_keep_an_exact_length():
+    body = "compressible text " * 50
+    status, headers, chunks = run(
+        respond(PlainTextResponse(body, headers={"ETag": '"v1"'}))
+    )
+
+    data = b"".join(chunks)
+    assert headers["content-encoding"] == "gzip"
+    assert headers["content-length"] == str(len(data))
+    assert headers["vary"] == "Accept-Encoding"
+    assert headers["etag"] == 'W/"v1"'
+    assert gzip.decompress(data).decode() == body
+
+
+def test_streamed_chunks_are_flushed_as_they_arrive():
+    parts = [b"<p>" + b"x" * 80 + b"</p>" for _ in range(4)]
+    app = respond(StreamingResponse(iter(parts), media_type="text/html"))
+    status, headers, chunks = run(app)
+
+    assert headers["content-encoding"] == "gzip"
+    assert "content-length" not in headers
+    # Each chunk after the threshold is decodable on its own arrival
+    decoder = zlib.decompressobj(31)
+    received = [decoder.decompress(chunk) for chunk in chunks if chunk]
+    assert len(received) > 1
+    assert b"".join(received) == b"".join(parts)
+
+
+@pytest.mark.parametrize(
+    "response, headers",
+    [
+        (PlainTextResponse("short"), (("accept-encoding", "gzip"),)),
+        (
+            Response(b"\x89PNG" * 100, media_type="image/png"),
+            (("accept-encoding", "gzip"),),
+        ),
+        (
+            Response(
+                b"x" * 500, media_type="text/html", headers={"Content-Encoding": "br"}
+            ),
+            (("accept-encoding", "gzip"),),
+        ),
+        (PlainTextResponse("text " * 100), (("accept-encoding", "identity"),)),
+    ],
+)
+def test_responses_left_alone(response, headers):
+    _, response_headers, chunks = run(respond(response), headers)
+
+    assert response_headers.get("content-encoding") in (None, "br")
+    assert b"".join(chunks) == response.body
+
+
+def test_static_paths_are_excluded():
+    _, headers, _ = run(respond(PlainTextResponse("text " * 100)), path="/static/a.txt")
+
+    assert "content-encoding" not in headers
+
+
+@pytest.mark.parametrize("encoding", available_encodings())
+def test_stream_compressor_round_trips(encoding):
+    compressor = StreamCompressor(encoding, 5)
+    data = b"".join(compressor.compress(b"chunk %d " % i) for i in range(20))
+    data += compressor.finish()
+
+    if encoding == "gzip":
+        assert gzip.decompress(data) == b"".join(b"chunk %d " % i for i in range(20))
+    else:
+        from app.utils.compression import _get_brotli
+
+        assert _get_brotli().decompress(data) == b"".join(
+            b"chunk %d " % i for i in range(20)
+        )
@@ -0,0 +1,79 @@
+"""
+Tests for ETags and 304 responses on HTML pages
+"""
+
+import pytest
+
+from app.content.registry import get_registry
+
+
+def page_paths():
+    registry = get_registry()
+    return [
+        "/",
+        "/pricing",
+        "/faq",
+        "/blog",
+        f"/blog/{next(iter(registry.blog_articles_by_slug))}",
+        f"/products/{next(iter(registry.products_by_slug))}",
+        "/case-studies",
+        "/case-studies?industry=Finance",
+        f"/case-studies/{next(iter(registry.case_studies_by_slug))}",
+        "/resources",
+    ]
+
+
+@pytest.mark.parametrize("path", page_paths())
+@pytest.mark.parametrize("encoding", ["identity", "gzip"])
+def test_cacheable_pages_answer_if_none_match(client, path, encoding):
+    response = client.get(path, headers={"Accept-Encoding": encoding})
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+
+    cached = client.get(
+        path, headers={"Accept-Encoding": encoding, "If-None-Match": etag}
+    )
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+    assert cached.headers["cache-control"] == response.headers["cache-control"]
+
+
+def test_stale_etag_gets_the_page(client):
+    response = client.get("/faq", headers={"If-None-Match": '"0123456789abcdef"'})
+    assert response.status_code == 200
+    assert response.content
+
+
+def test_render_cache_variants_have_distinct_strong_etags(client):
+    identity = client.get("/services", headers={"Accept-Encoding": "identity"})
+    gzipped = client.get("/services", headers={"Accept-Encoding": "gzip"})
+
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert gzipped.headers["etag"] == identity.headers["etag"][:-1] + '-gzip"'
+    assert not gzipped.headers["etag"].startswith("W/")
+
+
+def test_compressed_response_304_repeats_weak_etag(client):
+    response = client.get("/feed", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    etag = response.headers["etag"]
+    assert etag.startswith("W/")
+
+    cached = client.get(
+        "/feed", headers={"Accept-Encoding": "gzip", "If-None-Match": etag}
+    )
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+
+
+def test_uncompressed_response_304_keeps_strong_etag(client):
+    response = client.get("/feed", headers={"Accept-Encoding": "identity"})
+    etag = response.headers["etag"]
+    assert not etag.startswith("W/")
+
+    cached = client.get(
+        "/feed", headers={"Accept-Encoding": "identity", "If-None-Match": etag}
+    )
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
@@ -0,0 +1,215 @@
+"""
+Tests for the content registry and the file-backed content store
+"""
+
+import asyncio
+import sys
+
+import pytest
+
+from app.content import store as store_module
+from app.content.registry import ContentRegistry, get_registry
+from app.content.store import ContentStore, parse_front_matter
+
+
+def make_registry(**overrides):
+    content = {
+        "products": [{"slug": "rag", "title": "RAG", "features": ["Search"]}],
+        "case_studies": [
+            {"slug": "bank", "industry": "Finance"},
+            {"slug": "studio", "industry": "Media"},
+        ],
+        "resources": [{"title": "Guide", "category": "Guides"}],
+        "resource_categories": ["All", "Guides"],
+        "blog_posts": [{"slug": "post", "title": "Post"}],
+        "blog_articles": {"post": {"title": "Post", "content": "<h2>Intro</h2>"}},
+        "faqs": {"General": [{"q": "Why?", "a": "Because."}]},
+    }
+    content.update(overrides)
+    return ContentRegistry(**content)
+
+
+def test_registry_lookups_are_precomputed():
+    registry = make_registry()
+
+    assert registry.products_by_slug["rag"]["title"] == "RAG"
+    assert [c["slug"] for c in registry.case_studies_by_industry["All"]] == [
+        "bank",
+        "studio",
+    ]
+    assert [c["slug"] for c in registry.case_studies_by_industry["Media"]] == ["studio"]
+    assert registry.resources_by_category["Guides"][0]["title"] == "Guide"
+    article = registry.blog_articles_by_slug["post"]
+    assert article["slug"] == "post"
+    assert 'id="intro"' in article["content"]
+
+
+def test_registry_records_are_read_only():
+    registry = make_registry()
+    product = registry.products_by_slug["rag"]
+
+    with pytest.raises(TypeError):
+        product["title"] = "Changed"
+    with pytest.raises(TypeError):
+        registry.products_by_slug["new"] = product
+    assert isinstance(product["features"], tuple)
+
+
+def test_site_registry_serves_every_slug_route(client):
+    registry = get_registry()
+
+    for slug in registry.products_by_slug:
+        assert client.get(f"/products/{slug}").status_code == 200
+    for slug in registry.case_studies_by_slug:
+        assert client.get(f"/case-studies/{slug}").status_code == 200
+    assert client.get("/products/not-a-product").status_code == 404
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+@pytest.fixture
+def content_dir(tmp_path):
+    write(tmp_path / "products" / "01-rag.json", '{"slug": "rag", "title": "RAG"}')
+    write(tmp_path / "products" / "02-ops.json", '{"slug": "ops", "title": "Ops"}')
+    write(tmp_path / "faqs.json", '{"General": []}')
+    write(
+        tmp_path / "blog" / "post.html",
+        "---\ntitle: Post: Part 1\nslug: post\ndate: 2024-01-05\n"
+        "aliases: old-post\n---\n<p>Body</p>\n",
+    )
+    write(tmp_path / "blog" / "listed.html", "---\ntitle: Listed\nslug: listed\n---\n")
+    return tmp_path
+
+
+def test_front_matter_parsing():
+    fields, body = parse_front_matter("---\ntitle: A: B\nslug: a\n---\nBody\n")
+
+    assert fields == {"title": "A: B", "slug": "a"}
+    assert body == "Body\n"
+    assert parse_front_matter("No front matter") == ({}, "No front matter")
+
+
+def test_store_builds_registry_from_files(content_dir):
+    store = ContentStore(str(content_dir))
+    assert store.refresh()
+
+    registry = store.registry
+    assert list(registry.products_by_slug) == ["rag", "ops"]
+    assert registry.blog_posts[0]["title"] == "Post: Part 1"
+    # Posts without a body are listed without an article page
+    assert set(registry.blog_articles_by_slug) == {"post", "old-post"}
+    assert registry.resource_categories == ("All",)
+
+
+def test_store_reparses_only_changed_files(content_dir, monkeypatch):
+    store = ContentStore(str(content_dir))
+    store.refresh()
+    version = store.registry.version
+    notified = []
+    store.subscribe(notified.append)
+
+    parsed = []
+    parse = store_module._parse_file
+    monkeypatch.setattr(
+        store_module,
+        "_parse_file",
+        lambda path, data: parsed.append(path.name) or parse(path, data),
+    )
+    assert not store.refresh()
+    assert parsed == [] and notified == []
+
+    write(
+        content_dir / "products" / "02-ops.json", '{"slug": "ops", "title": "LLMOps"}'
+    )
+    assert store.refresh()
+    assert parsed == ["02-ops.json"]
+    assert store.registry.products_by_slug["ops"]["title"] == "LLMOps"
+    assert store.registry.version != version
+    assert notified == [store.registry]
+
+
+def test_store_keeps_last_good_file_and_drops_deleted(content_dir):
+    store = ContentStore(str(content_dir))
+    store.refresh()
+
+    write(content_dir / "products" / "01-rag.json", "{broken")
+    store.refresh()
+    assert store.registry.products_by_slug["rag"]["title"] == "RAG"
+
+    (content_dir / "products" / "02-ops.json").unlink()
+    assert store.refresh()
+    assert list(store.registry.products_by_slug) == ["rag"]
+
+
+def test_store_skips_records_that_would_break_the_registry(content_dir):
+    store = ContentStore(str(content_dir))
+    store.refresh()
+
+    write(content_dir / "products" / "01-rag.json", '{"title": "No slug"}')
+    write(content_dir / "products" / "03-list.json", '["not", "a", "record"]')
+    write(content_dir / "blog" / "untitled.html", "---\ntitle: Untitled\n---\n<p>x</p>")
+    store.refresh()
+    assert list(store.registry.products_by_slug) == ["rag", "ops"]
+    assert store.registry.products_by_slug["rag"]["title"] == "RAG"
+    assert "untitled" not in store.registry.blog_articles_by_slug
+
+    # A rejected file is not re-parsed until it changes again
+    assert not store.refresh()
+    write(content_dir / "products" / "03-list.json", '{"slug": "list"}')
+    assert store.refresh()
+    assert list(store.registry.products_by_slug) == ["rag", "ops", "list"]
+
+
+def test_store_keeps_last_registry_when_build_fails(content_dir, monkeypatch):
+    store = ContentStore(str(content_dir))
+    store.refresh()
+    registry = store.registry
+
+    def fail():
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(store, "_build_registry", fail)
+    write(content_dir / "products" / "02-ops.json", '{"slug": "ops", "title": "New"}')
+    assert not store.refresh()
+    assert store.registry is registry
+
+    fresh = ContentStore(str(content_dir))
+    monkeypatch.setattr(fresh, "_build_registry", fail)
+    fresh.refresh()
+    assert fresh.registry.products == ()
+
+
+def test_store_version_comes_from_file_contents(content_dir, tmp_path_factory):
+    store = ContentStore(str(content_dir))
+    store.refresh()
+
+    copy = tmp_path_factory.mktemp("copy")
+    for path in content_dir.rglob("*.*"):
+        write(copy / path.relative_to(content_dir), path.read_text())
+    other = ContentStore(str(copy))
+    other.refresh()
+    assert other.registry.version == store.registry.version
+
+
+def test_store_watch_survives_failed_reloads(content_dir, monkeypatch):
+    store = ContentStore(str(content_dir))
+    calls = []
+
+    def refresh():
+        calls.append(1)
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(store, "refresh", refresh)
+    monkeypatch.setitem(sys.modules, "watchfiles", None)
+
+    async def run():
+        task = asyncio.create_task(store.watch(0.01))
+        await asyncio.sleep(0.1)
+        assert not task.done()
+        task.cancel()
+
+    asyncio.run(run())
+    assert len(calls) > 1
@@ -0,0 +1,145 @@
+"""
+Tests for the email providers
+"""
+
+import asyncio
+import json
+import smtplib
+
+import httpx
+import pytest
+
+from app.utils import email as email_module
+from app.utils.email import SendGridProvider, SMTPConnectionPool, build_message
+
+MESSAGE = {
+    "to": "team@example.com",
+    "subject": "New lead",
+    "body_html": "<p>Hello</p>",
+    "body_text": "Hello",
+}
+
+
+class FakeSMTP:
+    """Stands in for smtplib.SMTP and records what each connection did"""
+
+    connections = []
+    # Number of upcoming sends that fail as if the server hung up
+    drop_next = 0
+
+    def __init__(self, host, port, timeout=None):
+        self.sent = []
+        self.closed = False
+        self.logins = 0
+        FakeSMTP.connections.append(self)
+
+    def starttls(self):
+        pass
+
+    def login(self, user, password):
+        self.logins += 1
+
+    def send_message(self, msg):
+        if FakeSMTP.drop_next:
+            FakeSMTP.drop_next -= 1
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        self.sent.append(msg["Subject"])
+
+    def quit(self):
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    FakeSMTP.connections = []
+    FakeSMTP.drop_next = 0
+    monkeypatch.setattr(email_module.smtplib, "SMTP", FakeSMTP)
+    pool = SMTPConnectionPool("smtp.example.com", 587, "user", "secret", size=1)
+    yield pool
+    pool.close()
+
+
+def send(pool, subject):
+    msg = build_message("team@example.com", subject, "<p>Hi</p>")
+    asyncio.run(pool.send(msg))
+
+
+def test_pool_reuses_one_authenticated_connection(pool):
+    for subject in ("one", "two", "three"):
+        send(pool, subject)
+
+    assert len(FakeSMTP.connections) == 1
+    connection = FakeSMTP.connections[0]
+    assert connection.sent == ["one", "two", "three"]
+    assert connection.logins == 1
+
+
+def test_idle_connections_are_replaced(pool):
+    pool.idle_timeout = 0
+    send(pool, "one")
+    send(pool, "two")
+
+    first, second = FakeSMTP.connections
+    assert first.closed
+    assert second.sent == ["two"]
+
+
+def test_dropped_pooled_connection_is_retried_once(pool):
+    send(pool, "one")
+    FakeSMTP.drop_next = 1
+    send(pool, "two")
+
+    assert [c.sent for c in FakeSMTP.connections] == [["one"], ["two"]]
+    assert FakeSMTP.connections[0].closed
+
+
+def test_fresh_connection_failures_are_raised(pool):
+    FakeSMTP.drop_next = 1
+
+    with pytest.raises(smtplib.SMTPServerDisconnected):
+        send(pool, "one")
+
+
+def test_sendgrid_reuses_one_client_and_reports_errors():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        status = 202 if len(requests) == 1 else 400
+        return httpx.Response(status, text="" if status == 202 else "bad request")
+
+    provider = SendGridProvider("key", transport=httpx.MockTransport(handler))
+
+    async def run():
+        results = await provider.send_batch([MESSAGE, MESSAGE])
+        client = provider._client
+        await provider.close()
+        return results, client
+
+    results, client = asyncio.run(run())
+    assert results == [None, "SendGrid returned HTTP 400: bad request"]
+    assert client is not None and provider._client is None
+    assert requests[0].headers["authorization"] == "Bearer key"
+    body = json.loads(requests[0].content)
+    assert [part["type"] for part in body["content"]] == ["text/plain", "text/html"]
+    assert body["personalizations"] == [{"to": [{"email": "team@example.com"}]}]
+    stats = provider.latency.stats()
+    assert (stats["count"], stats["errors"]) == (2, 1)
+
+
+def test_sendgrid_without_key_fails_without_a_request():
+    provider = SendGridProvider(None)
+
+    assert asyncio.run(provider.send(MESSAGE)) == "SendGrid API key not configured"
+    assert provider._client is None
+
+
+def test_providers_must_implement_delivery():
+    class Incomplete(email_module.EmailProvider):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,88 @@
+"""
+Tests for turning article HTML and content records into search sections
+"""
+
+from app.utils.extract import (
+    add_heading_anchors,
+    iter_html_sections,
+    iter_record_sections,
+    template_block_html,
+)
+
+ARTICLE = (
+    "<p>Intro &amp; overview.</p><script>var hidden = 1;</script>"
+    '<h2>Data Controls</h2><p>Access<br>logs</p><h3 id="custom">Retention</h3>'
+    "<p>Seven years.</p><h2>Data Controls</h2><p>Again.</p>"
+)
+
+
+def test_html_sections_follow_headings_and_skip_scripts():
+    sections = list(iter_html_sections(ARTICLE, feed_size=7))
+
+    assert [(s["heading"], s["anchor"]) for s in sections] == [
+        ("", None),
+        ("Data Controls", "data-controls"),
+        ("Retention", "custom"),
+        ("Data Controls", "data-controls-2"),
+    ]
+    assert sections[0]["text"] == "Intro & overview."
+    assert sections[1]["text"] == "Access logs"
+
+
+def test_heading_anchors_match_section_anchors():
+    html = add_heading_anchors(ARTICLE)
+
+    for section in iter_html_sections(ARTICLE):
+        if section["anchor"]:
+            assert f'id="{section["anchor"]}"' in html
+
+
+def test_long_sections_are_split_at_spaces():
+    chunks = list(iter_html_sections("<p>" + "word " * 100 + "</p>", max_chars=50))
+
+    assert len(chunks) > 1
+    assert all(len(chunk["text"]) <= 50 for chunk in chunks)
+    assert " ".join(chunk["text"] for chunk in chunks).split() == ["word"] * 100
+
+
+def test_template_block_strips_template_syntax():
+    source = (
+        '{% extends "base.html" %}{% block content %}<h1>{{ title }}</h1>'
+        "<p>Body {% if x %}text{% endif %}</p>{% endblock %}"
+    )
+
+    html = template_block_html(source)
+    assert "{" not in html
+    assert "Body" in html and "text" in html
+
+
+def test_record_sections_use_nested_titles_and_skip_urls():
+    record = {
+        "overview": "Grounded answers.",
+        "pricing": {"title": "Plans", "tiers": ["Starter", "/contact"]},
+        "empty": "",
+    }
+    sections = list(
+        iter_record_sections(
+            record,
+            [
+                ("overview", "Overview", ("overview",)),
+                ("pricing", "Pricing", ("pricing",)),
+                ("empty", "Empty", ("empty",)),
+            ],
+        )
+    )
+
+    assert sections == [
+        {"heading": "Overview", "anchor": "overview", "text": "Grounded answers."},
+        {"heading": "Plans", "anchor": "pricing", "text": "Plans Starter"},
+    ]
+
+
+def test_site_index_covers_article_and_product_bodies():
+    from app.utils.search import search
+
+    assert search("allergy ungrounded")[0]["url"] == (
+        "/blog/future-of-rag-copilots-financial-services"
+    )
+    assert search("permissioning")[0]["url"].endswith("#permissioning")
@@ -0,0 +1,186 @@
+"""
+Tests for the RSS, Atom and JSON feeds
+"""
+
+from datetime import datetime, timezone
+import json
+import xml.etree.ElementTree as ET
+
+from app.config import settings
+from app.utils.feeds import iter_atom_feed, iter_json_feed
+from app.utils.rss import absolute_urls, iter_rss_feed
+
+SITE = "https://example.com"
+ARTICLE = (
+    '<p><a href="/services">Services</a> <a href="#notes">notes</a></p>'
+    '<img src="/static/img/chart.png" srcset="/static/img/chart-320w.webp 320w, '
+    '/static/img/chart-640w.webp 640w"><a href="mailto:team@example.com">mail</a>'
+)
+POSTS = [
+    {
+        "title": "First",
+        "slug": "first",
+        "description": "Excerpt",
+        "content": ARTICLE,
+        "published_date": datetime(2024, 3, 1, tzinfo=timezone.utc),
+        "author": "Team",
+        "categories": ["AI"],
+    },
+    {
+        "title": "Undated",
+        "slug": "undated",
+        "description": "No date",
+        "published_date": None,
+    },
+]
+
+CONTENT_NS = "{http://purl.org/rss/1.0/modules/content/}encoded"
+ATOM = "{http://www.w3.org/2005/Atom}"
+
+
+def test_absolute_urls_resolves_relative_references_only():
+    html = absolute_urls(ARTICLE, f"{SITE}/blog/first")
+
+    assert 'href="https://example.com/services"' in html
+    assert 'href="https://example.com/blog/first#notes"' in html
+    assert 'src="https://example.com/static/img/chart.png"' in html
+    assert (
+        'srcset="https://example.com/static/img/chart-320w.webp 320w, '
+        'https://example.com/static/img/chart-640w.webp 640w"'
+    ) in html
+    assert 'href="mailto:team@example.com"' in html
+
+
+def test_rss_full_content_has_absolute_urls():
+    root = ET.fromstring("".join(iter_rss_feed(POSTS, SITE)))
+    items = root.findall("channel/item")
+
+    content = items[0].find(CONTENT_NS).text
+    assert 'src="https://example.com/static/img/chart.png"' in content
+    assert items[0].find("pubDate").text == "Fri, 01 Mar 2024 00:00:00 GMT"
+    # Undated posts simply omit pubDate
+    assert items[1].find("pubDate") is None
+
+
+def test_rss_is_deterministic():
+    assert "".join(iter_rss_feed(POSTS, SITE)) == "".join(iter_rss_feed(POSTS, SITE))
+
+
+def test_rss_without_full_content_omits_article():
+    root = ET.fromstring("".join(iter_rss_feed(POSTS, SITE, full_content=False)))
+    assert root.find(f"channel/item/{CONTENT_NS}") is None
+
+
+def test_atom_sets_base_and_absolute_content():
+    root = ET.fromstring("".join(iter_atom_feed(POSTS, SITE)))
+
+    assert (
+        root.get("{http://www.w3.org/XML/1998/namespace}base") == "https://example.com/"
+    )
+    entry = root.find(f"{ATOM}entry")
+    assert 'href="https://example.com/services"' in entry.find(f"{ATOM}content").text
+    # An undated entry falls back to the feed's updated date
+    undated = root.findall(f"{ATOM}entry")[1]
+    assert undated.find(f"{ATOM}published") is None
+    assert undated.find(f"{ATOM}updated").text == "2024-03-01T00:00:00+00:00"
+
+
+def test_json_feed_items_and_paging_link():
+    links = {"self": f"{SITE}/feed.json", "next": f"{SITE}/feed.json?page=2"}
+    feed = json.loads("".join(iter_json_feed(POSTS, SITE, links)))
+
+    assert feed["version"] == "https://jsonfeed.org/version/1.1"
+    assert feed["next_url"] == f"{SITE}/feed.json?page=2"
+    first, undated = feed["items"]
+    assert 'src="https://example.com/static/img/chart.png"' in first["content_html"]
+    assert first["date_published"] == "2024-03-01T00:00:00+00:00"
+    # Every item needs content_html or content_text
+    assert undated["content_text"] == "No date"
+    assert "date_published" not in undated
+
+
+def test_empty_feeds_are_valid():
+    ET.fromstring("".join(iter_rss_feed([], SITE)))
+    ET.fromstring("".join(iter_atom_feed([], SITE)))
+    assert json.loads("".join(iter_json_feed([], SITE)))["items"] == []
+
+
+def test_feed_routes_answer_conditional_requests(client):
+    for path in ("/feed", "/rss.xml", "/atom.xml", "/feed.json"):
+        response = client.get(path)
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+
+        cached = client.get(path, headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+
+
+def test_feed_route_rejects_missing_pages(client):
+    assert client.get("/feed?page=999").status_code == 404
+    assert client.get("/feed?page=0").status_code == 422
+
+
+def test_feed_routes_skip_invalid_post_dates(client, monkeypatch):
+    from types import SimpleNamespace
+
+    from app.routes import seo
+
+    registry = SimpleNamespace(
+        version="invalid-dates",
+        blog_posts=(
+            {"title": "Dated", "slug": "dated", "date": "2024-03-01"},
+            {"title": "Typo", "slug": "typo", "date": "2024-13-45"},
+            {"title": "Missing", "slug": "missing"},
+        ),
+        blog_articles_by_slug={},
+    )
+    monkeypatch.setattr("app.content.registry.get_registry", lambda: registry)
+    monkeypatch.setattr(seo, "_feed_posts", None)
+
+    posts = {
+        post["slug"]: post["published_date"] for post in seo.get_blog_posts_for_rss()
+    }
+    assert posts == {
+        "dated": datetime(2024, 3, 1, tzinfo=timezone.utc),
+        "typo": None,
+        "missing": None,
+    }
+
+    for path in ("/feed", "/atom.xml", "/feed.json"):
+        response = client.get(path)
+        assert response.status_code == 200
+        assert response.headers["last-modified"] == "Fri, 01 Mar 2024 00:00:00 GMT"
+    assert client.get("/feed").text.count("<pubDate>") == 1
+
+
+def test_feed_first_page_is_cached_and_later_pages_stream(client, monkeypatch):
+    from app.routes import seo
+
+    monkeypatch.setattr(settings, "feed_page_size", 1)
+    seo._feed_cache.clear()
+
+    first = client.get("/feed")
+    hits = seo._feed_cache.stats()["hits"]
+    assert client.get("/feed").content == first.content
+    assert seo._feed_cache.stats()["hits"] == hits + 1
+
+    root = ET.fromstring(client.get("/feed?page=2").content)
+    links = {link.get("rel"): link.get("href") for link in root.iter(f"{ATOM}link")}
+    assert links["previous"] == f"{settings.site_url}/feed"
+    assert links["self"] == f"{settings.site_url}/feed?page=2"
+    assert len(root.findall("./channel/item")) == 1
+
+
+def test_feed_etags_follow_the_output(client, monkeypatch):
+    from app.utils.http import make_etag
+
+    monkeypatch.setattr(settings, "feed_page_size", 1)
+    first = client.get("/feed", headers={"Accept-Encoding": "identity"})
+    assert first.headers["etag"] == make_etag(first.content)
+
+    archive = client.get("/feed?page=2").headers["etag"]
+    monkeypatch.setattr(settings, "site_url", "https://mirror.example.com")
+    moved = client.get("/feed")
+    assert moved.headers["etag"] != first.headers["etag"]
+    assert client.get("/feed?page=2").headers["etag"] != archive
@@ -0,0 +1,75 @@
+"""
+Tests for the responsive image pipeline
+"""
+
+import runpy
+import sys
+
+from app.utils import images
+
+
+def test_build_without_pillow_is_a_no_op(monkeypatch, tmp_path, capsys):
+    # A None entry makes "from PIL import ..." raise ImportError
+    monkeypatch.setitem(sys.modules, "PIL", None)
+    monkeypatch.setattr(sys, "argv", ["images", "build", str(tmp_path / "images.json")])
+
+    # Must not raise SystemExit: the deploy build chains this with &&
+    runpy.run_module("app.utils.images", run_name="__main__")
+
+    assert "Skipped image derivatives" in capsys.readouterr().out
+    assert not (tmp_path / "images.json").exists()
+
+
+def test_picture_without_manifest_entry_is_plain_img(monkeypatch):
+    monkeypatch.setattr(images, "_image_manifest", {})
+
+    html = str(images.picture("img/logo.png", alt="Logo", class_="logo"))
+
+    assert html.startswith("<img ")
+    assert 'alt="Logo"' in html
+    assert 'class="logo"' in html
+    assert 'loading="lazy"' in html
+
+
+def test_picture_emits_sources_in_format_order(monkeypatch):
+    monkeypatch.setattr(
+        images,
+        "_image_manifest",
+        {
+            "img/logo.png": {
+                "width": 640,
+                "height": 320,
+                "formats": {
+                    "webp": [{"path": "img/derived/logo-320w.webp", "width": 320}],
+                    "avif": [{"path": "img/derived/logo-320w.avif", "width": 320}],
+                },
+            }
+        },
+    )
+
+    html = str(images.picture("img/logo.png", alt="Logo", sizes="50vw"))
+
+    assert html.startswith("<picture><source")
+    assert html.index("image/avif") < html.index("image/webp")
+    assert 'sizes="50vw"' in html
+    assert 'width="640"' in html and 'height="320"' in html
+
+
+def test_responsive_images_skips_tags_already_in_a_picture(monkeypatch):
+    entry = {
+        "width": 640,
+        "height": 320,
+        "formats": {"webp": [{"path": "img/derived/a-320w.webp", "width": 320}]},
+    }
+    monkeypatch.setattr(
+        images, "_image_manifest", {"img/a.png": entry, "img/b.png": entry}
+    )
+
+    html = images.responsive_images(
+        '<PICTURE><source srcset="/x.webp"><img src="/static/img/a.png"></PICTURE>'
+        '<p><img src="/static/img/b.png" alt="B"></p>'
+    )
+
+    assert html.count("<picture>") == 1 and html.count("<PICTURE>") == 1
+    assert '<img src="/static/img/a.png">' in html
+    assert 'alt="B"' in html and "a-320w.webp" in html.split("</PICTURE>")[1]
@@ -0,0 +1,135 @@
+"""
+Tests for the mail outbox, form notifications and the mail metrics endpoint
+"""
+
+import asyncio
+import sqlite3
+
+import pytest
+
+from app.config import settings
+from app.utils.mail_queue import FAILED, PENDING, SENT, MailQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return MailQueue(str(tmp_path / "outbox.sqlite3"), max_attempts=3, retry_base=10.0)
+
+
+def _row(queue, message_id):
+    return queue._conn.execute(
+        "SELECT status, attempts, next_attempt_at, last_error FROM messages "
+        "WHERE id = ?",
+        (message_id,),
+    ).fetchone()
+
+
+def test_claim_leases_messages_once(queue):
+    message_id = queue.enqueue("to@example.com", "Subject", "<p>Hi</p>", "Hi")
+
+    claimed = queue.claim(10)
+    assert [message["id"] for message in claimed] == [message_id]
+    assert claimed[0]["to"] == "to@example.com"
+    assert queue.claim(10) == []
+
+
+def test_failed_attempts_back_off_then_give_up(queue):
+    message_id = queue.enqueue("to@example.com", "Subject", "<p>Hi</p>")
+
+    delays = []
+    for _ in range(2):
+        queue.claim(10)
+        queue.mark_failed(message_id, "provider down")
+        status, attempts, next_attempt_at, error = _row(queue, message_id)
+        assert status == PENDING
+        assert error == "provider down"
+        delays.append(next_attempt_at)
+        # Make the retry due now
+        queue._conn.execute(
+            "UPDATE messages SET next_attempt_at = 0 WHERE id = ?", (message_id,)
+        )
+    assert delays[1] - delays[0] == pytest.approx(10.0, abs=1.0)
+
+    queue.claim(10)
+    queue.mark_failed(message_id, "provider down")
+    assert _row(queue, message_id)[:2] == (FAILED, 3)
+    assert queue.claim(10) == []
+    assert queue.stats()["failed"] == 1
+
+
+def test_sent_messages_report_latency(queue):
+    message_id = queue.enqueue("to@example.com", "Subject", "<p>Hi</p>")
+    queue.claim(10)
+    queue.mark_sent(message_id)
+
+    stats = queue.stats()
+    assert _row(queue, message_id)[0] == SENT
+    assert stats["pending"] == 0
+    assert stats["delivery_latency"]["count"] == 1
+    assert queue.next_due_in() is None
+
+
+def test_contact_form_confirms_when_queueing_fails(client, monkeypatch):
+    def broken_queue(**fields):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr("app.utils.email.queue_contact_form_email", broken_queue)
+    response = client.post(
+        "/contact",
+        data={"name": "Ada", "email": "ada@example.com", "message": "Hello"},
+    )
+
+    assert response.status_code == 200
+    assert "Thank you for your message" in response.text
+
+
+def test_mail_metrics_require_token(client, queue, monkeypatch):
+    monkeypatch.setattr("app.utils.mail_queue._mail_queue", queue)
+    monkeypatch.setattr(settings, "metrics_token", None)
+    assert client.get("/api/metrics/mail").status_code == 404
+
+    monkeypatch.setattr(settings, "metrics_token", "secret")
+    denied = client.get("/api/metrics/mail", headers={"Authorization": "Bearer wrong"})
+    assert denied.status_code == 401
+    assert denied.headers["www-authenticate"] == "Bearer"
+    assert client.get("/api/metrics/mail").status_code == 401
+
+    allowed = client.get(
+        "/api/metrics/mail", headers={"Authorization": "Bearer secret"}
+    )
+    assert allowed.status_code == 200
+    assert allowed.json()["pending"] == 0
+
+
+def test_worker_delivers_and_retries(queue, monkeypatch):
+    attempts = []
+
+    async def deliver_batch(batch):
+        attempts.append([message["subject"] for message in batch])
+        # The provider rejects "Retry" the first time only
+        return [
+            "provider down" if m["subject"] == "Retry" and len(attempts) == 1 else None
+            for m in batch
+        ]
+
+    monkeypatch.setattr("app.utils.email.deliver_batch", deliver_batch)
+    queue.retry_base = 0.05
+
+    async def run():
+        worker = asyncio.create_task(
+            queue.run_worker(batch_size=10, poll_interval=0.05)
+        )
+        await asyncio.sleep(0.01)
+        queue.enqueue("to@example.com", "Hello", "<p>Hi</p>")
+        queue.enqueue("to@example.com", "Retry", "<p>Hi</p>")
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if queue.stats()["sent"] == 2:
+                break
+        worker.cancel()
+        await asyncio.gather(worker, return_exceptions=True)
+
+    asyncio.run(run())
+    assert attempts[0] == ["Hello", "Retry"]
+    assert ["Retry"] in attempts[1:]
+    assert queue.stats()["sent"] == 2
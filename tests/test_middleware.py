@@ -0,0 +1,129 @@
+"""
+Tests for the security header and cache policy middleware
+"""
+
+import asyncio
+
+from fastapi.responses import HTMLResponse
+from fastapi.routing import APIRoute
+import pytest
+from starlette.responses import Response, StreamingResponse
+
+from app.middleware import SECURITY_HEADERS, SecurityHeadersMiddleware
+from app.utils.assets import asset_url
+from app.utils.cache_policy import (
+    NO_STORE,
+    PAGES,
+    ROUTE_POLICIES,
+    public,
+    route_policies,
+)
+from app.utils.prerender import call_app
+
+
+def test_every_response_gets_security_headers(client):
+    for response in (
+        client.get("/"),
+        client.get("/not-a-page"),
+        client.post("/contact", data={}),
+        client.get(asset_url("css/styles.css")),
+    ):
+        for name, value in SECURITY_HEADERS.items():
+            assert response.headers[name] == value
+
+
+def test_streaming_responses_pass_through():
+    async def app(scope, receive, send):
+        chunks = (chunk for chunk in (b"one ", b"two"))
+        await StreamingResponse(chunks, media_type="text/plain")(scope, receive, send)
+
+    status, headers, body = asyncio.run(
+        call_app(SecurityHeadersMiddleware(app), "GET", "/stream")
+    )
+    assert (status, body) == (200, b"one two")
+    assert headers["x-frame-options"] == "DENY"
+    assert headers["cache-control"] == NO_STORE.cache_control
+
+
+def test_response_cache_control_is_kept():
+    async def app(scope, receive, send):
+        response = Response(b"ok", headers={"Cache-Control": "max-age=5"})
+        await response(scope, receive, send)
+
+    _, headers, _ = asyncio.run(call_app(SecurityHeadersMiddleware(app), "GET", "/"))
+    assert headers["cache-control"] == "max-age=5"
+    assert "pragma" not in headers
+
+
+@pytest.mark.parametrize(
+    "path, cache_control, surrogate_key",
+    [
+        ("/", "public, max-age=300, stale-while-revalidate=60", "pages"),
+        ("/pricing", "public, max-age=600, stale-while-revalidate=60", "pages pricing"),
+        ("/feed", "public, max-age=900, stale-while-revalidate=60", "blog feeds"),
+        ("/contact", "no-cache, no-store, must-revalidate", None),
+        ("/search?q=rag", "private, max-age=60", None),
+        ("/api/search/suggest?q=rag", "no-cache, no-store, must-revalidate", None),
+        ("/not-a-page", "no-cache, no-store, must-revalidate", None),
+    ],
+)
+def test_route_policies(client, path, cache_control, surrogate_key):
+    response = client.get(path)
+
+    assert response.headers["cache-control"] == cache_control
+    assert response.headers.get("surrogate-key") == surrogate_key
+    if cache_control.startswith("public"):
+        assert "stale-if-error" in response.headers["surrogate-control"]
+        assert response.headers["vary"] == "Accept-Encoding"
+    if "no-store" in cache_control:
+        assert response.headers["pragma"] == "no-cache"
+
+
+def test_surrogate_keys_are_filled_from_path_parameters(client):
+    from app.content.registry import get_registry
+
+    slug = next(iter(get_registry().products_by_slug))
+    response = client.get(f"/products/{slug}")
+
+    assert response.headers["surrogate-key"] == f"products products/{slug}"
+
+
+def test_static_files_by_hash(client):
+    hashed = client.get(asset_url("css/styles.css"))
+    plain = client.get("/static/css/styles.css")
+
+    assert hashed.headers["cache-control"] == "public, max-age=31536000, immutable"
+    assert plain.headers["cache-control"] == "no-cache"
+
+
+def test_forms_and_errors_are_never_stored(client):
+    posted = client.post(
+        "/contact", data={"name": "A", "email": "a@example.com", "message": "Hi"}
+    )
+
+    assert posted.headers["cache-control"] == NO_STORE.cache_control
+    assert posted.headers["expires"] == "0"
+
+
+def test_policy_table_matches_app_routes():
+    from app.main import app
+
+    declared = {getattr(route, "path", None) for route in app.routes}
+    assert set(ROUTE_POLICIES) <= declared
+
+
+def test_route_policies_resolve_by_endpoint(capsys):
+    def page():
+        pass
+
+    routes = [
+        APIRoute("/a", page, response_class=HTMLResponse),
+        APIRoute("/b", page, response_class=HTMLResponse),
+    ]
+    other = public(60)
+
+    assert route_policies(routes, {"/a": PAGES}) == {page: PAGES}
+    assert route_policies(routes, {"/a": PAGES, "/b": other}) == {page: PAGES}
+    assert "Conflicting cache policies for /b" in capsys.readouterr().out
+    route_policies(routes, {"/missing": PAGES})
+    assert "Cache policy for unknown route /missing" in capsys.readouterr().out
@@ -0,0 +1,137 @@
+"""
+Tests for the pre-render build fingerprint and output paths
+"""
+
+from pathlib import Path
+import asyncio
+
+import pytest
+
+from app.config import settings
+from app.middleware import PrerenderedMiddleware
+from app.utils import prerender
+from app.utils.prerender import output_path, query_key, site_fingerprint
+
+
+@pytest.mark.parametrize(
+    "name, value",
+    [
+        ("site_url", "https://staging.example.com"),
+        ("feed_full_content", False),
+        ("feed_page_size", 5),
+        ("sitemap_gzip", True),
+        ("plausible_domain", "example.com"),
+    ],
+)
+def test_fingerprint_changes_with_output_settings(monkeypatch, name, value):
+    before = site_fingerprint()
+    monkeypatch.setattr(settings, name, value)
+
+    assert site_fingerprint() != before
+
+
+def test_fingerprint_ignores_serving_settings(monkeypatch):
+    before = site_fingerprint()
+    monkeypatch.setattr(settings, "serve_prerendered", not settings.serve_prerendered)
+    monkeypatch.setattr(settings, "metrics_token", "secret")
+
+    assert site_fingerprint() == before
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "app/utils/feeds.py",
+        "app/utils/rss.py",
+        "app/utils/sitemap.py",
+        "app/utils/extract.py",
+    ],
+)
+def test_fingerprint_covers_feed_and_sitemap_sources(source):
+    sources = {
+        path.relative_to(prerender._PACKAGE_DIR.parent).as_posix()
+        for pattern in prerender._FINGERPRINT_SOURCES
+        for path in prerender._PACKAGE_DIR.glob(pattern)
+    }
+
+    assert source in sources
+
+
+def test_output_paths():
+    assert output_path("/", "", "text/html") == "index.html"
+    assert output_path("/about", "", "text/html") == "about/index.html"
+    assert output_path("/sitemap.xml", "", "application/xml") == "sitemap.xml"
+    assert query_key("b=2&a=1") == query_key("a=1&b=%32")
+
+
+@pytest.fixture(scope="module")
+def site(tmp_path_factory):
+    directory = prerender.build_site(str(tmp_path_factory.mktemp("dist") / "site"))
+    return directory, prerender.load_site(directory)
+
+
+async def fallback_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 204, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+def test_build_renders_public_pages_with_their_headers(site):
+    directory, pages = site
+
+    assert ("/", "") in pages
+    assert ("/feed", "") in pages
+    assert not any(path.startswith("/api/") or path == "/search" for path, _ in pages)
+    body, content_type, variants, headers = pages[("/about", "")]
+    assert content_type.startswith("text/html")
+    assert "gzip" in variants
+    assert headers["cache-control"].startswith("public")
+    assert (Path(directory) / "about" / "index.html").read_bytes() == body
+
+
+def test_stale_build_is_not_loaded(site, monkeypatch):
+    directory, _ = site
+    monkeypatch.setattr(settings, "site_url", "https://staging.example.com")
+
+    assert prerender.load_site(directory) is None
+
+
+def test_middleware_serves_variants_and_304s(site):
+
+    _, pages = site
+    middleware = PrerenderedMiddleware(fallback_app, pages=pages)
+
+    async def get(path, headers=()):
+        scope_headers = [(k.encode(), v.encode()) for k, v in headers]
+        status, response_headers, body = None, {}, []
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_headers.update(
+                    (k.decode(), v.decode()) for k, v in message["headers"]
+                )
+            else:
+                body.append(message["body"])
+
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "query_string": b"",
+            "headers": scope_headers,
+        }
+        await middleware(scope, None, send)
+        return status, response_headers, b"".join(body)
+
+    status, headers, body = asyncio.run(get("/about", [("accept-encoding", "gzip")]))
+    assert status == 200
+    assert headers["content-encoding"] == "gzip"
+    assert headers["etag"].endswith('-gzip"')
+
+    status, _, body = asyncio.run(
+        get("/about", [("accept-encoding", "gzip"), ("if-none-match", headers["etag"])])
+    )
+    assert (status, body) == (304, b"")
+
+    assert asyncio.run(get("/search"))[0] == 204
@@ -0,0 +1,97 @@
+"""
+Tests for the rendered-page cache
+"""
+
+import gzip
+import os
+
+from starlette.datastructures import Headers
+from starlette.templating import Jinja2Templates
+
+from app.utils.render_cache import RenderCache
+
+
+def setup_cache(tmp_path, body="<p>{{ text }}</p>", **options):
+    (tmp_path / "page.html").write_text(body)
+    templates = Jinja2Templates(directory=str(tmp_path))
+    cache = RenderCache(str(tmp_path), check_interval=0, **options)
+    return templates, cache
+
+
+def test_pages_render_once_per_version(tmp_path):
+    templates, cache = setup_cache(tmp_path)
+
+    first = cache.render(templates, "/page", "page.html", {"text": "one"})
+    # The context is only read on a miss
+    second = cache.render(templates, "/page", "page.html", {"text": "two"})
+    assert first.body == second.body == b"<p>one</p>"
+    assert cache.stats()["hits"] == 1
+
+    path = tmp_path / "page.html"
+    path.write_text("<div>{{ text }}</div>")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    third = cache.render(templates, "/page", "page.html", {"text": "three"})
+    assert third.body == b"<div>three</div>"
+    assert third.headers["etag"] != first.headers["etag"]
+
+
+def test_large_pages_get_cached_compressed_variants(tmp_path):
+    templates, cache = setup_cache(tmp_path, compress_min_size=100)
+    context = {"text": "compressible " * 50}
+    gzip_headers = Headers({"accept-encoding": "gzip"})
+
+    response = cache.render(templates, "/page", "page.html", context, gzip_headers)
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert gzip.decompress(response.body).decode() == f"<p>{context['text']}</p>"
+    assert int(response.headers["content-length"]) == len(response.body)
+
+    again = cache.render(templates, "/page", "page.html", context, gzip_headers)
+    assert again.body is response.body
+
+
+def test_small_pages_are_not_compressed(tmp_path):
+    templates, cache = setup_cache(tmp_path, compress_min_size=100)
+
+    response = cache.render(
+        templates,
+        "/page",
+        "page.html",
+        {"text": "short"},
+        Headers({"accept-encoding": "gzip"}),
+    )
+    assert "content-encoding" not in response.headers
+    assert "vary" not in response.headers
+
+
+def test_cache_is_bounded(tmp_path):
+    templates, cache = setup_cache(tmp_path, maxsize=2)
+
+    for route in ("/a", "/b", "/c"):
+        cache.render(templates, route, "page.html", {"text": route})
+    assert cache.stats()["size"] == 2
+    cache.clear()
+    assert cache.stats()["size"] == 0
+
+
+def test_settings_are_hashed_once(tmp_path, monkeypatch):
+    from app.config import Settings
+
+    calls = []
+    dump = Settings.model_dump_json
+
+    def counting_dump(self, **kwargs):
+        calls.append(kwargs)
+        return dump(self, **kwargs)
+
+    monkeypatch.setattr(Settings, "model_dump_json", counting_dump)
+    templates, cache = setup_cache(tmp_path)
+    for text in ("one", "two", "three"):
+        cache.render(templates, "/page", "page.html", {"text": text})
+    assert len(calls) == 1
+
+    version = cache.settings_version()
+    cache.refresh_settings()
+    assert cache.settings_version() == version
+    assert len(calls) == 2
@@ -0,0 +1,228 @@
+"""
+Tests for the search index: ranking, fuzzy matching and snapshots
+"""
+
+import pytest
+
+from app.config import settings
+from app.utils import search
+from app.utils.search import SearchIndex, FUZZY_MAX_DISTANCE, _all_deletes
+
+
+def _index() -> SearchIndex:
+    index = SearchIndex()
+    index.add_document(
+        "AI Compliance Checklist",
+        "How regulated teams review synthetic media before release.",
+        "/blog/compliance",
+        "blog",
+    )
+    index.add_document(
+        "Media Monitoring",
+        "Track campaigns and compliance across every channel.",
+        "/services",
+        "page",
+    )
+    index.add_document("Pricing", "Plans for teams of every size.", "/pricing", "page")
+    index.finalize()
+    return index
+
+
+def test_deletes_cover_every_distance_up_to_the_maximum():
+    variants = _all_deletes("abcd", FUZZY_MAX_DISTANCE)
+
+    assert "abcd" in variants
+    assert {"bcd", "acd", "abd", "abc"} <= variants
+    assert {"cd", "ad", "ab", "bc"} <= variants
+    assert "d" not in variants
+
+
+def test_fuzzy_candidates_find_terms_two_edits_away():
+    index = _index()
+
+    assert ("compliance", 2) in index._fuzzy_candidates("complnce")
+    assert ("regulated", 2) in index._fuzzy_candidates("rgulatd")
+    assert ("monitoring", 1) in index._fuzzy_candidates("monitorng")
+    assert ("pricing", 1) in index._fuzzy_candidates("prcing")
+
+
+def test_fuzzy_candidates_skip_short_and_distant_terms():
+    index = _index()
+
+    assert index._fuzzy_candidates("tem") == []
+    assert index._fuzzy_candidates("cmplnc") == []
+
+
+def test_search_corrects_misspelled_terms():
+    results = _index().search("complnce checklist")
+
+    assert results[0]["url"] == "/blog/compliance"
+
+
+def test_title_matches_rank_first():
+    urls = [result["url"] for result in _index().search("compliance")]
+
+    assert urls == ["/blog/compliance", "/services"]
+
+
+def test_snapshot_roundtrip_and_fingerprint_check(tmp_path):
+    index = _index()
+    path = tmp_path / "search.idx"
+    fingerprint = b"\x01" * 32
+    index.save(str(path), fingerprint)
+
+    loaded = SearchIndex.load(str(path), fingerprint)
+    assert loaded is not None
+    assert [r["url"] for r in loaded.search("complnce")] == [
+        r["url"] for r in index.search("complnce")
+    ]
+    assert SearchIndex.load(str(path), b"\x02" * 32) is None
+    assert SearchIndex.load(str(tmp_path / "missing.idx"), fingerprint) is None
+
+
+def test_postings_cover_title_and_content_terms():
+    index = _index()
+
+    assert [r["url"] for r in index.search("checklist")] == ["/blog/compliance"]
+    assert [r["url"] for r in index.search("campaigns")] == ["/services"]
+    assert index.search("nonexistent") == []
+    assert index.search("   ") == []
+
+
+def test_search_filters_types_and_limits_results():
+    index = _index()
+
+    assert [r["url"] for r in index.search("compliance", doc_types=["page"])] == [
+        "/services"
+    ]
+    assert len(index.search("teams", limit=1)) == 1
+    assert [r["url"] for r in index.search("teams", limit=5)] == [
+        r["url"] for r in index.search("teams")
+    ]
+
+
+def test_search_returns_one_result_per_page():
+    index = SearchIndex()
+    page = index.add_document("Security", "Overview of controls.", "/security", "page")
+    index.add_document(
+        "Encryption",
+        "Encryption at rest and encryption in transit.",
+        "/security#encryption",
+        "page",
+        group=page,
+    )
+    index.add_document("Audit", "Encryption keys are audited.", "/audit", "page")
+
+    urls = [r["url"] for r in index.search("encryption")]
+    assert urls == ["/security#encryption", "/audit"]
+
+
+def test_bm25_prefers_shorter_fields_and_boosts_titles():
+    documents = [
+        ("Notes", "governance " + "filler " * 40, "/long"),
+        ("Notes", "governance filler", "/short"),
+        ("Governance", "filler " * 40, "/title"),
+    ]
+    boosted = SearchIndex()
+    flat = SearchIndex(title_boost=1.0)
+    for title, content, url in documents:
+        boosted.add_document(title, content, url, "page")
+        flat.add_document(title, content, url, "page")
+
+    scores = {r["url"]: r for r in boosted.search("governance")}
+    assert scores["/short"]["score"] > scores["/long"]["score"]
+    assert scores["/title"]["title_matches"] == 1
+    assert scores["/short"]["content_matches"] == 1
+
+    flat_scores = {r["url"]: r["score"] for r in flat.search("governance")}
+    assert flat_scores["/title"] < scores["/title"]["score"]
+    assert flat_scores["/short"] == scores["/short"]["score"]
+
+
+def test_top_k_matches_full_ranking():
+    index = _index()
+    ranked = index.search("teams compliance media")
+
+    assert index.search("teams compliance media", limit=2) == ranked[:2]
+
+
+def test_snippets_are_escaped_and_highlight_query_terms():
+    index = SearchIndex()
+    index.add_document(
+        "Escaping",
+        "Intro " * 30 + "<script> alerts & Governance reviews for regulated teams",
+        "/escaping",
+        "page",
+    )
+
+    snippet = index.search("governance")[0]["excerpt"]
+    assert snippet.startswith("...")
+    assert "<mark>Governance</mark>" in snippet
+    assert "&lt;script&gt;" in snippet and "&amp;" in snippet
+    assert "<script>" not in snippet
+
+
+def test_snapshot_rejects_foreign_files_and_is_read_only(tmp_path):
+    fingerprint = b"\x01" * 32
+    garbage = tmp_path / "garbage.idx"
+    garbage.write_bytes(b"not an index")
+    assert SearchIndex.load(str(garbage), fingerprint) is None
+
+    path = tmp_path / "search.idx"
+    _index().save(str(path), fingerprint)
+    loaded = SearchIndex.load(str(path), fingerprint)
+    assert loaded.suggest("compl")["terms"][0]["text"] == "compliance"
+    with pytest.raises(RuntimeError):
+        loaded.add_document("New", "Body", "/new", "page")
+
+
+def test_snapshot_with_corrupt_regions_is_rebuilt(tmp_path):
+    fingerprint = b"\x01" * 32
+    path = tmp_path / "search.idx"
+    _index().save(str(path), fingerprint)
+    data = path.read_bytes()
+
+    truncated = tmp_path / "truncated.idx"
+    truncated.write_bytes(data[: len(data) // 2])
+    assert SearchIndex.load(str(truncated), fingerprint) is None
+
+    meta_start = search._SNAPSHOT_HEADER.size
+    corrupt = tmp_path / "corrupt.idx"
+    corrupt.write_bytes(data[:meta_start] + b"\xff" + data[meta_start + 1 :])
+    assert SearchIndex.load(str(corrupt), fingerprint) is None
+
+
+def test_content_fingerprint_does_not_depend_on_working_directory(monkeypatch):
+    fingerprint = search.content_fingerprint()
+    monkeypatch.chdir("app")
+    monkeypatch.setattr(settings, "content_dir", "content/data")
+    assert search.content_fingerprint() == fingerprint
+
+
+def test_suggest_completes_the_last_word_by_frequency():
+    index = _index()
+    index.add_document(
+        "Complete Guide", "Complete guide to compliance.", "/guide", "page"
+    )
+    index.finalize()
+
+    result = index.suggest("ai compl", limit=2)
+    assert [term["text"] for term in result["terms"]] == [
+        "ai compliance",
+        "ai complete",
+    ]
+    assert index.suggest("compliance ")["terms"] == []
+    assert [doc["url"] for doc in index.suggest("compliance check")["documents"]] == [
+        "/blog/compliance"
+    ]
+
+
+def test_suggest_endpoint(client):
+    response = client.get("/api/search/suggest", params={"q": "compl", "limit": 3})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["query"] == "compl"
+    assert len(body["terms"]) == 3
+    assert all(term["text"].startswith("compl") for term in body["terms"])
+    assert client.get("/api/search/suggest", params={"limit": 50}).status_code == 422
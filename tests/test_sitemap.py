@@ -0,0 +1,143 @@
+"""
+Tests for the sitemap index and per-section sitemaps
+"""
+
+import gzip
+import json
+import os
+import xml.etree.ElementTree as ET
+
+from fastapi.responses import HTMLResponse
+from fastapi.routing import APIRoute
+
+from app.content.registry import ContentRegistry
+from app.content.store import ContentStore
+from app.utils import sitemap
+
+NS = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+
+
+def write_post(root, name, front_matter, body="<p>Body</p>"):
+    blog = root / "blog"
+    blog.mkdir(exist_ok=True)
+    fields = "\n".join(f"{key}: {value}" for key, value in front_matter.items())
+    (blog / name).write_text(f"---\n{fields}\n---\n{body}\n")
+
+
+def test_record_lastmod_comes_from_front_matter_not_mtime(tmp_path):
+    write_post(tmp_path, "a.html", {"title": "A", "slug": "a", "date": "2024-01-05"})
+    write_post(
+        tmp_path,
+        "b.html",
+        {
+            "title": "B",
+            "slug": "b",
+            "date": "2024-01-05",
+            "updated": "2024-02-01T12:00:00",
+        },
+    )
+    write_post(tmp_path, "c.html", {"title": "C", "slug": "c"})
+    write_post(tmp_path, "d.html", {"title": "D", "slug": "d", "date": "not a date"})
+    store = ContentStore(str(tmp_path))
+    store.refresh()
+
+    modified = store.registry.modified
+    assert sitemap.w3c_datetime(modified["blog/a"]) == "2024-01-05T00:00:00+00:00"
+    assert sitemap.w3c_datetime(modified["blog/b"]) == "2024-02-01T12:00:00+00:00"
+    # Without a usable date there is no lastmod, rather than the file mtime
+    assert "blog/c" not in modified
+    assert "blog/d" not in modified
+
+
+def test_page_lastmod_comes_from_template_times(tmp_path):
+    templates = tmp_path / "templates"
+    templates.mkdir()
+    for name in ("index.html", "services.html", "contact.html"):
+        (templates / name).write_text("<p></p>")
+    os.utime(templates / "contact.html", (1700000000, 1700000000))
+    times = tmp_path / "template_times.json"
+    times.write_text(json.dumps({"index.html": 1704067200.0, "services.html": 0.0}))
+
+    routes = [
+        APIRoute(path, lambda: None, response_class=HTMLResponse)
+        for path in ("/", "/services", "/contact", "/about", "/search")
+    ]
+    registry = ContentRegistry([], [], [], [], [], {}, {})
+    pages = sitemap.collect_entries(
+        routes, registry, template_dir=str(templates), times_path=str(times)
+    )["pages"]
+
+    lastmods = {path: lastmod for path, lastmod, _, _ in pages}
+    # Templates missing from the build-time times fall back to their mtime
+    assert lastmods == {
+        "/": 1704067200.0,
+        "/services": 0.0,
+        "/contact": 1700000000.0,
+        "/about": None,
+    }
+
+
+def test_template_times_are_built_from_git(tmp_path, monkeypatch):
+    path = tmp_path / "times.json"
+    sitemap.build_template_times("app/templates", str(path))
+    times = json.loads(path.read_text())
+    assert times["index.html"] > 0 and "" not in times
+
+    monkeypatch.setenv("GIT_CEILING_DIRECTORIES", str(tmp_path.parent))
+    assert sitemap.git_template_times(str(tmp_path)) == {}
+
+
+def test_index_lists_child_sitemaps_with_latest_lastmod():
+    entries = {
+        "pages": [("/", None, "weekly", "1.0")],
+        "blog": [
+            ("/blog/a", 100.0, "monthly", "0.7"),
+            ("/blog/b", 200.0, "monthly", "0.7"),
+        ],
+    }
+    files = {}
+    children = []
+    for section, section_entries in entries.items():
+        body = sitemap.render_urlset(section_entries, "https://example.com")
+        files[section] = ET.fromstring(body)
+        children.append(
+            (
+                f"/sitemaps/{section}.xml",
+                sitemap._latest(*(e[1] for e in section_entries)),
+            )
+        )
+    index = ET.fromstring(sitemap.render_index(children, "https://example.com"))
+
+    locs = [node.find(f"{NS}loc").text for node in index]
+    assert locs == [
+        "https://example.com/sitemaps/pages.xml",
+        "https://example.com/sitemaps/blog.xml",
+    ]
+    assert index[0].find(f"{NS}lastmod") is None
+    assert index[1].find(f"{NS}lastmod").text == "1970-01-01T00:03:20+00:00"
+    assert files["pages"][0].find(f"{NS}lastmod") is None
+
+
+def test_sitemap_routes(client):
+    index = client.get("/sitemap.xml")
+    assert index.status_code == 200
+    children = [node.find(f"{NS}loc").text for node in ET.fromstring(index.content)]
+    assert children and all("/sitemaps/" in loc for loc in children)
+
+    pages = client.get("/sitemaps/pages.xml")
+    locs = [node.find(f"{NS}loc").text for node in ET.fromstring(pages.content)]
+    assert any(loc.endswith("/services") for loc in locs)
+    assert not any(loc.endswith("/search") for loc in locs)
+
+    gzipped = client.get(
+        "/sitemaps/pages.xml.gz", headers={"Accept-Encoding": "identity"}
+    )
+    assert gzip.decompress(gzipped.content) == pages.content
+
+    assert (
+        client.get(
+            "/sitemap.xml", headers={"If-None-Match": index.headers["etag"]}
+        ).status_code
+        == 304
+    )
+    assert client.get("/sitemaps/unknown.xml").status_code == 404